@@ -1,24 +1,139 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Body
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Body, Query, Request
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from typing import Optional
+import io
 import os
-import tempfile
+import shutil
+import urllib.parse
 import requests
-from src.converters import (
-    convert_docx_to_md, 
-    convert_markdown_to_html, 
-    convert_web_to_docx, 
-    convert_word_to_pdf, 
-    convert_pdf_to_word,
-    convert_markdown_to_docx
+# 转换器在首次使用时才加载，见 src/converters/__init__.py
+from src import converters
+from src.crawlers.media_crawler import MediaCrawler, create_browser_pool
+from src.crawlers.media_crawler.batch import crawl_batch, validate_target, MAX_BATCH_TARGETS
+from src.crawlers.media_crawler.cache import crawl_cache
+from src.crawlers.media_crawler.scheduler import crawl_scheduler, SchedulerQueueFull
+from src.utils.bookmark_store import BookmarkStore, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.utils.uploads import (
+    UploadError,
+    check_content_length,
+    format_size,
+    get_upload_limit,
+    output_filename,
+    spool_upload
 )
-from src.crawlers.media_crawler import MediaCrawler
+from src.utils.workspace import Workspace, sweep_workspaces, workspace_usage, WORKSPACE_MAX_AGE
+from src.utils.conversion_cache import conversion_cache
+from src.utils.single_flight import SingleFlight
+from src.utils.metrics import (
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUEST_BYTES,
+    HTTP_RESPONSE_BYTES,
+    CONTENT_TYPE_LATEST,
+    track_inflight,
+    render_metrics,
+    mark_process_dead,
+)
+from src.utils.log import configure_logging, get_logger, request_id_var, new_request_id
+from src.utils.profiling import (
+    ProfileSession,
+    profile_session_var,
+    profiling_enabled,
+    profiling_requested,
+    profiling_active,
+    check_admin_token,
+    profile_call,
+    find_profile,
+    list_profiles,
+)
+from contextlib import asynccontextmanager
+import asyncio
+import contextvars
 import time
 import re
 
+# 每个worker进程导入应用时配置日志输出
+configure_logging()
+logger = get_logger("app")
+
+# 转换器预加载方式，默认首次使用时才加载：
+# - eager: 导入应用时加载全部转换器；配合 gunicorn --preload 时由主进程在fork前加载，worker共享这部分内存
+# - background: worker启动后在后台线程加载，不推迟启动，也不让第一个请求承担加载耗时
+PRELOAD_CONVERTERS = os.environ.get("PRELOAD_CONVERTERS", "").lower()
+if PRELOAD_CONVERTERS == "eager":
+    logger.info("已预加载全部转换器，耗时 %.2f秒", converters.preload())
+
+
+# 采集浏览器池配置：常驻浏览器数、同时采集数、单个浏览器回收前的页面数、健康检查间隔（秒）
+CRAWLER_BROWSER_POOL_SIZE = int(os.environ.get("CRAWLER_BROWSER_POOL_SIZE", "1"))
+CRAWLER_MAX_CONTEXTS = int(os.environ.get("CRAWLER_MAX_CONTEXTS", "4"))
+CRAWLER_BROWSER_MAX_PAGES = int(os.environ.get("CRAWLER_BROWSER_MAX_PAGES", "200"))
+CRAWLER_HEALTH_CHECK_INTERVAL = 60
+
+
+async def _browser_health_loop(pool):
+    """定期检查浏览器池，替换已断开连接的浏览器"""
+    while True:
+        await asyncio.sleep(CRAWLER_HEALTH_CHECK_INTERVAL)
+        try:
+            await pool.check_health()
+        except Exception as e:
+            logger.warning("浏览器池健康检查失败: %s", e)
+
+
+# 遗留工作目录的清理间隔（秒）
+WORKSPACE_SWEEP_INTERVAL = 600
+
+
+async def _workspace_janitor_loop():
+    """定期删除超时的遗留工作目录"""
+    while True:
+        try:
+            await asyncio.to_thread(sweep_workspaces, WORKSPACE_MAX_AGE)
+        except Exception as e:
+            logger.warning("清理工作目录失败: %s", e)
+        await asyncio.sleep(WORKSPACE_SWEEP_INTERVAL)
+
+
+async def _preload_converters():
+    """在后台线程中加载全部转换器"""
+    try:
+        seconds = await asyncio.to_thread(converters.preload)
+        logger.info("已在后台预加载全部转换器，耗时 %.2f秒", seconds)
+    except Exception as e:
+        logger.warning("预加载转换器失败: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """应用生命周期：启动时预热采集浏览器池、开始清理遗留工作目录并按配置预加载转换器，关闭时释放浏览器和Playwright驱动"""
+    janitor_task = asyncio.create_task(_workspace_janitor_loop())
+    if PRELOAD_CONVERTERS == "background":
+        app.state.converter_preload = asyncio.create_task(_preload_converters())
+    pool = create_browser_pool(
+        size=CRAWLER_BROWSER_POOL_SIZE,
+        max_contexts=CRAWLER_MAX_CONTEXTS,
+        max_pages_per_browser=CRAWLER_BROWSER_MAX_PAGES
+    )
+    health_task = None
+    try:
+        await pool.start()
+        health_task = asyncio.create_task(_browser_health_loop(pool))
+        app.state.crawler_pool = pool
+    except Exception as e:
+        # 浏览器不可用时不影响其他接口，采集接口退回到单次启动浏览器
+        logger.warning("采集浏览器池启动失败: %s", e)
+        app.state.crawler_pool = None
+    try:
+        yield
+    finally:
+        janitor_task.cancel()
+        if health_task is not None:
+            health_task.cancel()
+        await pool.close()
+        mark_process_dead()
 
 
 app = FastAPI(
@@ -28,7 +143,8 @@ app = FastAPI(
     # 优化FastAPI配置
     docs_url=None,  # 生产环境关闭自动生成的文档
     redoc_url=None,  # 生产环境关闭Redoc文档
-    openapi_url=None  # 生产环境关闭OpenAPI规范
+    openapi_url=None,  # 生产环境关闭OpenAPI规范
+    lifespan=lifespan
 )
 
 # 添加GZip压缩中间件，减少响应大小
@@ -46,7 +162,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],  # 只允许必要的HTTP方法
     allow_headers=["*"],
-    expose_headers=["Content-Disposition", "Content-Length"]  # 暴露必要的响应头
+    expose_headers=["Content-Disposition", "Content-Length", "ETag", "X-Request-ID", "X-Profile-ID"]  # 暴露必要的响应头
 )
 
 # 添加自定义中间件，用于响应时间跟踪和缓存控制
@@ -56,12 +172,132 @@ async def add_process_time_header(request, call_next):
     response = await call_next(request)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
-    # 添加缓存控制头
-    response.headers["Cache-Control"] = "public, max-age=3600"  # 缓存1小时
+    # 按路由模板统计，避免路径参数产生大量标签值
+    route = request.scope.get("route")
+    route_path = route.path if route is not None else "unmatched"
+    HTTP_REQUEST_SECONDS.labels(request.method, route_path, str(response.status_code)).observe(process_time)
+    if request.headers.get("content-length", "").isdigit():
+        HTTP_REQUEST_BYTES.labels(route_path).inc(int(request.headers["content-length"]))
+    if response.headers.get("content-length", "").isdigit():
+        HTTP_RESPONSE_BYTES.labels(route_path).inc(int(response.headers["content-length"]))
+    # 添加缓存控制头，接口已自行设置时保留
+    if "Cache-Control" not in response.headers:
+        response.headers["Cache-Control"] = "public, max-age=3600"  # 缓存1小时
+    return response
+
+# 请求头声明的上传大小超过接口上限时，在解析请求体之前直接拒绝
+@app.middleware("http")
+async def limit_upload_size(request, call_next):
+    limit = check_content_length(request.url.path, request.headers.get("content-length"))
+    if limit is not None:
+        return JSONResponse(status_code=413, content={"detail": f"文件过大，最大支持{format_size(limit)}"})
+    return await call_next(request)
+
+# 管理员按请求开启的性能剖析：转换在剖析器中执行，剖析结果的ID通过 X-Profile-ID 响应头返回；
+# 未设置 PROFILE_ADMIN_TOKEN 时不注册此中间件
+async def profile_requests(request, call_next):
+    if not profiling_requested(request.headers, request.query_params):
+        return await call_next(request)
+    if not check_admin_token(request.headers.get("x-admin-token")):
+        return JSONResponse(status_code=403, content={"detail": "性能剖析需要有效的管理员令牌"})
+    session = ProfileSession(request_id_var.get())
+    token = profile_session_var.set(session)
+    try:
+        response = await call_next(request)
+    finally:
+        profile_session_var.reset(token)
+    if session.profile_ids:
+        response.headers["X-Profile-ID"] = ",".join(session.profile_ids)
     return response
 
-# 配置临时文件目录
-TEMP_DIR = tempfile.gettempdir()
+if profiling_enabled():
+    app.middleware("http")(profile_requests)
+
+# 客户端传入的请求ID只接受字母、数字、点、横线和下划线，避免污染日志
+_REQUEST_ID_RE = re.compile(r"[\w.-]{1,64}")
+
+# 请求关联ID：沿用客户端或网关传入的 X-Request-ID，否则生成新的ID，同一请求的所有日志都带有此ID
+@app.middleware("http")
+async def bind_request_id(request, call_next):
+    request_id = request.headers.get("x-request-id", "")
+    if not _REQUEST_ID_RE.fullmatch(request_id):
+        request_id = new_request_id()
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+async def save_upload(file, endpoint, directory, **kwargs):
+    """把上传文件分块写入指定目录，超过接口的大小上限或格式不符时返回对应的HTTP错误"""
+    try:
+        return await spool_upload(file, directory, get_upload_limit(endpoint), **kwargs)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+def serve_cached_conversion(cache_key, filename, media_type, workspace):
+    """命中转换结果缓存时直接返回缓存文件并删除工作目录，未命中时返回None"""
+    if profiling_active():
+        return None
+    cached = conversion_cache.get(cache_key)
+    if cached is None:
+        return None
+    workspace.cleanup()
+    return FileResponse(
+        path=cached,
+        filename=filename,
+        media_type=media_type,
+        headers={"X-Conversion-Cache": "hit"}
+    )
+
+# 正在执行的转换，相同缓存键的并发请求共用一次转换
+conversion_flights = SingleFlight()
+
+async def run_conversion(cache_key, upload, convert, workspace, label="convert"):
+    """执行转换并返回本次请求工作目录中的输出文件路径
+
+    相同缓存键（输入内容和选项都相同）的并发请求只执行一次转换：转换在独立的工作目录中进行，
+    结果写入缓存后以硬链接放入每个等待请求的工作目录，所有请求都取走结果后删除转换目录。
+
+    Args:
+        cache_key: 转换结果缓存键
+        upload: 发起转换的请求保存的上传文件
+        convert: convert(input_path, output_dir)，在线程池中执行，返回输出文件路径
+        workspace: 本次请求的工作目录
+        label: 转换器名称，用于性能剖析结果的命名
+    """
+    async def job():
+        # 输入文件链接进转换目录，发起请求提前结束并删除其工作目录时不影响其他等待的请求
+        job_workspace = Workspace()
+        try:
+            input_path = job_workspace.file(upload.path)
+            await asyncio.to_thread(_link_or_copy, upload.path, input_path)
+            with track_inflight("conversion"):
+                output_file = await asyncio.to_thread(profile_call, label, convert, input_path, job_workspace.path)
+            if not output_file or not os.path.exists(output_file):
+                raise HTTPException(status_code=500, detail="转换失败: 生成的文件不存在")
+            await asyncio.to_thread(conversion_cache.put, cache_key, output_file)
+        except BaseException:
+            job_workspace.cleanup()
+            raise
+        return job_workspace, output_file
+
+    # 性能剖析的请求单独执行一次转换，不与其他请求合并
+    flight_key = f"{cache_key}:{uuid.uuid4().hex}" if profiling_active() else cache_key
+    async with conversion_flights.join(flight_key, job, cleanup=lambda result: result[0].cleanup()) as result:
+        output_file = result[1]
+        target = workspace.file(output_file)
+        await asyncio.to_thread(_link_or_copy, output_file, target)
+    return target
+
+def _link_or_copy(source, target):
+    """优先创建硬链接，不在同一文件系统时复制"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
 
 # 生成唯一的临时文件名
 import uuid
@@ -109,48 +345,46 @@ def read_api_root():
 @app.post("/api/convert/docx-to-md")
 async def convert_docx_to_md_endpoint(file: UploadFile = File(...)):
     """将Word文件转换为Markdown"""
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in ['.doc', '.docx']:
+        raise HTTPException(status_code=400, detail="只支持DOC和DOCX格式文件")
+    
+    # 上传文件、输出文件和图片目录都放在本次请求的工作目录中，响应发送后整体删除
+    workspace = Workspace()
     try:
-        # 保存上传的文件到临时目录
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if file_extension not in ['.doc', '.docx']:
-            raise HTTPException(status_code=400, detail="只支持DOC和DOCX格式文件")
-        
-        temp_file_path = os.path.join(TEMP_DIR, file.filename)
-        with open(temp_file_path, "wb") as f:
-            f.write(await file.read())
-        
-        # 执行转换
-        result = convert_docx_to_md(temp_file_path)
-        output_file = result["output_file"]
-        
-        # 检查文件是否存在
-        if not os.path.exists(output_file):
-            raise HTTPException(status_code=500, detail="转换失败: 生成的文件不存在")
-        
-        # 转换成功，清理上传的临时文件
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        upload = await save_upload(file, "/api/convert/docx-to-md", workspace.path)
+        
+        # 相同内容的文件已转换过时直接返回缓存结果
+        cache_key = conversion_cache.key("docx_to_md", upload.sha256)
+        cached = serve_cached_conversion(cache_key, output_filename(file.filename, ".md"), "text/markdown", workspace)
+        if cached is not None:
+            return cached
+        
+        # 执行转换，同一文件的并发请求共用一次转换
+        output_file = await run_conversion(
+            cache_key, upload,
+            lambda input_path, output_dir: converters.convert_docx_to_md(input_path)["output_file"],
+            workspace, label="docx_to_md"
+        )
         
         # 返回转换后的文件
         return FileResponse(
             path=output_file,
-            filename=os.path.basename(output_file),
-            media_type="text/markdown"
+            filename=output_filename(file.filename, ".md"),
+            media_type="text/markdown",
+            background=workspace.cleanup_task()
         )
+    except HTTPException:
+        workspace.cleanup()
+        raise
     except Exception as e:
-        # 清理临时文件
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        if 'output_file' in locals() and os.path.exists(output_file):
-            os.remove(output_file)
+        workspace.cleanup()
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
 
-
 @app.post("/api/convert/markdown-to-html")
 async def convert_markdown_to_html_endpoint(file: UploadFile = File(...), style: str = Form("default")):
     """将Markdown文件转换为HTML"""
-    temp_file_path = None
-    output_file = None
+    workspace = Workspace()
     
     try:
         # 保存上传的文件到临时目录
@@ -163,71 +397,41 @@ async def convert_markdown_to_html_endpoint(file: UploadFile = File(...), style:
             file_name = file_name + '.md'
             file_extension = '.md'
         
-        temp_file_path = os.path.join(TEMP_DIR, file_name)
-        
-        # 读取文件内容，限制大小
-        content = await file.read()
-        content_size = len(content)
-        print(f"接收到文件，大小: {content_size}字节")
-        
-        # 限制文件大小，防止过大的文件导致服务器崩溃
-        if content_size > 10 * 1024 * 1024:  # 10MB
-            raise HTTPException(status_code=400, detail="文件过大，最大支持10MB")
+        # 分块写入临时文件，同时限制大小并确认内容是UTF-8文本
+        upload = await save_upload(file, "/api/convert/markdown-to-html", workspace.path, extension=file_extension,
+                                   text=True)
+        logger.debug("接收到文件，大小: %s字节", upload.size)
         
-        # 确保内容是文本格式
-        try:
-            # 尝试解码为UTF-8，确保是文本
-            text_content = content.decode('utf-8')
-        except UnicodeDecodeError:
-            raise HTTPException(status_code=400, detail="文件不是有效的文本格式")
-        
-        with open(temp_file_path, "wb") as f:
-            f.write(content)
+        # 相同内容和样式已转换过时直接返回缓存结果
+        cache_key = conversion_cache.key("markdown_to_html", upload.sha256, {"style": style})
+        cached = None if profiling_active() else conversion_cache.get(cache_key)
+        if cached is not None:
+            with open(cached, "r", encoding="utf-8") as f:
+                return HTMLResponse(content=f.read(), media_type="text/html", headers={"X-Conversion-Cache": "hit"})
         
-        # 直接调用转换器，不指定output_file，让它自动生成文件名
+        # 不指定output_file，让转换器在转换目录中自动生成文件名
         import time
         start_time = time.time()
         
-        # 设置超时控制
-        import threading
-        result = None
-        exception = None
-        
-        def convert_thread():
-            nonlocal result, exception
-            try:
-                result = convert_markdown_to_html(temp_file_path, options={"style": style})
-            except Exception as e:
-                exception = e
-        
-        # 启动转换线程
-        thread = threading.Thread(target=convert_thread)
-        thread.daemon = True
-        thread.start()
-        
-        # 等待转换完成，最多等待10秒
-        thread.join(10)
+        def convert(input_path, output_dir):
+            result = converters.convert_markdown_to_html(input_path, options={"style": style, "output_dir": output_dir})
+            if not result:
+                raise Exception("转换失败，没有返回结果")
+            return result["output_file"]
         
-        if thread.is_alive():
+        # 同一内容的并发请求共用一次转换，本次请求最多等待10秒
+        try:
+            output_file = await asyncio.wait_for(
+                run_conversion(cache_key, upload, convert, workspace, label="markdown_to_html"), 10
+            )
+        except asyncio.TimeoutError:
             raise TimeoutError("转换超时，内容可能过于复杂")
         
-        if exception:
-            raise exception
-        
-        if not result:
-            raise Exception("转换失败，没有返回结果")
-        
-        output_file = result["output_file"]
-        
-        # 检查文件是否存在
-        if not os.path.exists(output_file):
-            raise HTTPException(status_code=500, detail="转换失败: 生成的文件不存在")
-        
         # 读取转换后的HTML文件内容
         with open(output_file, "r", encoding="utf-8") as f:
             full_html_content = f.read()
         
-        print(f"转换成功，耗时: {time.time() - start_time:.2f}秒，HTML长度: {len(full_html_content)}字节")
+        logger.info("转换成功，耗时: %.2f秒，HTML长度: %s字节", time.time() - start_time, len(full_html_content))
         
         # 对于实时预览，直接返回完整的HTML文件，以便前端使用iframe渲染，保证样式一致
         html_content = full_html_content
@@ -235,93 +439,113 @@ async def convert_markdown_to_html_endpoint(file: UploadFile = File(...), style:
         return HTMLResponse(content=html_content, media_type="text/html")
     except TimeoutError as e:
         # 转换超时
-        print(f"转换超时: {e}")
+        logger.warning("转换超时: %s", e)
         raise HTTPException(status_code=504, detail=f"转换超时: {str(e)}")
     except HTTPException:
         # 重新抛出已经处理过的HTTP异常
         raise
     except Exception as e:
         # 打印详细错误信息，方便调试
-        print(f"转换失败详细错误: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("转换失败详细错误: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
     finally:
-        # 清理所有临时文件，无论成功失败
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
-        if output_file and os.path.exists(output_file):
-            try:
-                os.remove(output_file)
-            except:
-                pass
+        # HTML内容已读入响应，无论成功失败都删除工作目录
+        workspace.cleanup()
 
 @app.post("/api/convert/markdown-to-docx")
 async def convert_markdown_to_docx_endpoint(file: UploadFile = File(...), style: str = Form("default")):
     """将Markdown文件转换为Word"""
+    # 上传文件、中间HTML和输出文件都放在本次请求的工作目录中，响应发送后整体删除
+    workspace = Workspace()
     try:
-        # 保存上传的文件到临时目录
         file_name = file.filename if file.filename else 'temp.md'
         
         # 确保文件有正确的扩展名
         if not file_name.endswith(('.md', '.markdown', '.txt')):
             file_name = file_name + '.md'
         
-        temp_file_path = os.path.join(TEMP_DIR, file_name)
-        with open(temp_file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # 执行转换
-        options = {"style": style, "output_dir": TEMP_DIR}
-        result = convert_markdown_to_docx(temp_file_path, options=options)
+        upload = await save_upload(file, "/api/convert/markdown-to-docx", workspace.path,
+                                   extension=os.path.splitext(file_name)[1].lower())
         
-        if not result["success"]:
-            raise Exception(result.get("message", "转换失败"))
-            
-        output_file = result["output_file"]
+        # 相同内容和样式已转换过时直接返回缓存结果
+        cache_key = conversion_cache.key("markdown_to_docx", upload.sha256, {"style": style})
+        cached = serve_cached_conversion(
+            cache_key,
+            output_filename(file_name, ".docx"),
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            workspace
+        )
+        if cached is not None:
+            return cached
         
-        # 检查文件是否存在
-        if not os.path.exists(output_file):
-            raise HTTPException(status_code=500, detail="转换失败: 生成的文件不存在")
+        def convert(input_path, output_dir):
+            result = converters.convert_markdown_to_docx(input_path, options={"style": style, "output_dir": output_dir})
+            if not result["success"]:
+                raise Exception(result.get("message", "转换失败"))
+            return result["output_file"]
         
-        # 转换成功，清理上传的临时文件
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        # 执行转换，同一内容的并发请求共用一次转换
+        output_file = await run_conversion(cache_key, upload, convert, workspace, label="markdown_to_docx")
         
         # 返回转换后的文件
         return FileResponse(
             path=output_file,
-            filename=os.path.basename(output_file),
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            filename=output_filename(file_name, ".docx"),
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            background=workspace.cleanup_task()
         )
+    except HTTPException:
+        workspace.cleanup()
+        raise
     except Exception as e:
-        # 如果发生错误，清理所有文件
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        if 'output_file' in locals() and os.path.exists(output_file):
-            os.remove(output_file)
+        workspace.cleanup()
         # 打印错误信息
-        print(f"Markdown转Word失败: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("Markdown转Word失败: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
 
+def web_error_document(heading, summary, url, detail, filename="转换失败.docx"):
+    """生成说明失败原因的Word文档响应，网页转Word失败时返回给用户
+
+    文档在内存中生成，同时失败的请求不会争用同一个临时文件
+    """
+    from docx import Document
+    error_doc = Document()
+    error_doc.add_heading(heading, level=1)
+    error_doc.add_paragraph(summary)
+    error_doc.add_paragraph(f"URL: {url}")
+    error_doc.add_paragraph(f"错误信息: {detail}")
+    buffer = io.BytesIO()
+    error_doc.save(buffer)
+    content = buffer.getvalue()
+    
+    # 使用urllib.parse.quote编码中文文件名
+    encoded_filename = urllib.parse.quote(filename)
+    return Response(
+        content=content,
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}",
+            "Content-Length": str(len(content)),
+            "Content-Transfer-Encoding": "binary"
+        }
+    )
 
 @app.post("/api/convert/web-to-docx")
-async def convert_web_to_docx_endpoint(url: Optional[str] = Form(None), file: Optional[UploadFile] = File(None)):
-    """将网页转换为DOCX文件"""
-    print(f"[DEBUG] 收到web-to-docx请求，URL: {url}, 文件: {file.filename if file else None}")
+async def convert_web_to_docx_endpoint(url: Optional[str] = Form(None), file: Optional[UploadFile] = File(None), render_mode: str = Form("static")):
+    """将网页转换为DOCX文件，render_mode 为 browser 或 auto 时使用无头浏览器渲染客户端渲染的页面"""
+    logger.info("收到web-to-docx请求，URL: %s, 文件: %s, 渲染模式: %s", url, file.filename if file else None, render_mode)
     output_file = None
+    # 上传文件、输出文件和图片目录都放在本次请求的工作目录中
+    workspace = Workspace()
     
     try:
         # 验证参数
         if not url and not file:
             raise HTTPException(status_code=400, detail="请提供URL或选择HTML文件")
         
+        if render_mode not in ("static", "browser", "auto"):
+            raise HTTPException(status_code=400, detail="render_mode 只支持 static、browser 或 auto")
+        
         # 如果提供了URL，验证URL格式
         if url:
             import re
@@ -336,194 +560,95 @@ async def convert_web_to_docx_endpoint(url: Optional[str] = Form(None), file: Op
             if file_extension not in ['.html', '.htm']:
                 raise HTTPException(status_code=400, detail="只支持HTML格式文件")
             
-            temp_file_path = os.path.join(TEMP_DIR, file.filename)
-            with open(temp_file_path, "wb") as f:
-                f.write(await file.read())
+            # 工作目录由本次请求独占，保留原始文件名，转换器会以文件名作为无标题页面的标题
+            upload = await save_upload(file, "/api/convert/web-to-docx", workspace.path, name=file.filename)
+            temp_file_path = upload.path
             
             # 将文件路径作为URL传递给转换函数
             url = f"file://{temp_file_path}"
-            print(f"[DEBUG] 使用文件作为URL: {url}")
+            logger.debug("使用文件作为URL: %s", url)
         
         # 执行转换，添加超时控制
         import threading
         import time
         result = None
         exception = None
+        # 转换线程结束时通知事件循环，等待期间不阻塞其他请求
+        loop = asyncio.get_running_loop()
+        finished = asyncio.Event()
+        
+        def notify_finished():
+            try:
+                loop.call_soon_threadsafe(finished.set)
+            except RuntimeError:
+                # 超时后事件循环已关闭，无需通知
+                pass
         
         def convert_thread():
             nonlocal result, exception
             try:
-                print(f"[DEBUG] 转换线程开始，URL: {url}")
+                logger.debug("转换线程开始，URL: %s", url)
                 # 设置转换选项，包括超时时间
                 options = {
                     "timeout": 10,  # 设置10秒超时，避免长时间等待
-                    "output_dir": TEMP_DIR  # 使用临时目录
+                    "output_dir": workspace.path,  # 使用本次请求的工作目录
+                    "render_mode": render_mode
                 }
-                result = convert_web_to_docx(url, options=options)
-                print(f"[DEBUG] 转换线程完成，结果: {result}")
+                result = profile_call("web_to_docx", converters.convert_web_to_docx, url, options=options)
+                logger.debug("转换线程完成，结果: %s", result)
             except Exception as e:
                 exception = e
-                print(f"[DEBUG] 转换线程异常: {type(e).__name__}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.error("转换线程异常: %s: %s", type(e).__name__, e, exc_info=True)
+            finally:
+                notify_finished()
         
         # 启动转换线程
-        print(f"[DEBUG] 启动转换线程")
-        thread = threading.Thread(target=convert_thread)
+        logger.debug("启动转换线程")
+        # 在当前上下文的副本中运行，转换器的日志带有本次请求的ID
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(convert_thread,))
         thread.daemon = True
         thread.start()
         
-        # 等待转换完成，最多等待20秒
-        print(f"[DEBUG] 等待转换线程完成，最多20秒")
-        thread.join(20)
+        # 等待转换完成，最多等待20秒，浏览器渲染需要额外的页面加载时间
+        join_timeout = 20 if render_mode == "static" else 40
+        logger.debug("等待转换线程完成，最多%s秒", join_timeout)
+        try:
+            await asyncio.wait_for(finished.wait(), join_timeout)
+        except asyncio.TimeoutError:
+            pass
         
         # 检查转换是否超时
-        if thread.is_alive():
-            print(f"[DEBUG] 转换线程超时")
-            # 不再抛出500错误，而是返回一个友好的错误信息
-            from fastapi.responses import Response
-            # 创建一个简单的错误文档
-            from docx import Document
-            error_doc = Document()
-            error_doc.add_heading("转换超时", level=1)
-            error_doc.add_paragraph("抱歉，网页转换超时。请检查网络连接或稍后重试。")
-            error_doc.add_paragraph(f"URL: {url}")
-            error_doc.add_paragraph(f"错误信息: 转换超时，请检查网络连接或稍后重试")
-            
-            # 保存错误文档到临时文件
-            error_file_path = os.path.join(TEMP_DIR, f"转换失败_{int(time.time())}.docx")
-            error_doc.save(error_file_path)
-            
-            # 读取错误文档内容
-            with open(error_file_path, "rb") as f:
-                content = f.read()
-            
-            # 清理临时文件
-            os.remove(error_file_path)
-            
-            # 使用urllib.parse.quote编码中文文件名
-            import urllib.parse
-            encoded_filename = urllib.parse.quote("转换失败_超时.docx")
-            return Response(
-                content=content,
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                headers={
-                    "Content-Disposition": f'attachment; filename*=UTF-8''{encoded_filename}',
-                    "Content-Length": str(len(content)),
-                    "Content-Transfer-Encoding": "binary"
-                }
+        if not finished.is_set():
+            logger.warning("转换线程超时")
+            # 不再抛出500错误，而是返回一个友好的错误信息；超时的转换线程之后写入的文件由定期清理任务删除
+            workspace.cleanup()
+            return web_error_document(
+                "转换超时", "抱歉，网页转换超时。请检查网络连接或稍后重试。", url,
+                "转换超时，请检查网络连接或稍后重试", filename="转换失败_超时.docx"
             )
         
         # 检查是否发生异常
         if exception:
-            print(f"[DEBUG] 转换过程中发生异常: {str(exception)}")
-            # 不再抛出500错误，而是返回一个友好的错误信息
-            from fastapi.responses import Response
-            from docx import Document
-            
-            error_doc = Document()
-            error_doc.add_heading("转换失败", level=1)
-            error_doc.add_paragraph("抱歉，网页转换失败。请检查URL是否正确或稍后重试。")
-            error_doc.add_paragraph(f"URL: {url}")
-            error_doc.add_paragraph(f"错误信息: {str(exception)}")
-            
-            # 保存错误文档到临时文件
-            error_file_path = os.path.join(TEMP_DIR, f"转换失败_{int(time.time())}.docx")
-            error_doc.save(error_file_path)
-            
-            # 读取错误文档内容
-            with open(error_file_path, "rb") as f:
-                content = f.read()
-            
-            # 清理临时文件
-            os.remove(error_file_path)
-            
-            # 使用urllib.parse.quote编码中文文件名
-            import urllib.parse
-            encoded_filename = urllib.parse.quote("转换失败.docx")
-            return Response(
-                content=content,
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                headers={
-                    "Content-Disposition": f'attachment; filename*=UTF-8''{encoded_filename}',
-                    "Content-Length": str(len(content)),
-                    "Content-Transfer-Encoding": "binary"
-                }
-            )
+            logger.error("转换过程中发生异常: %s", exception)
+            workspace.cleanup()
+            return web_error_document("转换失败", "抱歉，网页转换失败。请检查URL是否正确或稍后重试。", url, str(exception))
         
         # 检查转换结果是否成功
-        print(f"[DEBUG] 检查转换结果: {result}")
+        logger.debug("检查转换结果: %s", result)
         if not result or not result.get("success", False):
             message = result.get('message', '未知错误') if result else '转换失败'
-            print(f"[DEBUG] 转换失败: {message}")
-            
-            # 不再抛出500错误，而是返回一个友好的错误信息
-            from fastapi.responses import Response
-            from docx import Document
-            
-            error_doc = Document()
-            error_doc.add_heading("转换失败", level=1)
-            error_doc.add_paragraph("抱歉，网页转换失败。请检查URL是否正确或稍后重试。")
-            error_doc.add_paragraph(f"URL: {url}")
-            error_doc.add_paragraph(f"错误信息: {message}")
-            
-            # 保存错误文档到临时文件
-            error_file_path = os.path.join(TEMP_DIR, f"转换失败_{int(time.time())}.docx")
-            error_doc.save(error_file_path)
-            
-            # 读取错误文档内容
-            with open(error_file_path, "rb") as f:
-                content = f.read()
-            
-            # 清理临时文件
-            os.remove(error_file_path)
-            
-            return Response(
-                content=content,
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                headers={
-                    "Content-Disposition": f'attachment; filename="转换失败.docx"',
-                    "Content-Length": str(len(content)),
-                    "Content-Transfer-Encoding": "binary"
-                }
-            )
+            logger.warning("转换失败: %s", message)
+            workspace.cleanup()
+            return web_error_document("转换失败", "抱歉，网页转换失败。请检查URL是否正确或稍后重试。", url, message)
             
         output_file = result["output_file"]
-        print(f"[DEBUG] 转换成功，输出文件: {output_file}")
+        logger.info("转换成功，输出文件: %s", output_file)
         
         # 检查文件是否存在
         if not os.path.exists(output_file):
-            print(f"[DEBUG] 生成的文件不存在: {output_file}")
-            # 不再抛出500错误，而是返回一个友好的错误信息
-            from fastapi.responses import Response
-            from docx import Document
-            
-            error_doc = Document()
-            error_doc.add_heading("转换失败", level=1)
-            error_doc.add_paragraph("抱歉，网页转换失败。生成的文件不存在。")
-            error_doc.add_paragraph(f"URL: {url}")
-            error_doc.add_paragraph(f"错误信息: 生成的文件不存在")
-            
-            # 保存错误文档到临时文件
-            error_file_path = os.path.join(TEMP_DIR, f"转换失败_{int(time.time())}.docx")
-            error_doc.save(error_file_path)
-            
-            # 读取错误文档内容
-            with open(error_file_path, "rb") as f:
-                content = f.read()
-            
-            # 清理临时文件
-            os.remove(error_file_path)
-            
-            return Response(
-                content=content,
-                media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                headers={
-                    "Content-Disposition": f'attachment; filename="转换失败.docx"',
-                    "Content-Length": str(len(content)),
-                    "Content-Transfer-Encoding": "binary"
-                }
-            )
+            logger.error("生成的文件不存在: %s", output_file)
+            workspace.cleanup()
+            return web_error_document("转换失败", "抱歉，网页转换失败。生成的文件不存在。", url, "生成的文件不存在")
         
         # 从转换结果中获取网页标题，用于文件名
         web_title = result.get("title", "网页内容")
@@ -533,69 +658,25 @@ async def convert_web_to_docx_endpoint(url: Optional[str] = Form(None), file: Op
         filename = f"{safe_title}.docx"
         
         # 打印调试信息
-        print(f"[DEBUG] 网页标题: {web_title}")
-        print(f"[DEBUG] 安全文件名: {filename}")
-        print(f"[DEBUG] 输出文件路径: {output_file}")
-        
-        # 清理上传的临时文件
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            print(f"[DEBUG] 清理上传的临时文件: {temp_file_path}")
-            os.remove(temp_file_path)
+        logger.debug("网页标题: %s", web_title)
+        logger.debug("安全文件名: %s", filename)
+        logger.debug("输出文件路径: %s", output_file)
         
-        # 返回转换后的文件，使用FileResponse自动处理文件名编码
-        print(f"[DEBUG] 返回响应，状态码: 200")
+        # 返回转换后的文件，使用FileResponse自动处理文件名编码，响应发送后删除工作目录
+        logger.debug("返回响应，状态码: 200")
         return FileResponse(
             path=output_file,
             filename=filename,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            background=workspace.cleanup_task()
         )
     except Exception as e:
         # 打印详细错误信息，方便调试
-        print(f"[DEBUG] 转换失败详细错误: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        # 如果发生错误，清理输出文件
-        if output_file and os.path.exists(output_file):
-            print(f"[DEBUG] 清理输出文件: {output_file}")
-            os.remove(output_file)
+        logger.error("转换失败详细错误: %s: %s", type(e).__name__, e, exc_info=True)
         
         # 最终的错误处理，确保返回一个Word文档而不是HTML
-        from fastapi.responses import Response
-        from docx import Document
-        
-        error_doc = Document()
-        error_doc.add_heading("转换失败", level=1)
-        error_doc.add_paragraph("抱歉，网页转换失败。请检查URL是否正确或稍后重试。")
-        error_doc.add_paragraph(f"URL: {url}")
-        error_doc.add_paragraph(f"错误信息: {str(e)}")
-        
-        # 保存错误文档到临时文件
-        import tempfile
-        error_file_path = os.path.join(TEMP_DIR, f"转换失败_{int(time.time())}.docx")
-        error_doc.save(error_file_path)
-        
-        # 读取错误文档内容
-        with open(error_file_path, "rb") as f:
-            content = f.read()
-        
-        # 清理临时文件
-        os.remove(error_file_path)
-        
-        # 清理上传的临时文件
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            print(f"[DEBUG] 清理上传的临时文件: {temp_file_path}")
-            os.remove(temp_file_path)
-        
-        return Response(
-            content=content,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={
-                "Content-Disposition": f'attachment; filename="转换失败.docx"',
-                "Content-Length": str(len(content)),
-                "Content-Transfer-Encoding": "binary"
-            }
-        )
+        workspace.cleanup()
+        return web_error_document("转换失败", "抱歉，网页转换失败。请检查URL是否正确或稍后重试。", url, str(e))
 
 @app.get("/api/styles")
 def get_styles():
@@ -611,97 +692,100 @@ def get_styles():
 @app.post("/api/convert/pdf-to-word")
 async def convert_pdf_to_word_endpoint(file: UploadFile = File(...), use_ocr: bool = Form(False), ocr_lang: str = Form("chi_sim+eng")):
     """将PDF文件转换为Word文档"""
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in ['.pdf']:
+        raise HTTPException(status_code=400, detail="只支持PDF格式文件")
+    
+    # 上传文件和输出文件都放在本次请求的工作目录中，响应发送后整体删除
+    workspace = Workspace()
     try:
-        # 保存上传的文件到临时目录
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if file_extension not in ['.pdf']:
-            raise HTTPException(status_code=400, detail="只支持PDF格式文件")
-        
-        temp_file_path = os.path.join(TEMP_DIR, file.filename)
-        with open(temp_file_path, "wb") as f:
-            f.write(await file.read())
+        upload = await save_upload(file, "/api/convert/pdf-to-word", workspace.path)
         
         # 执行转换，添加OCR选项
         options = {
             "use_ocr": use_ocr,
             "ocr_lang": ocr_lang
         }
-        result = convert_pdf_to_word(temp_file_path, options=options)
-        output_file = result["output_file"]
-        
-        # 检查文件是否存在
-        if not os.path.exists(output_file):
-            raise HTTPException(status_code=500, detail="转换失败: 生成的文件不存在")
         
-        # 转换成功，只清理上传的临时文件，不清理输出文件，因为FileResponse需要它
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        # 相同内容和选项已转换过时直接返回缓存结果
+        cache_key = conversion_cache.key("pdf_to_word", upload.sha256, options)
+        cached = serve_cached_conversion(cache_key, output_filename(file.filename, ".docx"), "application/vnd.openxmlformats-officedocument.wordprocessingml.document", workspace)
+        if cached is not None:
+            return cached
+        
+        # 同一文件和选项的并发请求共用一次转换
+        output_file = await run_conversion(
+            cache_key, upload,
+            lambda input_path, output_dir: converters.convert_pdf_to_word(input_path, options=options)["output_file"],
+            workspace, label="pdf_to_word"
+        )
         
         # 返回转换后的文件
         return FileResponse(
             path=output_file,
-            filename=os.path.basename(output_file),
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            filename=output_filename(file.filename, ".docx"),
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            background=workspace.cleanup_task()
         )
+    except HTTPException:
+        workspace.cleanup()
+        raise
     except Exception as e:
         # 添加详细的错误日志
-        import traceback
-        print(f"转换失败的详细错误信息: {traceback.format_exc()}")
-        # 如果发生错误，清理所有文件
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        if 'output_file' in locals() and os.path.exists(output_file):
-            os.remove(output_file)
+        logger.error("转换失败: %s", e, exc_info=True)
+        workspace.cleanup()
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
 
 @app.post("/api/convert/word-to-pdf")
 async def convert_word_to_pdf_endpoint(file: UploadFile = File(...), use_ocr: bool = Form(False), ocr_lang: str = Form("chi_sim+eng")):
     """将Word文件转换为PDF文档"""
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    if file_extension not in ['.doc', '.docx']:
+        raise HTTPException(status_code=400, detail="只支持DOC和DOCX格式文件")
+    
+    # 上传文件和输出文件都放在本次请求的工作目录中，响应发送后整体删除
+    workspace = Workspace()
     try:
-        # 保存上传的文件到临时目录
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if file_extension not in ['.doc', '.docx']:
-            raise HTTPException(status_code=400, detail="只支持DOC和DOCX格式文件")
-        
-        temp_file_path = os.path.join(TEMP_DIR, file.filename)
-        with open(temp_file_path, "wb") as f:
-            f.write(await file.read())
+        upload = await save_upload(file, "/api/convert/word-to-pdf", workspace.path)
         
         # 执行转换，添加OCR选项
         options = {
             "use_ocr": use_ocr,
             "ocr_lang": ocr_lang
         }
-        result = convert_word_to_pdf(temp_file_path, options=options)
-        output_file = result["output_file"]
-        
-        # 检查文件是否存在
-        if not os.path.exists(output_file):
-            raise HTTPException(status_code=500, detail="转换失败: 生成的文件不存在")
         
-        # 转换成功，只清理上传的临时文件，不清理输出文件，因为FileResponse需要它
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        # 相同内容和选项已转换过时直接返回缓存结果
+        cache_key = conversion_cache.key("word_to_pdf", upload.sha256, options)
+        cached = serve_cached_conversion(cache_key, output_filename(file.filename, ".pdf"), "application/pdf", workspace)
+        if cached is not None:
+            return cached
+        
+        # 同一文件和选项的并发请求共用一次转换
+        output_file = await run_conversion(
+            cache_key, upload,
+            lambda input_path, output_dir: converters.convert_word_to_pdf(input_path, options=options)["output_file"],
+            workspace, label="word_to_pdf"
+        )
         
         # 返回转换后的文件
         return FileResponse(
             path=output_file,
-            filename=os.path.basename(output_file),
-            media_type="application/pdf"
+            filename=output_filename(file.filename, ".pdf"),
+            media_type="application/pdf",
+            background=workspace.cleanup_task()
         )
+    except HTTPException:
+        workspace.cleanup()
+        raise
     except Exception as e:
         # 添加详细的错误日志
-        import traceback
-        print(f"转换失败的详细错误信息: {traceback.format_exc()}")
-        # 如果发生错误，清理所有文件
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-        if 'output_file' in locals() and os.path.exists(output_file):
-            os.remove(output_file)
+        logger.error("转换失败: %s", e, exc_info=True)
+        workspace.cleanup()
         raise HTTPException(status_code=500, detail=f"转换失败: {str(e)}")
 
 @app.post("/api/crawl/media")
-async def crawl_media(platform: str = Form(...), url: str = Form(None), keyword: str = Form(None), post_id: str = Form(None)):
+async def crawl_media(platform: str = Form(...), url: str = Form(None), keyword: str = Form(None), post_id: str = Form(None),
+                      max_results: Optional[int] = Form(None), max_pages: Optional[int] = Form(None)):
     """自媒体平台内容采集 - 使用浏览器进行真实数据采集"""
     try:
         # 验证参数
@@ -709,53 +793,170 @@ async def crawl_media(platform: str = Form(...), url: str = Form(None), keyword:
             raise HTTPException(status_code=400, detail="至少需要提供url、keyword或post_id中的一个参数")
         
         # 初始化MediaCrawler并执行采集
-        crawler = MediaCrawler()
-        await crawler.init_browser()
+        # 浏览器在缓存未命中时才按需初始化
+        crawler = MediaCrawler(browser_pool=getattr(app.state, "crawler_pool", None), cache=crawl_cache,
+                               scheduler=crawl_scheduler)
         
         try:
-            result = await crawler.crawl(platform, url, keyword, post_id)
+            result = await crawler.crawl(platform, url, keyword, post_id, max_results, max_pages)
             return result
         finally:
             await crawler.close_browser()
+    except HTTPException:
+        raise
+    except SchedulerQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"采集请求过多，请稍后重试: {str(e)}")
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.error("采集失败: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"采集失败: {str(e)}")
 
+@app.post("/api/crawl/media/stream")
+async def crawl_media_stream(platform: str = Form(...), keyword: str = Form(...), max_results: Optional[int] = Form(None),
+                             max_pages: Optional[int] = Form(None)):
+    """关键词搜索流式采集 - 在同一个页面中滚动或翻页，以NDJSON逐行返回新发现的结果"""
+    import json
+    
+    crawler = MediaCrawler(browser_pool=getattr(app.state, "crawler_pool", None), scheduler=crawl_scheduler)
+    if platform not in crawler.platforms:
+        raise HTTPException(status_code=400, detail=f"不支持的平台: {platform}")
+    
+    async def generate():
+        count = 0
+        try:
+            async for items in crawler.iter_keyword(platform, keyword, max_results, max_pages):
+                for item in items:
+                    count += 1
+                    yield json.dumps({"index": count, "item": item}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "count": count, "stats": crawler.load_stats.to_dict()}, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.warning("流式采集失败: %s", e)
+            yield json.dumps({"done": True, "count": count, "error": str(e)}, ensure_ascii=False) + "\n"
+        finally:
+            await crawler.close_browser()
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        # 跳过GZip压缩，避免压缩缓冲导致结果不能逐行到达
+        headers={"Content-Encoding": "identity"}
+    )
+
+@app.post("/api/crawl/media/batch")
+async def crawl_media_batch(payload: dict = Body(...)):
+    """批量采集 - 并发采集多个平台的目标，以NDJSON逐行返回每个完成的结果"""
+    import json
+    
+    targets = payload.get("targets")
+    if not isinstance(targets, list) or not targets:
+        raise HTTPException(status_code=400, detail="targets必须是非空列表")
+    if len(targets) > MAX_BATCH_TARGETS:
+        raise HTTPException(status_code=400, detail=f"单次最多采集{MAX_BATCH_TARGETS}个目标")
+    for index, target in enumerate(targets):
+        error = validate_target(target)
+        if error:
+            raise HTTPException(status_code=400, detail=f"第{index + 1}个目标无效: {error}")
+    
+    async def generate():
+        async for item in crawl_batch(targets, getattr(app.state, "crawler_pool", None), cache=crawl_cache,
+                                      scheduler=crawl_scheduler):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        # 跳过GZip压缩，避免压缩缓冲导致结果不能逐行到达
+        headers={"Content-Encoding": "identity"}
+    )
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 指标，多个worker进程时汇总所有进程的数据"""
+    content = await asyncio.to_thread(render_metrics)
+    if content is None:
+        raise HTTPException(status_code=503, detail="未安装 prometheus_client，无法导出指标")
+    return Response(content=content, media_type=CONTENT_TYPE_LATEST, headers={"Cache-Control": "no-store"})
+
+def require_admin(request):
+    """校验管理员令牌，未开启性能剖析时视为接口不存在"""
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="性能剖析未开启")
+    if not check_admin_token(request.headers.get("x-admin-token")):
+        raise HTTPException(status_code=403, detail="需要有效的管理员令牌")
+
+@app.get("/api/system/profiles")
+def get_profiles(request: Request):
+    """已保存的性能剖析结果，最新的在前"""
+    require_admin(request)
+    return {"profiles": list_profiles()}
+
+@app.get("/api/system/profiles/{profile_id}")
+def download_profile(profile_id: str, request: Request):
+    """下载性能剖析结果：speedscope 格式可在 https://www.speedscope.app 查看火焰图，.prof 可用 snakeviz 查看"""
+    require_admin(request)
+    found = find_profile(profile_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="性能剖析结果不存在")
+    path, media_type = found
+    return FileResponse(path=path, filename=os.path.basename(path), media_type=media_type,
+                        headers={"Cache-Control": "no-store"})
+
+@app.get("/api/system/conversion-cache")
+async def get_conversion_cache_stats():
+    """转换结果缓存的命中率和磁盘占用，以及正在执行和被合并的转换数"""
+    stats = await asyncio.to_thread(conversion_cache.stats)
+    stats["single_flight"] = conversion_flights.stats()
+    return stats
+
+@app.get("/api/system/workspaces")
+async def get_workspace_usage():
+    """请求工作目录的数量和磁盘占用"""
+    return await asyncio.to_thread(workspace_usage)
+
+@app.get("/api/crawl/metrics")
+async def crawl_metrics():
+    """采集运行状态 - 各平台的排队数、等待时间、成功率和模拟数据比例，以及缓存和浏览器池状态"""
+    pool = getattr(app.state, "crawler_pool", None)
+    return {
+        "scheduler": crawl_scheduler.metrics(),
+        "cache": crawl_cache.stats(),
+        "browser_pool": pool.stats() if pool is not None else None
+    }
+
 # 书签管理API
 
-# 书签存储文件路径
+# 书签数据库路径，可通过环境变量 BOOKMARKS_DB 指定
+BOOKMARKS_DB = os.environ.get("BOOKMARKS_DB", os.path.join(os.path.dirname(__file__), "bookmarks.db"))
+
+# 旧版书签文件，首次启动时导入数据库
 BOOKMARKS_FILE = os.path.join(os.path.dirname(__file__), "bookmarks.json")
 
-# 确保书签文件存在
-def ensure_bookmarks_file():
-    """确保书签文件存在，如果不存在则创建"""
-    if not os.path.exists(BOOKMARKS_FILE):
-        with open(BOOKMARKS_FILE, "w", encoding="utf-8") as f:
-            f.write("[]")
-
-# 读取书签
-def read_bookmarks():
-    """读取所有书签"""
-    ensure_bookmarks_file()
-    with open(BOOKMARKS_FILE, "r", encoding="utf-8") as f:
-        import json
-        return json.load(f)
-
-# 写入书签
-def write_bookmarks(bookmarks):
-    """写入书签"""
-    ensure_bookmarks_file()
-    with open(BOOKMARKS_FILE, "w", encoding="utf-8") as f:
-        import json
-        json.dump(bookmarks, f, ensure_ascii=False, indent=2)
+bookmark_store = BookmarkStore(BOOKMARKS_DB, legacy_json_path=BOOKMARKS_FILE)
 
 @app.get("/api/v1/bookmarks")
-def get_bookmarks():
-    """获取所有书签"""
+def get_bookmarks(request: Request, limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                  cursor: Optional[str] = None, q: Optional[str] = None, fields: Optional[str] = None):
+    """分页获取书签
+    
+    - limit / cursor: 每页条数和上一页返回的 next_cursor
+    - q: 搜索标题、URL和描述，多个词以空格分隔
+    - fields: 以逗号分隔的返回字段，如 id,title,url
+    - 请求头 If-None-Match 与当前ETag一致时返回304
+    """
     try:
-        bookmarks = read_bookmarks()
-        return {"success": True, "data": bookmarks}
+        field_list = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+        etag = bookmark_store.etag(limit, cursor, q, field_list)
+        # 书签可能被修改，客户端每次使用前都需要用ETag验证
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        bookmarks, next_cursor = bookmark_store.page(limit, cursor, q, field_list)
+        return JSONResponse(
+            {"success": True, "data": bookmarks, "next_cursor": next_cursor, "has_more": next_cursor is not None},
+            headers=headers
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取书签失败: {str(e)}")
 
@@ -767,20 +968,12 @@ def add_bookmark(bookmark: dict = Body(...)):
         if not bookmark.get("title") or not bookmark.get("url"):
             raise HTTPException(status_code=400, detail="书签标题和URL不能为空")
         
-        # 读取现有书签
-        bookmarks = read_bookmarks()
-        
-        # 添加新书签
-        new_bookmark = {
-            "id": str(uuid.uuid4()),
-            "title": bookmark["title"],
-            "url": bookmark["url"],
-            "description": bookmark.get("description", ""),
-            "createdAt": bookmark.get("createdAt", time.strftime("%Y-%m-%d %H:%M:%S"))
-        }
-        
-        bookmarks.append(new_bookmark)
-        write_bookmarks(bookmarks)
+        new_bookmark = bookmark_store.add(
+            bookmark["title"],
+            bookmark["url"],
+            bookmark.get("description", ""),
+            bookmark.get("createdAt")
+        )
         
         return {"success": True, "data": new_bookmark}
     except HTTPException:
@@ -792,29 +985,11 @@ def add_bookmark(bookmark: dict = Body(...)):
 def update_bookmark(bookmark_id: str, bookmark: dict = Body(...)):
     """更新书签"""
     try:
-        # 读取现有书签
-        bookmarks = read_bookmarks()
-        
-        # 查找书签
-        found = False
-        for i, b in enumerate(bookmarks):
-            if b["id"] == bookmark_id:
-                # 更新书签
-                bookmarks[i] = {
-                    **b,
-                    "title": bookmark.get("title", b["title"]),
-                    "url": bookmark.get("url", b["url"]),
-                    "description": bookmark.get("description", b.get("description", ""))
-                }
-                found = True
-                break
-        
-        if not found:
+        updated = bookmark_store.update(bookmark_id, bookmark)
+        if updated is None:
             raise HTTPException(status_code=404, detail="书签不存在")
         
-        write_bookmarks(bookmarks)
-        
-        return {"success": True, "data": bookmarks[i]}
+        return {"success": True, "data": updated}
     except HTTPException:
         raise
     except Exception as e:
@@ -824,17 +999,9 @@ def update_bookmark(bookmark_id: str, bookmark: dict = Body(...)):
 def delete_bookmark(bookmark_id: str):
     """删除书签"""
     try:
-        # 读取现有书签
-        bookmarks = read_bookmarks()
-        
-        # 过滤掉要删除的书签
-        new_bookmarks = [b for b in bookmarks if b["id"] != bookmark_id]
-        
-        if len(new_bookmarks) == len(bookmarks):
+        if not bookmark_store.delete(bookmark_id):
             raise HTTPException(status_code=404, detail="书签不存在")
         
-        write_bookmarks(new_bookmarks)
-        
         return {"success": True, "message": "书签删除成功"}
     except HTTPException:
         raise
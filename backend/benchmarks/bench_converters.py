@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换器基准测试
+
+1. 用 benchmarks.corpus 生成指定规模的合成文档语料
+2. 每个转换器先预热一次，再测量多轮耗时（取最快一轮和中位数），最后单独跑一轮用 tracemalloc 统计峰值内存
+3. 与保存的基线对比，耗时或峰值内存超出阈值时列为性能回退，以退出码 1 结束
+
+基线与机器相关，请在固定的基准测试机器上用 --save-baseline 生成后提交，
+保存在 benchmarks/baselines/converters-<规模>.json。
+峰值内存为 Python 堆上分配的峰值（含 numpy），不包括 Pillow 等C扩展自行分配的内存。
+
+使用方法（在 backend 目录下执行）：
+    python -m benchmarks.bench_converters [--scale medium] [--rounds 3] [--only docx_to_md,md_to_html]
+    python -m benchmarks.bench_converters --save-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.corpus import SCALES, build_corpus
+from src.converters.docx2md import convert_docx_to_md
+from src.converters.markdown_to_docx import convert_markdown_to_docx
+from src.converters.markdown_to_html import convert_markdown_to_html
+from src.converters.pdf_to_word import convert_pdf_to_word
+from src.converters.web_to_docx import convert_web_to_docx
+from src.converters.word_to_pdf import convert_word_to_pdf
+from src.utils.log import configure_logging
+from src.utils.ocr_engine import check_environment
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# 默认允许的回退幅度：比基线慢或多占内存超过 25% 视为回退
+DEFAULT_THRESHOLD = 0.25
+
+
+def _tesseract_missing():
+    if not check_environment()["tesseract"]:
+        return "未安装 tesseract"
+    return None
+
+
+# 基准用例：(名称, 语料名, 转换函数, 跳过条件)，转换函数参数为 (输入文件, 输出目录)
+CASES = [
+    ("docx_to_md", "docx",
+     lambda path, out: convert_docx_to_md(path, os.path.join(out, "document.md")), None),
+    ("word_to_pdf", "docx",
+     lambda path, out: convert_word_to_pdf(path, os.path.join(out, "document.pdf")), None),
+    ("pdf_to_word", "text_pdf",
+     lambda path, out: convert_pdf_to_word(path, os.path.join(out, "text.docx"), {"use_ocr": False}), None),
+    ("pdf_to_word_ocr", "scanned_pdf",
+     lambda path, out: convert_pdf_to_word(path, os.path.join(out, "scanned.docx"), {"use_ocr": True}),
+     _tesseract_missing),
+    ("md_to_html", "markdown",
+     lambda path, out: convert_markdown_to_html(path, os.path.join(out, "document.html")), None),
+    ("md_to_docx", "markdown",
+     lambda path, out: convert_markdown_to_docx(path, {"output_dir": out}), None),
+    ("web_to_docx", "html",
+     lambda path, out: convert_web_to_docx(path, os.path.join(out, "page.docx")), None),
+]
+
+
+def run_once(convert, input_file, work_dir):
+    """在新的输出目录中执行一次转换，返回耗时（秒）"""
+    output_dir = tempfile.mkdtemp(dir=work_dir)
+    try:
+        start = time.perf_counter()
+        result = convert(input_file, output_dir)
+        elapsed = time.perf_counter() - start
+        # 部分转换器失败时返回 success=False 而不是抛出异常
+        if isinstance(result, dict) and result.get("success") is False:
+            raise RuntimeError(result.get("error") or "转换失败")
+        return elapsed
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def measure_peak_memory(convert, input_file, work_dir):
+    """单独执行一次转换，返回 Python 堆的峰值内存（MB）"""
+    tracemalloc.start()
+    try:
+        run_once(convert, input_file, work_dir)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def run_case(convert, input_file, work_dir, rounds):
+    # 预热：导入、字体注册等一次性开销不计入
+    run_once(convert, input_file, work_dir)
+    timings = [run_once(convert, input_file, work_dir) for _ in range(rounds)]
+    return {
+        "min_seconds": round(min(timings), 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "peak_mb": round(measure_peak_memory(convert, input_file, work_dir), 2),
+    }
+
+
+def compare(results, baseline, threshold):
+    """与基线对比，返回回退描述列表"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("cases", {}).get(name)
+        if not previous or "error" in current:
+            continue
+        for key, label in (("min_seconds", "耗时"), ("peak_mb", "峰值内存")):
+            if previous.get(key) and current[key] > previous[key] * (1 + threshold):
+                regressions.append(
+                    f"{name}: {label} {previous[key]:.4g} -> {current[key]:.4g}（+{current[key] / previous[key] - 1:.0%}）"
+                )
+    return regressions
+
+
+def print_table(results, baseline):
+    previous_cases = baseline.get("cases", {}) if baseline else {}
+    print(f"{'用例':<18}{'最快(秒)':>10}{'中位数(秒)':>12}{'峰值(MB)':>10}{'基线耗时':>10}{'基线内存':>10}")
+    for name, result in results.items():
+        if "error" in result or "skipped" in result:
+            status = "失败: " + result["error"] if "error" in result else "跳过: " + result["skipped"]
+            print(f"{name:<18}{status}")
+            continue
+        previous = previous_cases.get(name, {})
+        previous_seconds = f"{previous['min_seconds']:.3f}" if "min_seconds" in previous else "-"
+        previous_mb = f"{previous['peak_mb']:.1f}" if "peak_mb" in previous else "-"
+        print(f"{name:<18}{result['min_seconds']:>10.3f}{result['median_seconds']:>12.3f}{result['peak_mb']:>10.1f}"
+              f"{previous_seconds:>10}{previous_mb:>10}")
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, scale, rounds, results):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {
+        "scale": scale,
+        "rounds": rounds,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "cases": {name: result for name, result in results.items() if "error" not in result and "skipped" not in result},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="转换器基准测试")
+    parser.add_argument("--scale", choices=list(SCALES), default="medium", help="语料规模")
+    parser.add_argument("--rounds", type=int, default=3, help="每个用例测量的轮数")
+    parser.add_argument("--only", help="只运行指定的用例，逗号分隔")
+    parser.add_argument("--baseline", help="基线文件，默认 benchmarks/baselines/converters-<规模>.json")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="允许的回退幅度，默认0.25")
+    parser.add_argument("--corpus-dir", help="语料保存目录，默认使用临时目录并在结束后删除")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # 转换器的INFO日志会淹没结果表格
+    configure_logging(level="WARNING", fmt="text")
+
+    cases = CASES
+    if args.only:
+        selected = set(args.only.split(","))
+        unknown = selected - {case[0] for case in CASES}
+        if unknown:
+            print(f"未知的用例: {', '.join(sorted(unknown))}")
+            sys.exit(1)
+        cases = [case for case in CASES if case[0] in selected]
+
+    work_dir = tempfile.mkdtemp(prefix="smartdatapro_bench_")
+    corpus_dir = args.corpus_dir or os.path.join(work_dir, "corpus")
+    try:
+        start = time.perf_counter()
+        corpus = build_corpus(corpus_dir, args.scale)
+        print(f"语料规模: {args.scale}，生成耗时 {time.perf_counter() - start:.1f} 秒")
+
+        results = {}
+        for name, corpus_name, convert, skip in cases:
+            reason = skip() if skip else None
+            if reason:
+                results[name] = {"skipped": reason}
+                continue
+            try:
+                results[name] = run_case(convert, corpus[corpus_name], work_dir, args.rounds)
+            except Exception as e:
+                # 异常信息可能跨多行，合并为一行便于在表格中显示
+                results[name] = {"error": " ".join(str(e).split())}
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"converters-{args.scale}.json")
+    baseline = load_baseline(baseline_path)
+    print_table(results, baseline)
+
+    if args.save_baseline:
+        save_baseline(baseline_path, args.scale, args.rounds, results)
+        print(f"已保存基线: {baseline_path}")
+
+    failures = [name for name, result in results.items() if "error" in result]
+    regressions = compare(results, baseline, args.threshold) if baseline and not args.save_baseline else []
+    if baseline is None and not args.save_baseline:
+        print(f"没有基线文件 {baseline_path}，跳过回退检查")
+    for regression in regressions:
+        print(f"性能回退 {regression}")
+    if failures or regressions:
+        print(f"失败用例 {len(failures)} 个，性能回退 {len(regressions)} 处")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
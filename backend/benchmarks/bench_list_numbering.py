@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列表编号移除基准测试
+
+1. 使用黄金语料校验 remove_list_numbering 的输出
+2. 与旧实现（逐条 re.match + re.sub）逐条对比，确保语义一致
+3. 在模拟的长篇微信公众号文章上测量吞吐量
+
+使用方法（在 backend 目录下执行）：
+    python -m benchmarks.bench_list_numbering [段落数]
+"""
+
+import re
+import sys
+import time
+
+from src.utils.text_cleaner import remove_list_numbering
+
+# 黄金语料：(输入, 期望输出)，覆盖各类编号以及旧实现的边界行为
+GOLDEN_CORPUS = [
+    ("1. 第一项", "第一项"),
+    ("1) 第一项", "第一项"),
+    ("(1) 第一项", "第一项"),
+    ("(12) 括号数字", "括号数字"),
+    ("(a) 第一项", "第一项"),
+    ("a. 第一项", "第一项"),
+    ("a) 第一项", "第一项"),
+    ("iv) 罗马数字", "罗马数字"),
+    ("IV. 罗马数字", "罗马数字"),
+    ("6. 1. 嵌套编号", "嵌套编号"),
+    ("2. 3. 1. 多级编号", "多级编号"),
+    ("  3. 前导空格", "前导空格"),
+    ("A(1) 混合编号", "混合编号"),
+    ("1.2.3标题", "3标题"),
+    ("1.无空格", "无空格"),
+    ("10.5%的增长", "5%的增长"),
+    ("2026. 年份", "年份"),
+    ("Hello. World", "World"),
+    ("Mr. Smith", "Smith"),
+    ("e.g. example", "e.g. example"),
+    ("ii.iii. 连续", "ii.iii. 连续"),
+    ("(ab) 不是编号", "(ab) 不是编号"),
+    ("第1章 开始", "第1章 开始"),
+    ("普通段落文字", "普通段落文字"),
+    ("x)", "x)"),
+    ("   ", "   "),
+    ("", ""),
+]
+
+
+def legacy_remove_list_numbering(text):
+    """旧实现，仅用于对比语义和吞吐量"""
+    complex_pattern = r'^(\s*(?:\d+|[a-zA-Z]|[ivxlcdmIVXLCDM])+(?:\.|\)|\(\d+\)|\([a-zA-Z]\)|\([ivxlcdmIVXLCDM]+\))\s+)+'
+    if re.match(complex_pattern, text, re.IGNORECASE):
+        return re.sub(complex_pattern, '', text, count=1, flags=re.IGNORECASE)
+
+    patterns = [
+        r'^\s*\d+\.\s+',
+        r'^\s*\d+\)\s+',
+        r'^\s*\(\d+\)\s+',
+        r'^\s*[a-zA-Z]\.\s+',
+        r'^\s*[a-zA-Z]\)\s+',
+        r'^\s*\([a-zA-Z]\)\s+',
+        r'^\s*[ivxlcdm]+\.\s+',
+        r'^\s*[IVXLCDM]+\.\s+',
+        r'^\s*[ivxlcdm]+\)\s+',
+        r'^\s*[IVXLCDM]+\)\s+'
+    ]
+    for pattern in patterns:
+        if re.match(pattern, text, re.IGNORECASE):
+            return re.sub(pattern, '', text, count=1, flags=re.IGNORECASE)
+
+    simple_pattern = r'^\s*(\d+\.\s*)+'
+    if re.match(simple_pattern, text):
+        return re.sub(simple_pattern, '', text, count=1)
+
+    return text
+
+
+def build_wechat_article(paragraph_count):
+    """生成模拟的长篇微信公众号文章文本节点，编号段落和普通段落混排"""
+    templates = [
+        "{n}. 这是第{n}个要点，介绍了产品在实际场景中的表现和使用体验。",
+        "({n}) 补充说明：相关数据来源于公开报告，仅供参考。",
+        "在过去的一年里，我们观察到行业出现了明显的变化，用户需求也在不断升级。",
+        "{n}.{m}. 细分条目，描述具体的操作步骤和注意事项。",
+        "  ",
+        "iv) 罗马数字编号的条目同样需要被清理。",
+        "Tips: 文章末尾附有原文链接，欢迎转发分享。",
+        "“引号开头的段落”并不包含任何编号，应保持原样。",
+    ]
+    texts = []
+    for i in range(paragraph_count):
+        template = templates[i % len(templates)]
+        texts.append(template.format(n=i % 30 + 1, m=i % 7 + 1))
+    return texts
+
+
+def verify():
+    """校验黄金语料以及与旧实现的一致性"""
+    failures = []
+    for text, expected in GOLDEN_CORPUS:
+        actual = remove_list_numbering(text)
+        if actual != expected:
+            failures.append(f"黄金语料不一致: {text!r} -> {actual!r}，期望 {expected!r}")
+        legacy = legacy_remove_list_numbering(text)
+        if actual != legacy:
+            failures.append(f"与旧实现不一致: {text!r} -> {actual!r}，旧实现 {legacy!r}")
+
+    for text in build_wechat_article(500):
+        actual = remove_list_numbering(text)
+        legacy = legacy_remove_list_numbering(text)
+        if actual != legacy:
+            failures.append(f"与旧实现不一致: {text!r} -> {actual!r}，旧实现 {legacy!r}")
+    return failures
+
+
+def measure(func, texts, rounds=5):
+    """返回多轮测量中最快一轮的每秒处理文本数"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(texts) / best if best else float("inf")
+
+
+def main():
+    paragraph_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    failures = verify()
+    if failures:
+        for failure in failures:
+            print(failure)
+        print(f"校验失败，共 {len(failures)} 处不一致")
+        sys.exit(1)
+    print(f"黄金语料校验通过，共 {len(GOLDEN_CORPUS)} 条")
+
+    texts = build_wechat_article(paragraph_count)
+    legacy_rate = measure(legacy_remove_list_numbering, texts)
+    current_rate = measure(remove_list_numbering, texts)
+    print(f"文本节点数: {paragraph_count}")
+    print(f"旧实现: {legacy_rate:,.0f} 条/秒")
+    print(f"新实现: {current_rate:,.0f} 条/秒")
+    print(f"提升: {current_rate / legacy_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+worker 启动耗时和内存基准测试
+
+每轮在新的 Python 进程中导入 app（与 uvicorn worker 启动时相同），比较两种方式：
+1. lazy：默认方式，转换器在首次使用时加载；另外测量之后加载全部转换器的耗时和内存，
+   即首批请求分摊的开销
+2. eager：PRELOAD_CONVERTERS=eager，导入应用时加载全部转换器（改为懒加载之前的行为）
+
+常驻内存（RSS）读取自 /proc/self/status，非 Linux 系统使用 ru_maxrss（进程的峰值RSS）。
+
+使用方法（在 backend 目录下执行）：
+    python -m benchmarks.bench_startup [轮数]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# 子进程中执行的测量代码，结果以一行JSON输出到最后一行
+CHILD_CODE = r"""
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter() - start
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+result = {"import_seconds": imported, "rss_mb": rss_mb()}
+from src import converters
+result["preload_seconds"] = converters.preload()
+result["loaded_rss_mb"] = rss_mb()
+print(json.dumps(result))
+"""
+
+MODES = {
+    "lazy": "",
+    "eager": "eager",
+}
+
+
+def measure(mode, rounds):
+    env = dict(os.environ, PRELOAD_CONVERTERS=MODES[mode], LOG_LEVEL="WARNING")
+    samples = []
+    for _ in range(rounds):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD_CODE], env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    results = {mode: measure(mode, rounds) for mode in MODES}
+    print(f"每种方式 {rounds} 轮，取中位数")
+    print(f"{'方式':<8}{'导入应用(ms)':>14}{'启动后RSS(MB)':>16}{'加载转换器(ms)':>16}{'全部加载后RSS(MB)':>20}")
+    for mode, result in results.items():
+        print(f"{mode:<8}{result['import_seconds'] * 1000:>14.0f}{result['rss_mb']:>16.1f}"
+              f"{result['preload_seconds'] * 1000:>16.0f}{result['loaded_rss_mb']:>20.1f}")
+
+    lazy, eager = results["lazy"], results["eager"]
+    print(f"懒加载使每个worker启动快 {(eager['import_seconds'] - lazy['import_seconds']) * 1000:.0f} ms，"
+          f"空闲时少占 {eager['rss_mb'] - lazy['rss_mb']:.1f} MB 内存")
+
+
+if __name__ == "__main__":
+    main()
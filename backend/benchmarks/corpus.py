@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+转换器基准测试的合成文档语料
+
+按规模生成各转换器的输入文件，内容确定（固定随机种子），不同机器、多次生成的结果一致：
+- DOCX：标题、中英文混排段落、编号列表、表格和图片
+- PDF：带文字层的PDF，以及只有页面图像、没有文字层的扫描版PDF
+- Markdown：标题、列表、代码块、数学公式和表格
+- HTML：保存到本地的网页，图片为相对路径的本地文件
+
+使用方法（在 backend 目录下执行）：
+    python -m benchmarks.corpus <输出目录> [small|medium|large]
+"""
+
+import os
+import random
+import sys
+
+from docx import Document
+from docx.shared import Inches
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfgen import canvas
+
+# 各规模的语料大小：段落数、PDF页数
+SCALES = {
+    "small": {"paragraphs": 40, "pages": 2},
+    "medium": {"paragraphs": 300, "pages": 5},
+    "large": {"paragraphs": 2000, "pages": 20},
+}
+
+# 每隔多少段插入一个表格、一张图片
+TABLE_EVERY = 25
+IMAGE_EVERY = 40
+
+# reportlab 内置的中文字体，不依赖系统字体文件
+PDF_FONT = "STSong-Light"
+
+SENTENCES = [
+    "数据转换平台需要在保证版式的前提下尽可能快地处理用户上传的文档。",
+    "The converter keeps headings, lists and tables while normalizing inline styles.",
+    "在过去的一年里，我们观察到行业出现了明显的变化，用户需求也在不断升级。",
+    "表格、图片和代码块是文档中最容易出现格式问题的元素。",
+    "Mixed content such as 中文 and English in one paragraph must be preserved.",
+    "补充说明：相关数据来源于公开报告，仅供参考。",
+    "Performance regressions usually show up first on long documents with many images.",
+    "每个段落都包含若干句子，用于模拟真实文章的长度分布。",
+]
+
+CODE_SNIPPET = '''def fibonacci(n):
+    """返回第 n 个斐波那契数"""
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a'''
+
+
+def paragraph_text(rng):
+    return "".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 5)))
+
+
+def table_rows(rng, rows=5, cols=4):
+    header = [f"列{c + 1}" for c in range(cols)]
+    body = [[f"{rng.randint(0, 9999)}" for _ in range(cols)] for _ in range(rows)]
+    return header, body
+
+
+def make_image(path, index, size=(480, 320)):
+    """生成一张渐变色块图片"""
+    width, height = size
+    image = Image.new("RGB", size)
+    draw = ImageDraw.Draw(image)
+    for x in range(0, width, 8):
+        color = ((x * 255 // width + index * 40) % 256, (index * 70) % 256, 255 - x * 255 // width)
+        draw.rectangle([x, 0, x + 8, height], fill=color)
+    draw.ellipse([width // 4, height // 4, width * 3 // 4, height * 3 // 4], outline="white", width=6)
+    image.save(path)
+    return path
+
+
+def build_docx(path, paragraphs, image_dir, seed=1):
+    rng = random.Random(seed)
+    doc = Document()
+    doc.add_heading("合成基准文档", 0)
+    image_index = 0
+    for i in range(paragraphs):
+        if i % 20 == 0:
+            doc.add_heading(f"第{i // 20 + 1}节 章节标题", 1)
+        if i % 7 == 3:
+            doc.add_paragraph(paragraph_text(rng)[:60], style="List Number")
+        elif i % 7 == 5:
+            doc.add_paragraph(paragraph_text(rng)[:60], style="List Bullet")
+        else:
+            paragraph = doc.add_paragraph(paragraph_text(rng))
+            run = paragraph.add_run(" 加粗的结尾。")
+            run.bold = True
+        if i % TABLE_EVERY == TABLE_EVERY - 1:
+            header, body = table_rows(rng)
+            table = doc.add_table(rows=len(body) + 1, cols=len(header))
+            table.style = "Table Grid"
+            for c, text in enumerate(header):
+                table.cell(0, c).text = text
+            for r, row in enumerate(body, start=1):
+                for c, text in enumerate(row):
+                    table.cell(r, c).text = text
+        if i % IMAGE_EVERY == IMAGE_EVERY - 1:
+            image_path = make_image(os.path.join(image_dir, f"docx_{image_index}.png"), image_index)
+            doc.add_picture(image_path, width=Inches(4))
+            image_index += 1
+    doc.save(path)
+    return path
+
+
+def build_text_pdf(path, pages, seed=2):
+    """带文字层的PDF，每页若干段中文正文"""
+    rng = random.Random(seed)
+    if PDF_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(PDF_FONT))
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for page in range(pages):
+        pdf.setFont(PDF_FONT, 16)
+        pdf.drawString(60, height - 60, f"基准测试文档 第{page + 1}部分")
+        pdf.setFont(PDF_FONT, 10)
+        y = height - 90
+        while y > 60:
+            text = paragraph_text(rng)
+            # 按固定字数折行，近似版面宽度
+            for start in range(0, len(text), 42):
+                pdf.drawString(60, y, text[start:start + 42])
+                y -= 14
+            y -= 8
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def render_scan_page(rng, size=(1240, 1754)):
+    """模拟扫描的页面图像（150dpi的A4），只使用英文以免依赖中文字体"""
+    image = Image.new("L", size, color=250)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=22)
+    y = 100
+    english = [s for s in SENTENCES if s.isascii()]
+    while y < size[1] - 120:
+        draw.text((100, y), rng.choice(english), fill=20, font=font)
+        y += 36
+    # 轻微噪点，接近真实扫描件
+    for _ in range(2000):
+        draw.point((rng.randrange(size[0]), rng.randrange(size[1])), fill=rng.randint(120, 200))
+    return image
+
+
+def build_scanned_pdf(path, pages, seed=3):
+    """没有文字层的扫描版PDF，每页是一张图像"""
+    rng = random.Random(seed)
+    pdf = canvas.Canvas(path, pagesize=A4)
+    width, height = A4
+    for _ in range(pages):
+        pdf.drawImage(ImageReader(render_scan_page(rng)), 0, 0, width=width, height=height)
+        pdf.showPage()
+    pdf.save()
+    return path
+
+
+def build_markdown(path, paragraphs, seed=4):
+    rng = random.Random(seed)
+    lines = ["# 合成基准文档", ""]
+    for i in range(paragraphs):
+        if i % 20 == 0:
+            lines += [f"## 第{i // 20 + 1}节 章节标题", ""]
+        if i % 7 == 3:
+            lines += [f"{n}. {paragraph_text(rng)[:40]}" for n in range(1, 4)] + [""]
+        elif i % 7 == 5:
+            lines += [f"- **要点** {paragraph_text(rng)[:40]}" for _ in range(3)] + [""]
+        else:
+            lines += [paragraph_text(rng) + " 行内代码 `x = 1`，行内公式 $E = mc^2$。", ""]
+        if i % 15 == 14:
+            lines += ["```python", CODE_SNIPPET, "```", ""]
+        if i % 30 == 29:
+            lines += ["$$", r"\int_0^1 x^2 \, dx = \frac{1}{3}", "$$", ""]
+        if i % TABLE_EVERY == TABLE_EVERY - 1:
+            header, body = table_rows(rng)
+            lines.append("| " + " | ".join(header) + " |")
+            lines.append("|" + "---|" * len(header))
+            lines += ["| " + " | ".join(row) + " |" for row in body]
+            lines.append("")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return path
+
+
+def build_html(path, paragraphs, seed=5):
+    """保存到本地的网页：导航、正文、页脚，图片为相对路径"""
+    rng = random.Random(seed)
+    page_dir = os.path.dirname(path)
+    os.makedirs(os.path.join(page_dir, "images"), exist_ok=True)
+    body = []
+    image_index = 0
+    for i in range(paragraphs):
+        if i % 20 == 0:
+            body.append(f"<h2>第{i // 20 + 1}节 章节标题</h2>")
+        if i % 7 == 3:
+            items = "".join(f"<li>{paragraph_text(rng)[:40]}</li>" for _ in range(3))
+            body.append(f"<ol>{items}</ol>")
+        else:
+            body.append(f'<p style="line-height:1.6">{paragraph_text(rng)}<strong>加粗</strong>'
+                        f'<a href="https://example.com/{i}">链接</a></p>')
+        if i % 15 == 14:
+            body.append(f"<pre><code class=\"language-python\">{CODE_SNIPPET}</code></pre>")
+        if i % TABLE_EVERY == TABLE_EVERY - 1:
+            header, rows = table_rows(rng)
+            head = "".join(f"<th>{text}</th>" for text in header)
+            cells = "".join("<tr>" + "".join(f"<td>{text}</td>" for text in row) + "</tr>" for row in rows)
+            body.append(f"<table><thead><tr>{head}</tr></thead><tbody>{cells}</tbody></table>")
+        if i % IMAGE_EVERY == IMAGE_EVERY - 1:
+            make_image(os.path.join(page_dir, "images", f"html_{image_index}.png"), image_index)
+            body.append(f'<p><img src="images/html_{image_index}.png" alt="图片{image_index}"></p>')
+            image_index += 1
+    html = (
+        '<!DOCTYPE html><html lang="zh-CN"><head><meta charset="utf-8"><title>合成基准网页</title>'
+        "<style>body{font-family:sans-serif} .nav a{margin-right:8px}</style></head><body>"
+        '<div class="nav"><a href="/">首页</a><a href="/about">关于</a></div>'
+        '<article><h1>合成基准网页</h1>' + "".join(body) + "</article>"
+        "<footer>版权所有</footer></body></html>"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return path
+
+
+def build_corpus(output_dir, scale="medium"):
+    """生成全部语料，返回 {语料名: 文件路径}"""
+    sizes = SCALES[scale]
+    os.makedirs(output_dir, exist_ok=True)
+    image_dir = os.path.join(output_dir, "images")
+    os.makedirs(image_dir, exist_ok=True)
+    html_dir = os.path.join(output_dir, "web")
+    os.makedirs(html_dir, exist_ok=True)
+    return {
+        "docx": build_docx(os.path.join(output_dir, "document.docx"), sizes["paragraphs"], image_dir),
+        "text_pdf": build_text_pdf(os.path.join(output_dir, "text.pdf"), sizes["pages"]),
+        "scanned_pdf": build_scanned_pdf(os.path.join(output_dir, "scanned.pdf"), sizes["pages"]),
+        "markdown": build_markdown(os.path.join(output_dir, "document.md"), sizes["paragraphs"]),
+        "html": build_html(os.path.join(html_dir, "page.html"), sizes["paragraphs"]),
+    }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    scale = sys.argv[2] if len(sys.argv) > 2 else "medium"
+    if scale not in SCALES:
+        print(f"未知的规模: {scale}，可选 {', '.join(SCALES)}")
+        sys.exit(1)
+    for name, path in build_corpus(sys.argv[1], scale).items():
+        print(f"{name}: {path} ({os.path.getsize(path):,} 字节)")
+
+
+if __name__ == "__main__":
+    main()
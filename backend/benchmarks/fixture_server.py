@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地网页夹具服务器 - 为网页转Word的基准和压力测试提供HTML页面和图片，测试不依赖外网
+
+页面由 benchmarks.corpus 生成，查询参数会被忽略（可用于绕过按URL的缓存）；
+latency 参数为每个请求的额外延迟，用于模拟较慢的外部网站。
+
+使用方法（在 backend 目录下执行）：
+    python -m benchmarks.fixture_server [端口] [small|medium|large]
+"""
+
+import functools
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.corpus import SCALES, build_html
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        # 压测时每个请求一行访问日志没有意义
+        pass
+
+
+class FixtureServer:
+    """在后台线程中运行的夹具服务器，可用作上下文管理器"""
+
+    def __init__(self, scale="small", host="127.0.0.1", port=0, latency=0.0):
+        self.scale = scale
+        self.root = tempfile.mkdtemp(prefix="smartdatapro_fixtures_")
+        build_html(os.path.join(self.root, "page.html"), SCALES[scale]["paragraphs"])
+        handler = type("Handler", (_FixtureHandler,), {"latency": latency})
+        self.httpd = ThreadingHTTPServer((host, port), functools.partial(handler, directory=self.root))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def page_url(self):
+        return f"{self.base_url}/page.html"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    scale = sys.argv[2] if len(sys.argv) > 2 else "small"
+    if scale not in SCALES:
+        print(f"未知的规模: {scale}，可选 {', '.join(SCALES)}")
+        sys.exit(1)
+    server = FixtureServer(scale, port=port)
+    print(f"夹具页面: {server.page_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        shutil.rmtree(server.root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
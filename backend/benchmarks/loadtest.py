@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务压力测试 - 按场景向转换接口并发发送请求，逐级提高并发，统计延迟分位数、吞吐量和错误率
+
+- 默认在进程内通过 ASGI 直接调用 app:app（包括应用生命周期），不需要启动服务；
+  进程内测试时客户端和服务共用一个进程和GIL，结果相当于单个worker的上限
+- --url 指定已启动的 uvicorn 服务（例如 python main.py），测试真实的多worker部署
+- 网页转Word使用本地夹具服务器提供的页面和图片，不依赖外网；服务不在本机时用 --page-url 指定可访问的页面
+- 默认每个请求的内容都不同（文档附加随机标记、URL附加查询参数），测的是真实转换而不是缓存命中；
+  --repeat 时发送相同内容，测试缓存命中和请求合并的路径
+- 依赖 httpx（FastAPI 的 TestClient 同样依赖它）
+
+使用方法（在 backend 目录下执行）：
+    python -m benchmarks.loadtest [--scenario mixed] [--concurrency 1,4,16] [--duration 20]
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --scenario md_to_html --json result.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+import zipfile
+from contextlib import AsyncExitStack
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from benchmarks.corpus import SCALES, build_docx, build_markdown, build_text_pdf
+from benchmarks.fixture_server import FixtureServer
+from src.utils.log import configure_logging
+
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# 场景：各接口的请求权重；每个接口单独也是一个场景
+MIXES = {
+    # 接近线上流量的比例：编辑器实时预览最多，其次是上传文档转换
+    "mixed": {"md_to_html": 40, "docx_to_md": 20, "md_to_docx": 15, "web_to_docx": 15, "pdf_to_word": 10},
+    # 只包含不依赖外部网页的文档转换
+    "documents": {"docx_to_md": 35, "md_to_docx": 25, "pdf_to_word": 25, "word_to_pdf": 15},
+}
+
+
+def _unique_markdown(data, nonce):
+    return data + f"\n<!-- {nonce} -->\n".encode()
+
+
+def _unique_docx(data, nonce):
+    """设置 zip 注释，文档内容不变但文件哈希不同"""
+    buffer = io.BytesIO(data)
+    with zipfile.ZipFile(buffer, "a") as archive:
+        archive.comment = nonce.encode()
+    return buffer.getvalue()
+
+
+def _unique_pdf(data, nonce):
+    """在文件末尾追加PDF注释行，解析器会忽略"""
+    return data + f"%{nonce}\n".encode()
+
+
+class Payloads:
+    """各接口的请求内容，unique 时每个请求附加不同的随机标记"""
+
+    def __init__(self, corpus_dir, scale, page_url, unique):
+        paragraphs = SCALES[scale]["paragraphs"]
+        image_dir = os.path.join(corpus_dir, "images")
+        os.makedirs(image_dir, exist_ok=True)
+        self.page_url = page_url
+        self.unique = unique
+        with open(build_docx(os.path.join(corpus_dir, "document.docx"), paragraphs, image_dir), "rb") as f:
+            self.docx = f.read()
+        with open(build_text_pdf(os.path.join(corpus_dir, "text.pdf"), SCALES[scale]["pages"]), "rb") as f:
+            self.pdf = f.read()
+        with open(build_markdown(os.path.join(corpus_dir, "document.md"), paragraphs), "rb") as f:
+            self.markdown = f.read()
+
+    def _vary(self, func, data):
+        return func(data, uuid.uuid4().hex) if self.unique else data
+
+    def docx_file(self):
+        return self._vary(_unique_docx, self.docx)
+
+    def pdf_file(self):
+        return self._vary(_unique_pdf, self.pdf)
+
+    def markdown_file(self):
+        return self._vary(_unique_markdown, self.markdown)
+
+    def web_url(self):
+        return f"{self.page_url}?n={uuid.uuid4().hex}" if self.unique else self.page_url
+
+
+# 各接口的请求：(client, payloads) -> 响应
+ENDPOINTS = {
+    "docx_to_md": lambda client, p: client.post(
+        "/api/convert/docx-to-md", files={"file": ("document.docx", p.docx_file(), DOCX_TYPE)}),
+    "md_to_html": lambda client, p: client.post(
+        "/api/convert/markdown-to-html", files={"file": ("document.md", p.markdown_file(), "text/markdown")},
+        data={"style": "default"}),
+    "md_to_docx": lambda client, p: client.post(
+        "/api/convert/markdown-to-docx", files={"file": ("document.md", p.markdown_file(), "text/markdown")},
+        data={"style": "default"}),
+    "pdf_to_word": lambda client, p: client.post(
+        "/api/convert/pdf-to-word", files={"file": ("text.pdf", p.pdf_file(), "application/pdf")},
+        data={"use_ocr": "false"}),
+    "word_to_pdf": lambda client, p: client.post(
+        "/api/convert/word-to-pdf", files={"file": ("document.docx", p.docx_file(), DOCX_TYPE)}),
+    "web_to_docx": lambda client, p: client.post(
+        "/api/convert/web-to-docx", data={"url": p.web_url(), "render_mode": "static"}),
+}
+
+
+def percentile(sorted_values, q):
+    """最近秩法的分位数，sorted_values 需已排序"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """samples 为 (耗时秒数, 是否成功) 列表"""
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+    }
+
+
+async def send(client, endpoint, payloads):
+    """发送一个请求，返回 (耗时秒数, 是否成功, 错误描述)"""
+    start = time.perf_counter()
+    try:
+        response = await ENDPOINTS[endpoint](client, payloads)
+        ok = response.status_code < 400
+        error = None if ok else f"HTTP {response.status_code}"
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    return time.perf_counter() - start, ok, error
+
+
+async def run_step(client, payloads, mix, concurrency, duration, seed):
+    """以固定并发持续发送请求 duration 秒，每个并发连接收到响应后立即发送下一个请求"""
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}
+    errors = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(names, weights)[0]
+            latency, ok, error = await send(client, endpoint, payloads)
+            samples[endpoint].append((latency, ok))
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = summarize([sample for values in samples.values() for sample in values], elapsed)
+    result["concurrency"] = concurrency
+    result["endpoints"] = {name: summarize(values, elapsed) for name, values in samples.items() if values}
+    result["errors"] = errors
+    return result
+
+
+def print_step(result, show_endpoints):
+    row = "{:<14}{:>6}{:>9}{:>10}{:>10}{:>10}{:>10}"
+    print(row.format(f"并发 {result['concurrency']}", result["requests"], result["throughput_rps"],
+                     result["p50_ms"], result["p95_ms"], result["p99_ms"], f"{result['error_rate']:.1%}"))
+    if show_endpoints:
+        for name, stats in result["endpoints"].items():
+            print(row.format(f"  {name}", stats["requests"], stats["throughput_rps"], stats["p50_ms"],
+                             stats["p95_ms"], stats["p99_ms"], f"{stats['error_rate']:.1%}"))
+    for error, count in sorted(result["errors"].items(), key=lambda item: -item[1])[:5]:
+        print(f"  错误 {count} 次: {error}")
+
+
+async def open_client(stack, args):
+    """创建HTTP客户端；未指定 --url 时在进程内运行应用，并执行其生命周期"""
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    if args.url:
+        return await stack.enter_async_context(httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits))
+
+    from app import app
+    # 应用导入时按环境变量配置了日志，压测时只保留警告
+    configure_logging(level="WARNING", fmt="text")
+    await stack.enter_async_context(app.router.lifespan_context(app))
+    transport = httpx.ASGITransport(app=app)
+    return await stack.enter_async_context(
+        httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout)
+    )
+
+
+async def run(args, mix):
+    work_dir = tempfile.mkdtemp(prefix="smartdatapro_loadtest_")
+    async with AsyncExitStack() as stack:
+        stack.callback(shutil.rmtree, work_dir, True)
+        page_url = args.page_url
+        if page_url is None and "web_to_docx" in mix:
+            server = stack.enter_context(FixtureServer(args.scale, latency=args.fixture_latency / 1000))
+            page_url = server.page_url
+            print(f"夹具页面: {page_url}")
+        payloads = Payloads(work_dir, args.scale, page_url, unique=not args.repeat)
+        client = await open_client(stack, args)
+
+        # 预热：每个接口先请求一次，字体注册、模块加载等一次性开销不计入
+        for endpoint in mix:
+            latency, ok, error = await send(client, endpoint, payloads)
+            print(f"预热 {endpoint}: {latency * 1000:.0f} ms" + ("" if ok else f"，失败: {error}"))
+
+        print("{:<14}{:>6}{:>9}{:>10}{:>10}{:>10}{:>10}".format(
+            "", "请求数", "吞吐/秒", "p50(ms)", "p95(ms)", "p99(ms)", "错误率"))
+        results = []
+        for step, concurrency in enumerate(args.concurrency):
+            result = await run_step(client, payloads, mix, concurrency, args.duration, step)
+            print_step(result, len(mix) > 1)
+            results.append(result)
+        return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="服务压力测试")
+    parser.add_argument("--scenario", choices=list(MIXES) + list(ENDPOINTS), default="mixed",
+                        help="请求场景：接口组合或单个接口")
+    parser.add_argument("--concurrency", default="1,4,16",
+                        type=lambda value: [int(level) for level in value.split(",")], help="逐级测试的并发数，逗号分隔")
+    parser.add_argument("--duration", type=float, default=20, help="每级并发持续的秒数")
+    parser.add_argument("--url", help="已启动服务的地址，不指定时在进程内测试 app:app")
+    parser.add_argument("--scale", choices=list(SCALES), default="small", help="请求文档的规模")
+    parser.add_argument("--repeat", action="store_true", help="发送相同内容，测试缓存命中")
+    parser.add_argument("--page-url", help="网页转Word使用的页面，不指定时启动本地夹具服务器")
+    parser.add_argument("--fixture-latency", type=float, default=0, help="夹具服务器每个请求的额外延迟（毫秒）")
+    parser.add_argument("--timeout", type=float, default=120, help="单个请求的超时秒数")
+    parser.add_argument("--json", help="把结果写入JSON文件")
+    return parser.parse_args()
+
+
+def main():
+    if httpx is None:
+        print("压力测试需要 httpx，请先安装：pip install httpx")
+        sys.exit(1)
+    args = parse_args()
+    configure_logging(level="WARNING", fmt="text")
+    mix = MIXES.get(args.scenario) or {args.scenario: 1}
+
+    print(f"场景: {args.scenario}，目标: {args.url or '进程内 app:app'}，"
+          f"{'相同内容' if args.repeat else '每个请求内容不同'}，每级 {args.duration:g} 秒")
+    results = asyncio.run(run(args, mix))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scenario": args.scenario, "target": args.url or "in-process", "scale": args.scale,
+                       "repeat": args.repeat, "duration": args.duration, "steps": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
+import os
+import shutil
+import tempfile
 import uvicorn
 import logging
 
-# 设置日志级别，生产环境使用INFO级别以提高性能
+# 设置日志级别，生产环境使用INFO级别以提高性能；业务日志由 app 中的 configure_logging 配置
 logging.basicConfig(level=logging.INFO)
 
 if __name__ == "__main__":
+    # 多个worker进程把Prometheus指标写入同一目录，由 /metrics 汇总；
+    # 必须在worker进程导入 prometheus_client 之前设置，启动时清空上次运行遗留的数据
+    metrics_dir = os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "smartdatapro_metrics")
+    )
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
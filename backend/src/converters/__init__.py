@@ -1,15 +1,58 @@
-from .docx2md import convert_docx_to_md
-from .markdown_to_html import convert_markdown_to_html
-from .web_to_docx import convert_web_to_docx
-from .pdf_to_word import convert_pdf_to_word
-from .word_to_pdf import convert_word_to_pdf
-from .markdown_to_docx import convert_markdown_to_docx
-
-__all__ = [
-    "convert_docx_to_md",
-    "convert_markdown_to_html",
-    "convert_web_to_docx",
-    "convert_pdf_to_word",
-    "convert_word_to_pdf",
-    "convert_markdown_to_docx"
-]
\ No newline at end of file
+"""
+文档转换器
+
+转换器依赖 reportlab、pdfplumber、pytesseract、NumPy、mammoth、BeautifulSoup 等较重的库，
+导入本包时不加载任何转换器，首次访问 convert_xxx 时才导入对应模块，
+worker 进程启动更快，不使用的转换器不占内存。需要提前加载时调用 preload()。
+"""
+import importlib
+import time
+
+from ..utils.log import get_logger
+
+logger = get_logger("converters")
+
+# 转换函数名 -> 所在的子模块
+_CONVERTERS = {
+    "convert_docx_to_md": ".docx2md",
+    "convert_markdown_to_html": ".markdown_to_html",
+    "convert_web_to_docx": ".web_to_docx",
+    "convert_pdf_to_word": ".pdf_to_word",
+    "convert_word_to_pdf": ".word_to_pdf",
+    "convert_markdown_to_docx": ".markdown_to_docx",
+}
+
+__all__ = list(_CONVERTERS) + ["preload"]
+
+
+def _load(name):
+    start = time.perf_counter()
+    module = importlib.import_module(_CONVERTERS[name], __name__)
+    func = getattr(module, name)
+    # 缓存到包的命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = func
+    logger.info("已加载转换器 %s，耗时 %.0f ms", name, (time.perf_counter() - start) * 1000)
+    return func
+
+
+def __getattr__(name):
+    if name in _CONVERTERS:
+        return _load(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def preload(names=None):
+    """提前加载转换器，names 为空时加载全部
+
+    Returns:
+        float: 加载耗时（秒）
+    """
+    start = time.perf_counter()
+    for name in names or _CONVERTERS:
+        if name not in globals():
+            _load(name)
+    return time.perf_counter() - start
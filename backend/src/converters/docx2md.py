@@ -13,6 +13,11 @@ from docx.oxml.ns import qn
 from datetime import datetime
 import mammoth
 
+from ..utils.metrics import StageTimer
+from ..utils.log import get_logger
+
+logger = get_logger("converters.docx2md")
+
 SUPPORTED_IMAGE_FORMATS = {
     "image/png": ".png",
     "image/jpeg": ".jpg",
@@ -59,6 +64,9 @@ class Docx2MdConverter:
         self.images = {}
         self.image_paragraphs = []
 
+        # 按阶段统计耗时：解析、提取图片、生成Markdown、保存
+        self.timer = StageTimer("docx_to_md")
+        self.timer.switch("parse")
         self.doc = Document(docx_file)
         self._prepare_output_dir()
 
@@ -107,7 +115,7 @@ class Docx2MdConverter:
                         "size": len(image_data),
                     }
                 except Exception as e:
-                    print(f"图片提取错误: {e}")
+                    logger.warning("图片提取错误: %s", e)
 
     def _collect_image_paragraphs(self):
         """收集包含图片的段落"""
@@ -225,10 +233,18 @@ class Docx2MdConverter:
 
     def convert(self):
         """执行转换"""
+        try:
+            return self._convert()
+        finally:
+            self.timer.finish()
+
+    def _convert(self):
         # 提取图片
+        self.timer.switch("image")
         self._extract_images()
 
         # 收集包含图片的段落
+        self.timer.switch("build")
         self._collect_image_paragraphs()
 
         # 开始转换内容
@@ -275,6 +291,7 @@ class Docx2MdConverter:
                 md_content.append("")
 
         # 保存Markdown文件，使用self.output_file作为输出路径
+        self.timer.switch("save")
         with open(self.output_file, "w", encoding="utf-8") as f:
             f.write("\n".join(md_content))
 
@@ -317,19 +334,22 @@ def convert_docx_to_md(input_file, output_file=None, options=None):
     
     if file_extension == '.doc':
         # 使用mammoth库处理.doc格式文件
+        timer = StageTimer("docx_to_md")
         try:
-            print(f"开始转换.doc文件: {input_file}")
+            logger.info("开始转换.doc文件: %s", input_file)
+            timer.switch("parse")
             with open(input_file, "rb") as doc_file:
-                print(f"正在读取.doc文件: {input_file}")
+                logger.debug("正在读取.doc文件: %s", input_file)
                 result = mammoth.convert_to_markdown(doc_file)
                 markdown_content = result.value
-                print(f".doc文件转换成功，内容长度: {len(markdown_content)}字符")
+                logger.info(".doc文件转换成功，内容长度: %s字符", len(markdown_content))
                 
             # 保存Markdown内容
-            print(f"正在保存转换结果到: {output_file}")
+            timer.switch("save")
+            logger.debug("正在保存转换结果到: %s", output_file)
             with open(output_file, "w", encoding="utf-8") as f:
                 f.write(markdown_content)
-            print(f"转换结果保存成功: {output_file}")
+            logger.debug("转换结果保存成功: %s", output_file)
             
             return {
                 "output_file": output_file,
@@ -338,14 +358,14 @@ def convert_docx_to_md(input_file, output_file=None, options=None):
                 "success": True
             }
         except Exception as e:
-            print(f".doc文件转换失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error(".doc文件转换失败: %s", e, exc_info=True)
             raise Exception(f"转换.doc文件失败: {str(e)}")
+        finally:
+            timer.finish()
     elif file_extension == '.docx':
         # 使用Docx2MdConverter处理.docx格式文件
         try:
-            print(f"开始转换.docx文件: {input_file}")
+            logger.info("开始转换.docx文件: %s", input_file)
             # 创建转换器实例
             converter = Docx2MdConverter(
                 docx_file=input_file,
@@ -361,12 +381,10 @@ def convert_docx_to_md(input_file, output_file=None, options=None):
             result = converter.convert()
             result["output_file"] = output_file  # 确保返回指定的输出文件路径
             result["success"] = True
-            print(f".docx文件转换成功: {output_file}")
+            logger.info(".docx文件转换成功: %s", output_file)
             return result
         except Exception as e:
-            print(f".docx文件转换失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error(".docx文件转换失败: %s", e, exc_info=True)
             # 转换失败，直接抛出异常
             raise Exception(f"转换.docx文件失败: {str(e)}")
     else:
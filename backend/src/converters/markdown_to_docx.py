@@ -3,6 +3,7 @@ import os
 import tempfile
 from .markdown_to_html import convert_markdown_to_html
 from .web_to_docx import WebToDocxConverter
+from ..utils.metrics import StageTimer
 
 def convert_markdown_to_docx(input_file, options=None):
     """
@@ -20,13 +21,24 @@ def convert_markdown_to_docx(input_file, options=None):
         
     output_dir = options.get("output_dir", os.path.dirname(input_file))
     
+    # 两个步骤的各阶段耗时合并统计为一次 markdown_to_docx 转换
+    timer = StageTimer("markdown_to_docx")
+    try:
+        return _convert(input_file, options, output_dir, timer)
+    finally:
+        timer.finish()
+
+
+def _convert(input_file, options, output_dir, timer):
     # 1. 先将Markdown转换为HTML
     # 创建临时HTML文件，指定 use_inline_styles=True 以便将样式内联到 HTML 中
     html_result = convert_markdown_to_html(
         input_file, 
         options={
             "style": options.get("style", "default"),
-            "use_inline_styles": True  # 新增选项：内联样式
+            "use_inline_styles": True,  # 新增选项：内联样式
+            "output_dir": output_dir,  # 临时HTML文件与输出文件放在同一目录
+            "timer": timer
         }
     )
     if not html_result["success"]:
@@ -45,7 +57,8 @@ def convert_markdown_to_docx(input_file, options=None):
         converter = WebToDocxConverter(
             url=html_file,
             output_dir=output_dir,
-            timeout=options.get("timeout", 10)
+            timeout=options.get("timeout", 10),
+            timer=timer
         )
         
         # 执行转换
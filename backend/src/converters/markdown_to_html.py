@@ -8,9 +8,27 @@ Markdown转HTML工具 - Python版本
 import os
 import sys
 import argparse
+import logging
 import markdown
 from datetime import datetime
 
+try:
+    from ..utils.metrics import StageTimer
+except ImportError:
+    # 作为独立脚本运行时没有上级包，不统计阶段耗时
+    class StageTimer:
+        def __init__(self, converter):
+            pass
+
+        def switch(self, name):
+            pass
+
+        def finish(self):
+            pass
+
+# 与 src.utils.log.get_logger 的命名一致；作为独立脚本运行时无法导入上级包，直接使用 logging
+logger = logging.getLogger("smartdatapro.converters.markdown_to_html")
+
 
 # 定义不同的样式模板
 STYLES = {
@@ -1238,7 +1256,7 @@ def generate_html_file(html_content, title="Markdown to HTML", style="default",
                 
             html_content = str(soup)
         except Exception as e:
-            print(f"内联样式处理失败: {e}")
+            logger.warning("内联样式处理失败: %s", e)
             # 失败则保持原样
 
     return f"""<!DOCTYPE html>
@@ -1326,7 +1344,7 @@ def markdown_content_to_html(markdown_content):
         return markdown.markdown(markdown_content, extensions=extensions, extension_configs=extension_configs)
     except Exception as e:
         # 如果扩展加载失败，回退到基础模式
-        print(f"高级Markdown扩展加载失败，回退到基础模式: {e}")
+        logger.warning("高级Markdown扩展加载失败，回退到基础模式: %s", e)
         try:
             import markdown
             return markdown.markdown(markdown_content, extensions=["fenced_code", "tables"])
@@ -1344,7 +1362,7 @@ def write_html_file(html_content, output_file_path):
         
         with open(output_file_path, "w", encoding="utf-8") as f:
             f.write(html_content)
-        print(f"HTML文件已成功生成: {output_file_path}")
+        logger.debug("HTML文件已成功生成: %s", output_file_path)
     except Exception as e:
         raise Exception(f"写入HTML文件错误: {e}")
 
@@ -1370,7 +1388,7 @@ def convert_markdown_to_html(input_file, output_file=None, options=None):
     Args:
         input_file (str): 输入的Markdown文件路径
         output_file (str, optional): 输出的HTML文件路径
-        options (dict, optional): 转换选项
+        options (dict, optional): 转换选项，timer 为调用方的 StageTimer 时各阶段耗时计入调用方
 
     Returns:
         dict: 转换结果信息
@@ -1378,7 +1396,20 @@ def convert_markdown_to_html(input_file, output_file=None, options=None):
     if options is None:
         options = {}
 
+    timer = options.get("timer")
+    own_timer = timer is None
+    if own_timer:
+        timer = StageTimer("markdown_to_html")
+    try:
+        return _convert_markdown_to_html(input_file, output_file, options, timer)
+    finally:
+        if own_timer:
+            timer.finish()
+
+
+def _convert_markdown_to_html(input_file, output_file, options, timer):
     # 读取Markdown文件
+    timer.switch("parse")
     markdown_content = read_markdown_file(input_file)
 
     # 解析输出路径
@@ -1396,8 +1427,8 @@ def convert_markdown_to_html(input_file, output_file=None, options=None):
         else:
             # 如果没有提取到标题，使用原文件名
             base_name = os.path.splitext(os.path.basename(input_file))[0]
-        # 使用当前目录作为输出目录，而不是输入文件所在目录
-        output_file = os.path.join(os.getcwd(), f"{base_name}.html")
+        # 默认使用当前目录作为输出目录，而不是输入文件所在目录，可通过 output_dir 选项指定
+        output_file = os.path.join(options.get("output_dir") or os.getcwd(), f"{base_name}.html")
 
     # 转换为HTML
     html_content = markdown_content_to_html(markdown_content)
@@ -1411,9 +1442,11 @@ def convert_markdown_to_html(input_file, output_file=None, options=None):
         title = options.get("title", os.path.splitext(os.path.basename(input_file))[0])
     style = options.get("style", "default")
     use_inline_styles = options.get("use_inline_styles", False)
+    timer.switch("build")
     full_html_content = generate_html_file(html_content, title, style, use_inline_styles)
 
     # 写入文件
+    timer.switch("save")
     write_html_file(full_html_content, output_file)
 
     return {"input_file": input_file, "output_file": output_file, "success": True}
@@ -17,6 +17,12 @@ from PIL import Image
 import numpy as np
 from io import BytesIO
 from ..utils.ocr_engine import perform_ocr, check_environment
+from ..utils.metrics import StageTimer
+from ..utils.log import get_logger, element_logger
+
+logger = get_logger("converters.pdf_to_word")
+# 逐行的调试日志，采样输出
+element_log = element_logger("converters.pdf_to_word")
 
 
 def convert_pdf_to_word(input_file, output_file=None, options=None):
@@ -56,42 +62,49 @@ def convert_pdf_to_word(input_file, output_file=None, options=None):
     if not input_file.lower().endswith('.pdf'):
         raise Exception(f"不支持的文件格式，仅支持PDF格式")
 
+    # 按阶段统计耗时：解析、页面渲染为图像、OCR、构建文档、保存
+    timer = StageTimer("pdf_to_word")
     try:
-        print(f"开始转换PDF文件: {input_file}")
-        print(f"OCR设置: use_ocr={use_ocr}, ocr_lang={ocr_lang}")
+        logger.info("开始转换PDF文件: %s", input_file)
+        logger.debug("OCR设置: use_ocr=%s, ocr_lang=%s", use_ocr, ocr_lang)
         
         # 创建Word文档对象
         doc = Document()
         
         # 打开PDF文件
+        timer.switch("parse")
         with pdfplumber.open(input_file) as pdf:
             page_count = len(pdf.pages)
-            print(f"PDF文件共有 {page_count} 页")
+            logger.debug("PDF文件共有 %s 页", page_count)
             
             # 遍历所有页面
             for page_num in range(page_count):
-                print(f"正在处理第 {page_num + 1}/{page_count} 页")
+                logger.debug("正在处理第 %s/%s 页", page_num + 1, page_count)
+                timer.switch("parse")
                 page = pdf.pages[page_num]
                 
                 # 1. 提取并处理文本
                 text = page.extract_text()
                 
                 # 将整个页面转换为图像，用于OCR和图片插入
-                print(f"将第 {page_num + 1} 页转换为图像")
+                timer.switch("image")
+                logger.debug("将第 %s 页转换为图像", page_num + 1)
                 page_image = page.to_image(resolution=300)
                 original_image = page_image.original
                 
-                # 保存页面图像到临时文件
-                temp_img_path = f"temp_page_{page_num + 1}.png"
+                # 保存页面图像到输出目录中的临时文件，同时执行的转换互不覆盖
+                temp_img_path = os.path.join(output_dir, f"temp_page_{uuid.uuid4().hex}_{page_num + 1}.png")
                 original_image.save(temp_img_path, format='PNG')
-                print(f"保存页面图像到: {temp_img_path}")
+                logger.debug("保存页面图像到: %s", temp_img_path)
                 
                 # 2. 执行OCR获取文本
+                timer.switch("build")
                 if use_ocr:
-                    print(f"对第 {page_num + 1} 页执行OCR")
+                    logger.debug("对第 %s 页执行OCR", page_num + 1)
                     # 使用新的 OCR 引擎，默认模式
-                    ocr_text = perform_ocr(original_image, lang=ocr_lang)
-                    print(f"OCR识别结果长度: {len(ocr_text)} 字符")
+                    with timer.stage("ocr"):
+                        ocr_text = perform_ocr(original_image, lang=ocr_lang)
+                    logger.debug("OCR识别结果长度: %s 字符", len(ocr_text))
                     
                     if ocr_text.strip():
                         # 合并原始文本和OCR文本
@@ -109,7 +122,7 @@ def convert_pdf_to_word(input_file, output_file=None, options=None):
                                 
                             # 跳过包含页码或图像标记的行
                             if any(keyword in line for keyword in ['第1页', '第 1 页', '[图像', '图像 1']):
-                                print(f"跳过行: {line}")
+                                element_log.debug("跳过行: %s", line)
                                 continue
                                 
                             # 清理行内的标记
@@ -119,7 +132,7 @@ def convert_pdf_to_word(input_file, output_file=None, options=None):
                             
                             if clean_line:
                                 doc.add_paragraph(clean_line)
-                                print(f"添加行: {clean_line}")
+                                element_log.debug("添加行: %s", clean_line)
                 else:
                     # 仅使用原始文本
                     if text and text.strip():
@@ -142,29 +155,28 @@ def convert_pdf_to_word(input_file, output_file=None, options=None):
                                 doc.add_paragraph(clean_line)
                 
                 # 3. 插入页面图像到Word文档
-                print(f"将第 {page_num + 1} 页图像插入到Word文档")
+                logger.debug("将第 %s 页图像插入到Word文档", page_num + 1)
                 try:
                     # 直接从临时文件插入图片
                     doc.add_picture(temp_img_path, width=Inches(5.0))
                     doc.add_paragraph()
-                    print(f"成功插入第 {page_num + 1} 页图像")
+                    logger.debug("成功插入第 %s 页图像", page_num + 1)
                 except Exception as e:
-                    print(f"插入图片失败: {str(e)}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning("插入图片失败: %s", e, exc_info=True)
                 
                 # 删除临时图像文件
                 if os.path.exists(temp_img_path):
                     os.remove(temp_img_path)
-                    print(f"删除临时图像文件: {temp_img_path}")
+                    logger.debug("删除临时图像文件: %s", temp_img_path)
                 
                 # 4. 添加分页符（除了最后一页）
                 if page_num < page_count - 1:
                     doc.add_page_break()
         
         # 保存Word文档
+        timer.switch("save")
         doc.save(output_file)
-        print(f"PDF文件转换成功: {output_file}")
+        logger.info("PDF文件转换成功: %s", output_file)
         
         return {
             "output_file": output_file,
@@ -173,7 +185,7 @@ def convert_pdf_to_word(input_file, output_file=None, options=None):
             "ocr_used": use_ocr
         }
     except Exception as e:
-        print(f"PDF文件转换失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.error("PDF文件转换失败: %s", e, exc_info=True)
         raise Exception(f"转换PDF文件失败: {str(e)}")
+    finally:
+        timer.finish()
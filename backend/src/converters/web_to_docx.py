@@ -30,6 +30,7 @@ import time
 import requests
 import re
 from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
 from bs4 import BeautifulSoup, Comment
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
@@ -38,12 +39,31 @@ from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from datetime import datetime
+from ..utils.text_cleaner import clean_text, remove_list_numbering, is_numbering_only
+from ..utils.image_pipeline import ImagePipeline
+from ..utils.html_fetch import fetch_html, DEFAULT_MAX_HTML_BYTES
+from ..utils.metrics import StageTimer
+from ..utils.log import get_logger, element_logger
+
+logger = get_logger("converters.web_to_docx")
+# 逐元素、逐图片的调试日志，采样输出
+element_log = element_logger("converters.web_to_docx")
+
+# 网页获取方式：static 直接下载HTML，browser 使用无头浏览器渲染，auto 遇到空壳页面时改用浏览器渲染
+RENDER_MODES = ("static", "browser", "auto")
+
+# 可见文本少于该字符数的页面视为客户端渲染的空壳页面
+EMPTY_SHELL_TEXT_THRESHOLD = 200
+
+_SCRIPT_BLOCK_RE = re.compile(r'<(script|style|noscript|template)[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
 
 
 class WebToDocxConverter:
     """网页转Word文档转换器类"""
 
-    def __init__(self, url, output_dir=None, timeout=10, progress_callback=None):
+    def __init__(self, url, output_dir=None, timeout=10, progress_callback=None, max_html_bytes=DEFAULT_MAX_HTML_BYTES,
+                 render_mode="static", timer=None):
         """
         初始化转换器
 
@@ -52,6 +72,9 @@ class WebToDocxConverter:
             output_dir: 输出目录
             timeout: 请求超时时间
             progress_callback: 进度回调函数
+            max_html_bytes: 下载网页时最多读取的字节数
+            render_mode: 网页获取方式，static、browser 或 auto
+            timer: 调用方的 StageTimer，提供时各阶段耗时计入调用方，否则单独统计
         """
         self.url = url
         
@@ -62,12 +85,15 @@ class WebToDocxConverter:
             self.local_file_path = url
             # 对于本地文件，base_url设置为文件所在目录的绝对路径
             self.base_url = f"file:///{os.path.dirname(os.path.abspath(url))}/"
-            print(f"[DEBUG] 检测到本地HTML文件: {url}")
-            print(f"[DEBUG] 本地文件base_url: {self.base_url}")
+            logger.debug("检测到本地HTML文件: %s", url)
+            logger.debug("本地文件base_url: %s", self.base_url)
         else:
             self.base_url = self._get_base_url(url)
         
         self.timeout = timeout
+        self.max_html_bytes = max_html_bytes
+        self.render_mode = render_mode if render_mode in RENDER_MODES else "static"
+        self.rendered = False
         # 默认输出到固定的output目录
         default_output_dir = "output"
         self.output_dir = output_dir or default_output_dir
@@ -87,15 +113,23 @@ class WebToDocxConverter:
         # 下载的图片列表
         self.downloaded_images = []
 
+        # 图片处理流水线，图片下载后立即在线程池中优化，结果按内容复用
+        self.image_pipeline = ImagePipeline()
+
         # 网页内容
         self.html_content = None
         self.soup = None
+        self.styles_text = ""
         self.title = None
         self.content = None
 
         # Word文档
         self.doc = None
 
+        # 各阶段耗时统计
+        self.own_timer = timer is None
+        self.timer = timer or StageTimer("web_to_docx")
+
         # 创建输出目录
         self._create_output_dir()
 
@@ -134,66 +168,14 @@ class WebToDocxConverter:
             preserve_newlines: 是否保留换行符，默认为False
             is_code: 是否是代码块，默认为False
         """
-        if not text:
-            return ""
-        
-        import re
-        # 移除所有HTML标签，但保留style标签内容
-        import re
-        
-        # 提取所有style标签内容
-        styles_text = ""
-        if self.soup:
-            style_tags = self.soup.find_all("style")
-            for style in style_tags:
-                styles_text += style.get_text() + "\n"
-        
-        # 移除style标签
-        if self.soup:
-            for tag in self.soup.find_all("style"):
-                tag.decompose()
-                
-        # 移除所有HTML标签
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # 再次强力清理可能残留的CSS代码
-        # 移除CSS样式块，如 body { ... } 或 .class { ... }
-        text = re.sub(r'[^{}]+\{[^}]+\}', '', text)
-        # 移除独立的CSS属性行，如 font-size: 12px;
-        text = re.sub(r'[\w-]+\s*:\s*[^;]+;', '', text)
-        # 移除残留的CSS选择器和花括号
-        text = re.sub(r'[\w\.-]+\s*\{', '', text)
-        text = re.sub(r'\}', '', text)
-        # 移除所有 \xXX 转义字符
-        text = re.sub(r'\\x[0-9a-fA-F]{2}', '', text)
-        # 移除所有 \uXXXX 转义字符
-        text = re.sub(r'\\u[0-9a-fA-F]{4}', '', text)
-        
-        # 根据参数决定是否保留换行符
-        if preserve_newlines:
-            # 只移除 \t 和 \r，保留 \n
-            text = re.sub(r'\\t', ' ', text)
-            text = re.sub(r'\\r', '', text)
-            # 移除多余的空格，但保留换行符
-            text = re.sub(r' +', ' ', text)
-            text = re.sub(r'^\s+', '', text, flags=re.MULTILINE)
-            text = re.sub(r'\s+$', '', text, flags=re.MULTILINE)
-        else:
-            # 移除所有 \n、\t、\r 等转义字符
-            text = re.sub(r'\\[ntr]', ' ', text)
-            # 移除多余的空格
-            text = re.sub(r'\s+', ' ', text).strip()
-        
-        if not is_code:
-            # 只在非代码块中移除引号、括号和JS相关内容
-            # 移除所有引号和括号
-            text = re.sub(r'["\'\(\)\[\]]', '', text)
-            # 移除所有JavaScript函数调用，如 JsDecode()
-            text = re.sub(r'JsDecode\([^)]*\)', '', text)
-            # 移除所有类似 content_noencode: 这样的JS变量定义
-            text = re.sub(r'\w+\s*:\s*', '', text)
-        
-        return text
+        return clean_text(text, preserve_newlines=preserve_newlines, is_code=is_code)
+
+    def _extract_styles(self):
+        """提取并移除所有style标签，每个文档只在解析时执行一次"""
+        style_tags = self.soup.find_all("style")
+        self.styles_text = "\n".join(style.get_text() for style in style_tags)
+        for tag in style_tags:
+            tag.decompose()
 
     def _download_html(self):
         """下载HTML内容或读取本地HTML文件"""
@@ -202,23 +184,23 @@ class WebToDocxConverter:
             
             # 检查是否为本地HTML文件
             if self.is_local_file:
-                print(f"[DEBUG] 读取本地HTML文件: {self.local_file_path}")
+                logger.debug("读取本地HTML文件: %s", self.local_file_path)
                 
                 # 读取本地HTML文件内容
                 with open(self.local_file_path, "r", encoding="utf-8") as f:
                     self.html_content = f.read()
                 
-                print(f"[DEBUG] 本地HTML文件读取成功，内容长度: {len(self.html_content)} 字符")
+                logger.debug("本地HTML文件读取成功，内容长度: %s 字符", len(self.html_content))
                 self._update_progress("本地HTML文件读取完成", 20)
                 return True
             
             # 网络URL处理
-            print(f"[DEBUG] 开始下载HTML: {self.url}")
-            print(f"[DEBUG] 超时设置: {self.timeout} 秒")
+            logger.debug("开始下载HTML: %s", self.url)
+            logger.debug("超时设置: %s 秒", self.timeout)
             
             # 检查URL格式是否正确
             if not self.url.startswith(('http://', 'https://')):
-                print(f"[DEBUG] URL格式错误: {self.url}")
+                logger.warning("URL格式错误: %s", self.url)
                 self._update_progress(f"URL格式错误: {self.url}", 0)
                 return False
             
@@ -228,88 +210,122 @@ class WebToDocxConverter:
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                 "Accept-Language": "zh-CN,zh;q=0.8",
             }
-            print(f"[DEBUG] 使用简化请求头: {simple_headers}")
+            logger.debug("使用简化请求头: %s", simple_headers)
+            
+            # 浏览器渲染模式，直接使用渲染后的DOM
+            if self.render_mode == "browser":
+                return self._render_html()
             
             try:
-                # 尝试使用简单的请求方式
-                response = requests.get(
-                    self.url, 
-                    headers=simple_headers, 
+                # 流式下载，读到字节预算后立即停止，不缓冲整个响应体
+                fetched = fetch_html(
+                    self.url,
+                    headers=simple_headers,
                     timeout=self.timeout,
-                    verify=False,  # 关闭证书验证
-                    allow_redirects=True
+                    max_bytes=self.max_html_bytes,
+                    verify=False  # 关闭证书验证
                 )
                 
-                print(f"[DEBUG] HTTP状态码: {response.status_code}")
-                response.raise_for_status()
-                
-                # 处理响应编码
-                if response.encoding is None:
-                    response.encoding = response.apparent_encoding
-                print(f"[DEBUG] 响应编码: {response.encoding}")
+                logger.debug("HTTP状态码: %s", fetched['status_code'])
+                logger.debug("响应编码: %s", fetched['encoding'])
                 
-                # 读取响应内容，限制最大长度为1MB
-                max_content_length = 1024 * 1024  # 1MB
-                self.html_content = response.text[:max_content_length]
-                print(f"[DEBUG] 响应内容长度: {len(self.html_content)} 字符")
+                self.html_content = fetched["html"]
+                logger.debug("读取字节数: %s，内容长度: %s 字符", fetched['bytes_read'], len(self.html_content))
                 
                 # 如果内容被截断，添加标记
-                if len(self.html_content) == max_content_length:
+                if fetched["truncated"]:
                     self.html_content += "<!-- 内容被截断 -->"
-                    print(f"[DEBUG] 响应内容超过 {max_content_length} 字符，已截断")
+                    logger.info("响应内容超过 %s 字节，已截断", self.max_html_bytes)
+                
+                # 自动模式下，客户端渲染的空壳页面改用浏览器渲染，渲染失败时保留已下载的内容
+                if self.render_mode == "auto" and self._looks_like_empty_shell(self.html_content):
+                    logger.info("页面可见文本过少，尝试使用浏览器渲染")
+                    if self._render_html():
+                        return True
                 
                 self._update_progress("网页内容下载完成", 20)
-                print(f"[DEBUG] HTML下载成功")
+                logger.debug("HTML下载成功")
                 return True
             except requests.exceptions.RequestException as e:
-                print(f"[DEBUG] HTML下载请求异常: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.warning("HTML下载请求异常: %s", e, exc_info=True)
+                # 自动模式下，直接下载失败时尝试使用浏览器渲染
+                if self.render_mode == "auto" and self._render_html():
+                    return True
                 self._update_progress(f"网页下载失败: {str(e)}", 0)
                 return False
             except Exception as e:
-                print(f"[DEBUG] 获取HTML内容失败: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.warning("获取HTML内容失败: %s", e, exc_info=True)
                 self._update_progress(f"获取HTML内容失败: {str(e)}", 0)
                 return False
         except FileNotFoundError as e:
-            print(f"[DEBUG] 本地HTML文件未找到: {str(e)}")
+            logger.debug("本地HTML文件未找到: %s", e)
             self._update_progress(f"本地HTML文件未找到: {str(e)}", 0)
             return False
         except UnicodeDecodeError as e:
-            print(f"[DEBUG] 本地HTML文件编码错误: {str(e)}")
+            logger.warning("本地HTML文件编码错误: %s", e)
             self._update_progress(f"本地HTML文件编码错误: {str(e)}", 0)
             return False
         except requests.exceptions.RequestException as e:
-            print(f"[DEBUG] HTML下载请求异常: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("HTML下载请求异常: %s", e, exc_info=True)
             self._update_progress(f"网页下载失败: {str(e)}", 0)
             return False
         except Exception as e:
-            print(f"[DEBUG] 获取HTML内容失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("获取HTML内容失败: %s", e, exc_info=True)
             self._update_progress(f"获取HTML内容失败: {str(e)}", 0)
             return False
 
+    def _looks_like_empty_shell(self, html):
+        """判断页面是否为客户端渲染的空壳：去掉脚本和标签后几乎没有可见文本"""
+        if not html:
+            return True
+        text = _TAG_RE.sub(" ", _SCRIPT_BLOCK_RE.sub(" ", html))
+        visible_length = len("".join(text.split()))
+        return visible_length < EMPTY_SHELL_TEXT_THRESHOLD
+
+    def _render_html(self):
+        """使用预热的无头浏览器渲染网页，适用于客户端渲染的页面"""
+        try:
+            self._update_progress("正在使用浏览器渲染网页...", 15)
+            # 按需导入，未使用渲染模式时不加载Playwright
+            from ..utils.page_renderer import render_html
+            
+            html = render_html(self.url, timeout=self.timeout)
+            logger.debug("浏览器渲染完成，内容长度: %s 字符", len(html))
+            
+            # 渲染结果同样受字节预算限制
+            if len(html.encode("utf-8")) > self.max_html_bytes:
+                html = html.encode("utf-8")[:self.max_html_bytes].decode("utf-8", "ignore")
+                html += "<!-- 内容被截断 -->"
+                logger.info("渲染内容超过 %s 字节，已截断", self.max_html_bytes)
+            
+            self.html_content = html
+            self.rendered = True
+            self._update_progress("网页渲染完成", 20)
+            return True
+        except Exception as e:
+            logger.warning("浏览器渲染失败: %s: %s", type(e).__name__, e)
+            self._update_progress(f"浏览器渲染失败: {str(e)}", 0)
+            return False
+
     def _parse_html(self):
         """解析HTML内容，特别优化微信公众号文章处理"""
         try:
-            print(f"[DEBUG] 开始解析HTML")
+            logger.debug("开始解析HTML")
             self._update_progress("正在解析网页内容...", 30)
             
             # 检查HTML内容是否存在
             if not self.html_content:
-                print(f"[DEBUG] HTML内容为空")
+                logger.debug("HTML内容为空")
                 return False
             
             self.soup = BeautifulSoup(self.html_content, "html.parser")
-            print(f"[DEBUG] BeautifulSoup初始化完成")
+            logger.debug("BeautifulSoup初始化完成")
+            
+            # 提取并移除style标签，后续的文本清理不再重复扫描整个文档
+            self._extract_styles()
             
             # 预处理：在HTML阶段就移除所有列表编号，从源头解决问题
-            print(f"[DEBUG] 开始预处理HTML，移除所有列表编号")
+            logger.debug("开始预处理HTML，移除所有列表编号")
             
             # 1. 处理所有列表项
             all_li = self.soup.find_all("li")
@@ -326,11 +342,11 @@ class WebToDocxConverter:
                         if cleaned_text != text:
                             child.replace_with(cleaned_text)
             
-            print(f"[DEBUG] HTML预处理完成，移除了所有列表编号")
+            logger.debug("HTML预处理完成，移除了所有列表编号")
 
             # 获取标题 - 特别优化微信公众号文章
             self.title = "网页内容"
-            print(f"[DEBUG] 默认标题: {self.title}")
+            logger.debug("默认标题: %s", self.title)
             
             # 尝试从微信公众号特定位置获取标题
             if self.soup:
@@ -351,7 +367,7 @@ class WebToDocxConverter:
                         "h3"   # 三级标题
                     ]
                     
-                    print(f"[DEBUG] 尝试获取标题")
+                    logger.debug("尝试获取标题")
                     for selector in wechat_title_selectors:
                         title_element = self.soup.select_one(selector)
                         if title_element and title_element.get_text():
@@ -359,10 +375,10 @@ class WebToDocxConverter:
                             # 过滤掉过短的标题
                             if len(title_text) > 3:
                                 self.title = title_text
-                                print(f"[DEBUG] 从选择器 {selector} 获取到标题: {self.title}")
+                                logger.debug("从选择器 %s 获取到标题: %s", selector, self.title)
                                 break
                 except Exception as e:
-                    print(f"[DEBUG] 获取标题失败: {str(e)}")
+                    logger.warning("获取标题失败: %s", e)
             
             if not self.title or self.title == "网页内容" or len(self.title) <= 3:
                 # 尝试从meta标签获取标题
@@ -381,10 +397,10 @@ class WebToDocxConverter:
                             meta_content = meta_title.get("content").strip()
                             if meta_content and len(meta_content) > 3:
                                 self.title = meta_content
-                                print(f"[DEBUG] 从meta标签 {selector} 获取到标题: {self.title}")
+                                logger.debug("从meta标签 %s 获取到标题: %s", selector, self.title)
                                 break
                 except Exception as e:
-                    print(f"[DEBUG] 从meta标签获取标题失败: {str(e)}")
+                    logger.warning("从meta标签获取标题失败: %s", e)
             
             # 最终检查，如果标题仍不满意，尝试从body中提取第一个有意义的文本作为标题
             if not self.title or self.title == "网页内容" or len(self.title) <= 3:
@@ -397,10 +413,10 @@ class WebToDocxConverter:
                         for line in lines:
                             if line and len(line) > 3 and len(line) < 100:
                                 self.title = line.strip()
-                                print(f"[DEBUG] 从body文本中提取到标题: {self.title}")
+                                logger.debug("从body文本中提取到标题: %s", self.title)
                                 break
                 except Exception as e:
-                    print(f"[DEBUG] 从body提取标题失败: {str(e)}")
+                    logger.warning("从body提取标题失败: %s", e)
             
             # 确保标题不是默认值
             if not self.title or self.title == "网页内容" or len(self.title) <= 3:
@@ -412,18 +428,18 @@ class WebToDocxConverter:
                     for part in reversed(path_parts):
                         if part and len(part) > 3:
                             self.title = part.replace("-", " ").replace("_", " ").capitalize()
-                            print(f"[DEBUG] 从URL中提取到标题: {self.title}")
+                            logger.debug("从URL中提取到标题: %s", self.title)
                             break
                 except Exception as e:
-                    print(f"[DEBUG] 从URL提取标题失败: {str(e)}")
+                    logger.warning("从URL提取标题失败: %s", e)
 
             # 获取主要内容 - 特别优化微信公众号文章
             self.content = None
-            print(f"[DEBUG] 开始获取主要内容")
+            logger.debug("开始获取主要内容")
             
             # 如果是本地文件，直接使用body作为内容，跳过复杂的提取逻辑
             if self.is_local_file and self.soup.body:
-                print(f"[DEBUG] 本地文件，直接使用body作为主要内容")
+                logger.debug("本地文件，直接使用body作为主要内容")
                 self.content = self.soup.body
                 # 移除不需要的标签 (仅移除script和style，保留其他结构)
                 for tag in self.content.find_all(["script", "style", "meta", "link", "title"]):
@@ -437,12 +453,12 @@ class WebToDocxConverter:
                                     "header", "noscript", "meta", "link", "input", "textarea", 
                                     "button", "select", "option", "fieldset", "legend", "label"]
                     
-                    print(f"[DEBUG] 移除不需要的标签: {unwanted_tags}")
+                    logger.debug("移除不需要的标签: %s", unwanted_tags)
                     for tag in self.soup.find_all(unwanted_tags):
                         try:
                             tag.decompose()
                         except Exception as e:
-                            print(f"[DEBUG] 移除标签 {tag.name} 失败: {str(e)}")
+                            logger.warning("移除标签 %s 失败: %s", tag.name, e)
                             continue
                     
                     # 移除微信公众号特定的广告和无用元素
@@ -456,13 +472,13 @@ class WebToDocxConverter:
                         "div[class*='profile']", "div[class*='wechat-ad']"
                     ]
                     
-                    print(f"[DEBUG] 移除微信公众号广告元素")
+                    logger.debug("移除微信公众号广告元素")
                     for selector in wechat_ad_selectors:
                         try:
                             for tag in self.soup.select(selector):
                                 tag.decompose()
                         except Exception as e:
-                            print(f"[DEBUG] 移除广告元素 {selector} 失败: {str(e)}")
+                            logger.warning("移除广告元素 %s 失败: %s", selector, e)
                             continue
                     
                     # 尝试获取微信公众号文章的主要内容容器
@@ -476,21 +492,21 @@ class WebToDocxConverter:
                         "div[class*='content']"
                     ]
                     
-                    print(f"[DEBUG] 尝试获取内容容器")
+                    logger.debug("尝试获取内容容器")
                     for selector in wechat_content_selectors:
                         content_element = self.soup.select_one(selector)
                         if content_element:
                             # 检查内容是否为空
                             if content_element.get_text(strip=True):
                                 self.content = content_element
-                                print(f"[DEBUG] 使用选择器 {selector} 获取到内容")
+                                logger.debug("使用选择器 %s 获取到内容", selector)
                                 break
             
-            print(f"[DEBUG] 获取内容结果: {'成功' if self.content else '失败'}")
+            logger.debug("获取内容结果: %s", '成功' if self.content else '失败')
             
             # 只有在非本地文件且确实获取失败时，才尝试文本提取兜底
             if not self.is_local_file and (not self.content or not self.content.get_text(strip=True)):
-                print(f"[DEBUG] 传统方式获取的内容为空，尝试直接提取纯文本")
+                logger.debug("传统方式获取的内容为空，尝试直接提取纯文本")
                 # ... (保留原有的兜底逻辑)
                 try:
                     import re
@@ -505,26 +521,24 @@ class WebToDocxConverter:
             
             # 如果仍然没有获取到内容，尝试直接从soup.body获取
             if not self.content:
-                print(f"[DEBUG] 尝试从soup.body获取内容")
+                logger.debug("尝试从soup.body获取内容")
                 if self.soup and hasattr(self.soup, 'body') and self.soup.body:
                     self.content = self.soup.body
-                    print(f"[DEBUG] 从soup.body获取到内容")
+                    logger.debug("从soup.body获取到内容")
             
             # 最后的备用方案
             if not self.content or not self.content.get_text(strip=True):
-                print(f"[DEBUG] 所有方法都未获取到内容，使用默认内容")
+                logger.debug("所有方法都未获取到内容，使用默认内容")
                 if not self.soup:
                     self.soup = BeautifulSoup()
                 self.content = self.soup.new_tag("div")
                 self.content.string = "无法获取网页内容"
 
-            print(f"[DEBUG] HTML解析完成，获取到标题: {self.title}，内容: {'成功' if self.content else '失败'}")
+            logger.debug("HTML解析完成，获取到标题: %s，内容: %s", self.title, '成功' if self.content else '失败')
             self._update_progress("网页内容解析完成", 40)
             return True
         except Exception as e:
-            print(f"[DEBUG] HTML解析失败: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("HTML解析失败: %s", e, exc_info=True)
             self._update_progress(f"网页解析失败: {str(e)}", 0)
             return False
 
@@ -539,7 +553,7 @@ class WebToDocxConverter:
             img_url = img_url.strip()
             
             if not img_url or img_url == "#" or "javascript:" in img_url or "data:" in img_url:
-                print(f"[DEBUG] 跳过无效图片URL: {img_url}")
+                element_log.debug("跳过无效图片URL: %s", img_url)
                 return None
             
             # 构建完整URL或路径
@@ -556,19 +570,17 @@ class WebToDocxConverter:
                     if os.path.exists(local_img_path):
                         final_img_url = local_img_path
                         is_local_image = True
-                        print(f"[DEBUG] 本地图片路径: {final_img_url}")
+                        element_log.debug("本地图片路径: %s", final_img_url)
                     else:
                         # 尝试使用base_url构建完整URL
                         final_img_url = urljoin(self.base_url, img_url)
                 elif img_url.startswith("file://"):
                     # 处理file://协议的本地图片
                     # 移除file://前缀，转换为本地路径
-                    final_img_url = img_url.replace("file:///", "").replace("file://", "")
-                    # 处理不同操作系统的路径格式
-                    if os.name == 'nt':  # Windows系统
-                        final_img_url = final_img_url.replace('/', '\\')
+                    # 按操作系统转换为本地路径，POSIX系统保留开头的 /
+                    final_img_url = url2pathname(urlparse(img_url).path)
                     is_local_image = True
-                    print(f"[DEBUG] file://协议图片转换为本地路径: {final_img_url}")
+                    element_log.debug("file://协议图片转换为本地路径: %s", final_img_url)
             else:
                 # 网络文件处理
                 if not img_url.startswith(("http://", "https://")):
@@ -577,7 +589,7 @@ class WebToDocxConverter:
             # 检查图片URL是否已经被处理过
             for existing_img in self.downloaded_images:
                 if img_url == existing_img['url'] or final_img_url == existing_img['final_url']:
-                    print(f"[DEBUG] 图片已下载，跳过: {img_url}")
+                    element_log.debug("图片已下载，跳过: %s", img_url)
                     return existing_img['path']
 
             # 提取文件名，保留原始文件扩展名
@@ -600,7 +612,7 @@ class WebToDocxConverter:
                 # 本地图片直接复制
                 import shutil
                 shutil.copy2(final_img_url, img_path)
-                print(f"[DEBUG] 本地图片复制成功: {final_img_url} -> {img_path}")
+                element_log.debug("本地图片复制成功: %s -> %s", final_img_url, img_path)
             else:
                 # 网络图片下载，增强重试机制和防盗链处理
                 import urllib3
@@ -639,24 +651,28 @@ class WebToDocxConverter:
                 
                 # 验证响应是否为图片
                 if 'image' not in response.headers.get('Content-Type', ''):
-                    print(f"[DEBUG] 响应不是图片，跳过: {final_img_url}")
+                    element_log.debug("响应不是图片，跳过: %s", final_img_url)
                     return None
 
                 # 保存图片
                 with open(img_path, "wb") as f:
                     f.write(response.content)
-                print(f"[DEBUG] 网络图片下载成功: {final_img_url} -> {img_path}")
+                element_log.debug("网络图片下载成功: %s -> %s", final_img_url, img_path)
 
             # 记录下载的图片信息
             self.downloaded_images.append(
                 {"url": img_url, "path": img_path, "name": img_name, "final_url": final_img_url}
             )
 
+            # 提交到图片处理流水线，与后续下载和文档构建并行
+            try:
+                self.image_pipeline.submit(img_path)
+            except Exception as e:
+                logger.warning("提交图片优化失败: %s, 错误: %s", img_path, e)
+
             return img_path
         except Exception as e:
-            print(f"图片下载/复制失败: {img_url}, 错误: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("图片下载/复制失败: %s, 错误: %s", img_url, e, exc_info=True)
             return None
 
     def _download_all_images(self):
@@ -724,7 +740,7 @@ class WebToDocxConverter:
                             self._download_image(final_img_url, i)
                 except Exception as e:
                     # 跳过无法处理的图片
-                    print(f"处理图片时出错: {str(e)}")
+                    logger.warning("处理图片时出错: %s", e)
                     continue
 
                 # 更新进度
@@ -737,7 +753,7 @@ class WebToDocxConverter:
             return True
         except Exception as e:
             self._update_progress(f"图片下载失败: {str(e)}", 0)
-            print(f"图片下载详细错误: {str(e)}")
+            logger.warning("图片下载详细错误: %s", e)
             return False
 
     def _create_word_document(self):
@@ -790,43 +806,43 @@ class WebToDocxConverter:
             return
             
         try:
-            print(f"\n=== 开始处理内容 ===")
-            print(f"内容元素: {self.content.name if hasattr(self.content, 'name') else '未知'}")
+            logger.debug("=== 开始处理内容 ===")
+            logger.debug("内容元素: %s", self.content.name if hasattr(self.content, 'name') else '未知')
             
             # 首先尝试处理HTML结构，保留格式和图片
-            print("处理HTML结构，保留排版和图片")
+            logger.debug("处理HTML结构，保留排版和图片")
             self._process_block_element(self.content)
             
             # 关键改进：如果_process_block_element没有添加任何内容，确保添加文本
             # 检查文档段落数量（至少应该有标题、信息行）
             if len(self.doc.paragraphs) <= 2:
-                print("处理HTML结构后没有添加足够内容，尝试提取纯文本")
+                logger.info("处理HTML结构后没有添加足够内容，尝试提取纯文本")
                 # 直接从内容中提取所有文本
                 full_text = self.content.get_text(separator="\n", strip=True)
-                print(f"提取的文本长度: {len(full_text)} 字符")
+                logger.debug("提取的文本长度: %s 字符", len(full_text))
                 
                 # 清理文本
                 full_text = self._clean_text(full_text)
                 
                 if full_text:
-                    print("添加提取的纯文本到文档")
+                    logger.debug("添加提取的纯文本到文档")
                     self.doc.add_paragraph(full_text)
                 else:
-                    print("提取的文本为空，尝试其他方式获取内容")
+                    logger.debug("提取的文本为空，尝试其他方式获取内容")
                     # 尝试从整个soup中提取文本
                     if hasattr(self, 'soup') and self.soup:
                         soup_text = self.soup.get_text(separator="\n", strip=True)
-                        print(f"从整个soup提取的文本长度: {len(soup_text)} 字符")
+                        logger.debug("从整个soup提取的文本长度: %s 字符", len(soup_text))
                         # 使用通用清理函数清理文本
                         soup_text = self._clean_text(soup_text)
                         if soup_text:
                             self.doc.add_paragraph(soup_text)
                         else:
-                            print("无法获取任何文本内容")
+                            logger.warning("无法获取任何文本内容")
                             self.doc.add_paragraph("无法获取网页内容")
             
         except Exception as e:
-            print(f"处理内容时发生异常: {str(e)}")
+            logger.warning("处理内容时发生异常: %s", e)
             # 最后的备用方案
             try:
                 # 尝试提取纯文本作为备用
@@ -1076,42 +1092,12 @@ class WebToDocxConverter:
                 self._apply_style_from_css(run, child)
 
     def _optimize_image(self, img_path):
-        """优化图片：压缩、调整大小、转换格式"""
-        try:
-            from PIL import Image
-            import io
-            import os
-            
-            # 打开图片
-            with Image.open(img_path) as img:
-                # 转换为RGB模式（处理透明背景）
-                if img.mode in ('RGBA', 'LA'):
-                    bg = Image.new('RGB', img.size, (255, 255, 255))
-                    bg.paste(img, mask=img.split()[-1])
-                    img = bg
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # 调整大小，确保最大宽度不超过Word页面宽度
-                max_width = 6.0  # Word页面宽度，单位：英寸
-                max_pixels = int(max_width * 96)  # 96 DPI
-                
-                if img.width > max_pixels:
-                    # 按比例缩放
-                    ratio = max_pixels / img.width
-                    new_width = int(img.width * ratio)
-                    new_height = int(img.height * ratio)
-                    img = img.resize((new_width, new_height), Image.LANCZOS)
-                
-                # 保存优化后的图片
-                optimized_path = img_path + '.optimized.jpg'
-                img.save(optimized_path, format='JPEG', quality=85, optimize=True)
-                
-                return optimized_path
-        except Exception as e:
-            print(f"图片优化失败: {e}")
+        """获取优化后的图片：每张图片只处理一次，返回内存缓冲区，失败时返回原图片路径"""
+        optimized = self.image_pipeline.get(img_path)
+        if optimized is None:
             # 优化失败，返回原图片
             return img_path
+        return optimized
     
     def _handle_inline_image(self, img_element, paragraph):
         """处理行内图片，优化图片显示效果"""
@@ -1141,23 +1127,17 @@ class WebToDocxConverter:
                 img_path = self._download_image(img_url, len(self.downloaded_images)+1)
 
             if img_path and os.path.exists(img_path):
-                # 优化图片
-                optimized_img_path = self._optimize_image(img_path)
+                # 优化图片，重复出现的图片直接复用处理结果
+                optimized_img = self._optimize_image(img_path)
                 
                 # 插入图片到文档
                 run = paragraph.add_run()
-                picture = run.add_picture(optimized_img_path, width=None)  # 自动使用优化后的大小
+                picture = run.add_picture(optimized_img, width=None)  # 自动使用优化后的大小
                 
                 # 居中显示图片
                 paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                
-                # 清理临时优化文件
-                if optimized_img_path != img_path and os.path.exists(optimized_img_path):
-                    os.remove(optimized_img_path)
         except Exception as e:
-            print(f"行内图片处理失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("行内图片处理失败: %s", e, exc_info=True)
 
     def _process_table(self, table_element):
         """处理表格"""
@@ -1191,7 +1171,7 @@ class WebToDocxConverter:
                         
             self.doc.add_paragraph() # 表格后空一行
         except Exception as e:
-            print(f"表格处理失败: {e}")
+            logger.warning("表格处理失败: %s", e)
 
     def _process_block_element(self, element):
         """处理块级元素，递归提取内容"""
@@ -1206,7 +1186,7 @@ class WebToDocxConverter:
             else:
                 return
             
-            print(f"[DEBUG] 处理元素 {element.name}, 子节点数: {len(children)}")
+            element_log.debug("处理元素 %s, 子节点数: %s", element.name, len(children))
                 
             for i, child in enumerate(children):
                 try:
@@ -1220,7 +1200,7 @@ class WebToDocxConverter:
                         if text:
                             # 只有当文本不仅仅是标点符号或非常短时才打印日志，避免日志过多
                             if len(text) > 1:
-                                print(f"[DEBUG] 处理文本节点: {text[:20]}...")
+                                element_log.debug("处理文本节点: %s...", text[:20])
                             self.doc.add_paragraph(text)
                         continue
 
@@ -1228,7 +1208,7 @@ class WebToDocxConverter:
                     if child.name is None:
                         continue
                         
-                    print(f"[DEBUG] 处理子元素 {i}: {child.name}")
+                    element_log.debug("处理子元素 %s: %s", i, child.name)
 
                     # 专门处理图片元素，确保块级图片也能得到优化处理
                     if child.name == "img":
@@ -1261,7 +1241,7 @@ class WebToDocxConverter:
                                 # 如果需要，可以清空p然后重新添加
                                 pass
                         except Exception as h_e:
-                            print(f"[DEBUG] 标题处理失败: {h_e}")
+                            logger.warning("标题处理失败: %s", h_e)
                             pass
                             
                     elif child.name == "p":
@@ -1377,56 +1357,16 @@ class WebToDocxConverter:
                             self._process_inline_content(child, p)
                             
                 except Exception as inner_e:
-                    print(f"[DEBUG] 处理子元素 {child.name if hasattr(child, 'name') else 'text'} 失败: {inner_e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.warning("处理子元素 %s 失败: %s", child.name if hasattr(child, 'name') else 'text', inner_e, exc_info=True)
                     continue
                     
         except Exception as e:
-            print(f"[DEBUG] 处理块级元素失败: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("处理块级元素失败: %s", e, exc_info=True)
             pass
 
     def _remove_list_numbering(self, text):
         """移除文本中的列表编号，如"1. "、"(1) "、"a. "、"6. 1. "等"""
-        import re
-        
-        # 处理复杂嵌套编号，如"6. 1. "、"2. 3. 1. "等
-        # 匹配多个连续的编号，直到最后一个编号
-        complex_pattern = r'^(\s*(?:\d+|[a-zA-Z]|[ivxlcdmIVXLCDM])+(?:\.|\)|\(\d+\)|\([a-zA-Z]\)|\([ivxlcdmIVXLCDM]+\))\s+)+'
-        
-        # 先尝试移除复杂嵌套编号
-        if re.match(complex_pattern, text, re.IGNORECASE):
-            return re.sub(complex_pattern, '', text, count=1, flags=re.IGNORECASE)
-        
-        # 匹配各种列表编号格式
-        # 1. 数字编号: 1. 2. 3. 或 1) 2) 3) 或 (1) (2) (3)
-        # 2. 字母编号: a. b. c. 或 a) b) c) 或 (a) (b) (c)
-        # 3. 罗马数字: i. ii. iii. 或 I. II. III.
-        patterns = [
-            r'^\s*\d+\.\s+',      # 1. 
-            r'^\s*\d+\)\s+',      # 1) 
-            r'^\s*\(\d+\)\s+',    # (1) 
-            r'^\s*[a-zA-Z]\.\s+',  # a. 
-            r'^\s*[a-zA-Z]\)\s+',  # a) 
-            r'^\s*\([a-zA-Z]\)\s+',# (a) 
-            r'^\s*[ivxlcdm]+\.\s+', # i. ii. iii. 
-            r'^\s*[IVXLCDM]+\.\s+', # I. II. III. 
-            r'^\s*[ivxlcdm]+\)\s+', # i) ii) iii) 
-            r'^\s*[IVXLCDM]+\)\s+'  # I) II) III) 
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, text, re.IGNORECASE):
-                return re.sub(pattern, '', text, count=1, flags=re.IGNORECASE)
-        
-        # 最后尝试移除任何数字+点的组合，如"1."、"2."等
-        simple_pattern = r'^\s*(\d+\.\s*)+'
-        if re.match(simple_pattern, text):
-            return re.sub(simple_pattern, '', text, count=1)
-        
-        return text
+        return remove_list_numbering(text)
     
     def _clean_list_item(self, li_element):
         """彻底清理列表项，移除所有可能的编号和不必要的元素"""
@@ -1472,7 +1412,7 @@ class WebToDocxConverter:
         for child in cleaned_li.find_all(['span', 'div', 'p'], recursive=True):
             child_text = child.get_text().strip()
             # 如果子元素只包含编号，直接移除
-            if re.match(r'^(\d+|[a-zA-Z]|[ivxlcdmIVXLCDM])+(\.|\)|\(\d+\)|\([a-zA-Z]\)|\([ivxlcdmIVXLCDM]+\))(\s+|$)', child_text):
+            if is_numbering_only(child_text):
                 child.decompose()
         
         return cleaned_li
@@ -1537,9 +1477,7 @@ class WebToDocxConverter:
                         # 递归处理嵌套列表，嵌套级别+1
                         self._add_list_to_document(nested_list, level+1)
         except Exception as e:
-            print(f"处理列表时出错: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("处理列表时出错: %s", e, exc_info=True)
 
     def _add_image_to_document(self, img_url):
         """添加图片到文档，保持原文顺序和简洁性
@@ -1551,15 +1489,15 @@ class WebToDocxConverter:
             import requests
             import re
             
-            print(f"[DEBUG] _add_image_to_document 调用，传入URL: {img_url}")
-            print(f"[DEBUG] 当前已下载图片数量: {len(self.downloaded_images)}")
+            element_log.debug("_add_image_to_document 调用，传入URL: %s", img_url)
+            element_log.debug("当前已下载图片数量: %s", len(self.downloaded_images))
             
             # 简化图片插入逻辑
             # 遍历已下载的图片，查找匹配项
             img_path = None
             
             for i, img_info in enumerate(self.downloaded_images):
-                print(f"[DEBUG] 检查已下载图片 {i+1}/{len(self.downloaded_images)}: {img_info['url']}")
+                element_log.debug("检查已下载图片 %s/%s: %s", i+1, len(self.downloaded_images), img_info['url'])
                 
                 # 检查多种匹配方式
                 if (img_url == img_info['url'] or 
@@ -1569,12 +1507,12 @@ class WebToDocxConverter:
                     # 忽略查询参数的匹配
                     re.sub(r'\?.+$', '', img_url) == re.sub(r'\?.+$', '', img_info['url'])):
                     img_path = img_info['path']
-                    print(f"[DEBUG] 找到匹配的已下载图片: {img_url} -> {img_path}")
+                    element_log.debug("找到匹配的已下载图片: %s -> %s", img_url, img_path)
                     break
             
             # 如果没有找到匹配的图片，尝试直接处理
             if not img_path or not os.path.exists(img_path):
-                print(f"[DEBUG] 未找到匹配的已下载图片，尝试直接下载")
+                element_log.debug("未找到匹配的已下载图片，尝试直接下载")
                 
                 # 处理URL中的特殊字符
                 processed_img_url = re.sub(r'&amp;', '&', img_url)
@@ -1589,11 +1527,11 @@ class WebToDocxConverter:
                 # 直接下载并插入图片
                 img_index = len(self.downloaded_images) + 1
                 img_path = self._download_image(final_img_url, img_index)
-                print(f"[DEBUG] 直接下载图片结果: {img_path}")
+                element_log.debug("直接下载图片结果: %s", img_path)
                 
                 # 如果下载成功，更新img_info
                 if img_path and os.path.exists(img_path):
-                    print(f"[DEBUG] 直接下载图片成功，路径: {img_path}")
+                    element_log.debug("直接下载图片成功，路径: %s", img_path)
             
             # 初始化变量，避免NameError
             is_local_image = False
@@ -1605,36 +1543,36 @@ class WebToDocxConverter:
                 # 处理本地HTML文件中的图片
                 if img_url.startswith("file://"):
                     # file://协议转换为本地路径
-                    final_img_url = img_url.replace("file:///", "").replace("file://", "")
+                    final_img_url = url2pathname(urlparse(img_url).path)
                     is_local_image = True
-                    print(f"[DEBUG] file://协议图片转换为本地路径: {final_img_url}")
+                    element_log.debug("file://协议图片转换为本地路径: %s", final_img_url)
                 elif not img_url.startswith(("http://", "https://")):
                     # 检查是否为本地文件路径
                     local_img_path = os.path.join(os.path.dirname(self.local_file_path), img_url)
                     if os.path.exists(local_img_path):
                         final_img_url = local_img_path
                         is_local_image = True
-                        print(f"[DEBUG] 本地相对路径图片: {final_img_url}")
+                        element_log.debug("本地相对路径图片: %s", final_img_url)
             
             # 尝试将图片添加到文档
             if img_path and os.path.exists(img_path):
                 try:
-                    # 添加图片到文档，保持原始尺寸比例
-                    self.doc.add_picture(img_path, width=Inches(5.0))
-                    print(f"[DEBUG] 成功在原位置添加图片: {processed_img_url}")
+                    # 添加图片到文档，保持原始尺寸比例；使用下载时已提交的优化结果
+                    self.doc.add_picture(self._optimize_image(img_path), width=Inches(5.0))
+                    element_log.debug("成功在原位置添加图片: %s", processed_img_url)
                     return
                 except Exception as e:
-                    print(f"[DEBUG] 使用本地图片插入失败: {str(e)}")
+                    logger.warning("使用本地图片插入失败: %s", e)
             
             # 如果未找到图片或插入失败，处理本地文件情况
             if is_local_image and os.path.exists(final_img_url):
                 try:
                     # 直接使用本地图片路径
-                    self.doc.add_picture(final_img_url, width=Inches(5.0))
-                    print(f"[DEBUG] 直接使用本地图片: {final_img_url}")
+                    self.doc.add_picture(self._optimize_image(final_img_url), width=Inches(5.0))
+                    element_log.debug("直接使用本地图片: %s", final_img_url)
                     return
                 except Exception as e:
-                    print(f"[DEBUG] 直接使用本地图片失败: {str(e)}")
+                    logger.warning("直接使用本地图片失败: %s", e)
             
             # 对于网络图片，如果未下载或插入失败，尝试直接下载并插入
             else:
@@ -1643,7 +1581,7 @@ class WebToDocxConverter:
                     img_headers = self.headers.copy()
                     img_headers['Referer'] = self.url
                     
-                    print(f"[DEBUG] 直接下载图片: {final_img_url}")
+                    element_log.debug("直接下载图片: %s", final_img_url)
                     # 使用带重试机制的会话
                     import urllib3
                     from requests.adapters import HTTPAdapter
@@ -1665,7 +1603,7 @@ class WebToDocxConverter:
                     
                     # 检查是否为图片文件
                     if not response.headers.get('Content-Type', '').startswith('image/'):
-                        print(f"[DEBUG] 不是图片文件: {final_img_url}, Content-Type: {response.headers.get('Content-Type')}")
+                        element_log.debug("不是图片文件: %s, Content-Type: %s", final_img_url, response.headers.get('Content-Type'))
                         # 预留图片空间
                         placeholder_para = self.doc.add_paragraph("[图片占位符]")
                         placeholder_para.space_before = Pt(12)
@@ -1691,10 +1629,10 @@ class WebToDocxConverter:
                     
                     try:
                         # 添加图片到文档，保持原始尺寸比例
-                        self.doc.add_picture(temp_file_path, width=Inches(5.0))
-                        print(f"[DEBUG] 成功直接添加图片到文档: {final_img_url}")
+                        self.doc.add_picture(self._optimize_image(temp_file_path), width=Inches(5.0))
+                        element_log.debug("成功直接添加图片到文档: %s", final_img_url)
                     except Exception as e:
-                        print(f"[DEBUG] 直接添加图片到文档失败: {str(e)}")
+                        logger.warning("直接添加图片到文档失败: %s", e)
                         # 预留图片空间
                         placeholder_para = self.doc.add_paragraph("[图片占位符]")
                         placeholder_para.space_before = Pt(12)
@@ -1709,29 +1647,27 @@ class WebToDocxConverter:
                         self.downloaded_images.append(
                             {"url": processed_img_url, "path": local_img_path, "name": img_name, "final_url": final_img_url}
                         )
-                        print(f"[DEBUG] 图片已保存到本地: {local_img_path}")
+                        element_log.debug("图片已保存到本地: %s", local_img_path)
                     finally:
                         # 删除临时文件
                         os.unlink(temp_file_path)
                 except Exception as direct_e:
-                    print(f"[DEBUG] 直接下载图片失败: {str(direct_e)}")
+                    logger.warning("直接下载图片失败: %s", direct_e)
             
             # 所有方法都失败，添加占位符
             placeholder_para = self.doc.add_paragraph("[图片占位符]")
             placeholder_para.space_before = Pt(12)
             placeholder_para.space_after = Pt(12)
             placeholder_para.add_run(f" (无法处理: {processed_img_url})")
-            print(f"[DEBUG] 无法处理图片，添加占位符: {processed_img_url}")
+            logger.debug("无法处理图片，添加占位符: %s", processed_img_url)
         except Exception as e:
-            print(f"[DEBUG] 处理图片时发生异常: {str(e)}")
+            logger.warning("处理图片时发生异常: %s", e, exc_info=True)
             # 预留图片空间
             placeholder_para = self.doc.add_paragraph("[图片占位符]")
             placeholder_para.space_before = Pt(12)
             placeholder_para.space_after = Pt(12)
             placeholder_para.add_run(f" (处理失败: {img_url})")
             # 打印详细错误信息，便于调试
-            import traceback
-            traceback.print_exc()
 
     def _save_document(self, output_file):
         """保存Word文档"""
@@ -1777,17 +1713,18 @@ class WebToDocxConverter:
         start_time = time.time()
         max_execution_time = 120  # 最大执行时间限制为120秒
         
-        print("[DEBUG] 开始执行转换过程")
-        print(f"[DEBUG] 最大执行时间: {max_execution_time} 秒")
+        logger.debug("开始执行转换过程")
+        logger.debug("最大执行时间: %s 秒", max_execution_time)
         
         try:
             # 执行转换步骤，每个步骤都检查执行时间
             if time.time() - start_time > max_execution_time:
                 return {"success": False, "message": "转换超时"}
             
+            self.timer.switch("download")
             success = self._download_html()
             if not success:
-                print("[DEBUG] HTML下载失败，使用后备转换逻辑")
+                logger.warning("HTML下载失败，使用后备转换逻辑")
                 # 从URL中提取有意义的部分作为标题
                 try:
                     from urllib.parse import urlparse
@@ -1801,7 +1738,7 @@ class WebToDocxConverter:
                             fallback_title = part.replace("-", " ").replace("_", " ").capitalize()
                             break
                 except Exception as e:
-                    print(f"[DEBUG] 从URL提取标题失败: {str(e)}")
+                    logger.warning("从URL提取标题失败: %s", e)
                     fallback_title = "网页转换结果"
                     
                 # HTML下载失败，使用简单的后备转换逻辑，使用从URL提取的标题
@@ -1813,9 +1750,10 @@ class WebToDocxConverter:
             if time.time() - start_time > max_execution_time:
                 return {"success": False, "message": "转换超时"}
             
+            self.timer.switch("parse")
             success = self._parse_html()
             if not success:
-                print("[DEBUG] HTML解析失败，使用后备解析逻辑")
+                logger.warning("HTML解析失败，使用后备解析逻辑")
                 # HTML解析失败，使用简单的后备解析逻辑
                 # 保持之前的标题，不要重置为默认值
                 # self.title = "简单转换结果"
@@ -1824,17 +1762,19 @@ class WebToDocxConverter:
             if time.time() - start_time > max_execution_time:
                 return {"success": False, "message": "转换超时"}
             
-            print("[DEBUG] 开始下载图片")
+            logger.debug("开始下载图片")
+            self.timer.switch("image")
             if not self._download_all_images():
                 # 图片下载失败不影响整体转换
-                print("[DEBUG] 图片下载失败，但继续执行")
+                logger.warning("图片下载失败，但继续执行")
             
             if time.time() - start_time > max_execution_time:
                 return {"success": False, "message": "转换超时"}
             
+            self.timer.switch("build")
             success = self._create_word_document()
             if not success:
-                print("[DEBUG] Word文档创建失败，使用极简后备逻辑")
+                logger.warning("Word文档创建失败，使用极简后备逻辑")
                 # Word文档创建失败，使用极简后备逻辑
                 self.doc = Document()
                 self.doc.add_heading("极简转换结果", level=1)
@@ -1848,11 +1788,12 @@ class WebToDocxConverter:
                 sanitized_title = self._sanitize_filename(self.title)
                 final_output_file = os.path.join(self.output_dir, f"{sanitized_title}.docx")
 
+            self.timer.switch("save")
             if not self._save_document(final_output_file):
                 return {"success": False, "message": "Word文档保存失败"}
 
             end_time = time.time()
-            print(f"[DEBUG] 转换完成，总耗时: {end_time - start_time:.2f} 秒")
+            logger.info("转换完成，总耗时: %.2f 秒", end_time - start_time)
 
             return {
                 "success": True,
@@ -1860,17 +1801,16 @@ class WebToDocxConverter:
                 "output_file": final_output_file,
                 "title": self.title,
                 "downloaded_images": len(self.downloaded_images),
+                "rendered": self.rendered,
                 "url": self.url,
                 "execution_time": end_time - start_time
             }
         except Exception as e:
-            print(f"[DEBUG] 转换过程中发生异常: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("转换过程中发生异常: %s", e, exc_info=True)
             
             # 最终后备逻辑，确保返回一个有效的Word文档
             try:
-                print("[DEBUG] 使用最终后备逻辑")
+                logger.debug("使用最终后备逻辑")
                 self.doc = Document()
                 self.doc.add_heading("应急转换结果", level=1)
                 self.doc.add_paragraph(f"URL: {self.url}")
@@ -1895,13 +1835,15 @@ class WebToDocxConverter:
                     "execution_time": time.time() - start_time
                 }
             except Exception as backup_e:
-                print(f"[DEBUG] 最终后备逻辑也失败了: {str(backup_e)}")
-                traceback.print_exc()
+                logger.warning("最终后备逻辑也失败了: %s", backup_e, exc_info=True)
                 return {
                     "success": False,
                     "message": f"转换失败: {str(e)}",
                     "execution_time": time.time() - start_time
                 }
+        finally:
+            if self.own_timer:
+                self.timer.finish()
 
 
 def convert_web_to_docx(url, output_file=None, options=None):
@@ -1922,6 +1864,8 @@ def convert_web_to_docx(url, output_file=None, options=None):
     # 解析选项
     output_dir = options.get("output_dir", "output")
     timeout = options.get("timeout", 10)
+    max_html_bytes = options.get("max_html_bytes", DEFAULT_MAX_HTML_BYTES)
+    render_mode = options.get("render_mode", "static")
 
     # 处理输出文件路径
     if output_file:
@@ -1941,6 +1885,8 @@ def convert_web_to_docx(url, output_file=None, options=None):
         output_dir=output_dir,
         timeout=timeout,
         progress_callback=options.get("progress_callback"),
+        max_html_bytes=max_html_bytes,
+        render_mode=render_mode,
     )
 
     # 执行转换
@@ -27,6 +27,12 @@ import pytesseract
 from PIL import Image as PILImage
 import numpy as np
 from ..utils.ocr_engine import perform_ocr
+from ..utils.metrics import StageTimer
+from ..utils.log import get_logger, element_logger
+
+logger = get_logger("converters.word_to_pdf")
+# 逐段落的调试日志，采样输出
+element_log = element_logger("converters.word_to_pdf")
 
 # 注册中文字体
 def register_chinese_fonts():
@@ -56,9 +62,9 @@ def register_chinese_fonts():
                 pdfmetrics.registerFont(TTFont('Chinese', font_path))
                 return True
             except Exception as e:
-                print(f"注册字体失败: {font_path}, 错误: {e}")
+                logger.warning("注册字体失败: %s, 错误: %s", font_path, e)
     
-    print("未找到可用的中文字体，中文显示可能会有问题")
+    logger.warning("未找到可用的中文字体，中文显示可能会有问题")
     return False
 
 # 注册中文字体
@@ -106,8 +112,10 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
     if file_extension not in ['.doc', '.docx']:
         raise Exception(f"不支持的文件格式: {file_extension}，仅支持DOC和DOCX格式")
 
+    # 按阶段统计耗时：解析、构建内容、图片处理、OCR、排版保存
+    timer = StageTimer("word_to_pdf")
     try:
-        print(f"开始转换Word文件: {input_file}")
+        logger.info("开始转换Word文件: %s", input_file)
         
         # 创建PDF文档
         doc = SimpleDocTemplate(
@@ -152,7 +160,9 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
         
         if file_extension == '.docx':
             # 处理.docx格式文件
+            timer.switch("parse")
             word_doc = Document(input_file)
+            timer.switch("build")
             
             # 定义命名空间
             nsmap = {
@@ -179,7 +189,7 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
                         if text:
                             # 跳过匹配"第X页"格式的段落
                             if re.match(r'^第\d+页$', text):
-                                print(f"跳过页码段落: {text}")
+                                element_log.debug("跳过页码段落: %s", text)
                                 continue
                             
                             # 检查是否是标题
@@ -229,24 +239,25 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
                                             image_data = rel.target_part.blob
                                             img_stream = BytesIO(image_data)
                                             
-                                            try:
-                                                # 尝试使用PIL打开图片，验证格式
-                                                pil_img = PILImage.open(img_stream)
-                                                # 如果不是RGB模式，转换一下（比如CMYK或P模式），reportlab可能不支持
-                                                if pil_img.mode not in ('RGB', 'L'):
-                                                    pil_img = pil_img.convert('RGB')
-                                                    new_stream = BytesIO()
-                                                    pil_img.save(new_stream, format='PNG')
-                                                    img_stream = new_stream
-                                                else:
-                                                    # 重置流位置
-                                                    img_stream.seek(0)
-                                            except Exception as pil_e:
-                                                print(f"PIL处理图片失败 (ID: {img_id}): {pil_e}")
-                                                # 如果PIL都打不开，那reportlab肯定也挂，跳过
-                                                continue
+                                            with timer.stage("image"):
+                                                try:
+                                                    # 尝试使用PIL打开图片，验证格式
+                                                    pil_img = PILImage.open(img_stream)
+                                                    # 如果不是RGB模式，转换一下（比如CMYK或P模式），reportlab可能不支持
+                                                    if pil_img.mode not in ('RGB', 'L'):
+                                                        pil_img = pil_img.convert('RGB')
+                                                        new_stream = BytesIO()
+                                                        pil_img.save(new_stream, format='PNG')
+                                                        img_stream = new_stream
+                                                    else:
+                                                        # 重置流位置
+                                                        img_stream.seek(0)
+                                                except Exception as pil_e:
+                                                    logger.warning("PIL处理图片失败 (ID: %s): %s", img_id, pil_e)
+                                                    # 如果PIL都打不开，那reportlab肯定也挂，跳过
+                                                    continue
                                                 
-                                            img = Image(img_stream)
+                                                img = Image(img_stream)
                                             
                                             # 计算合适的图片大小，保持比例
                                             max_width = 6.0 * inch  # 稍微放宽一点宽度
@@ -271,15 +282,16 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
                                             
                                             # 如果启用了OCR，对图片执行OCR
                                             if use_ocr:
-                                                print(f"对图片执行OCR (ID: {img_id})")
-                                                ocr_text = perform_ocr(image_data, lang=ocr_lang)
+                                                logger.debug("对图片执行OCR (ID: %s)", img_id)
+                                                with timer.stage("ocr"):
+                                                    ocr_text = perform_ocr(image_data, lang=ocr_lang)
                                                 if ocr_text.strip():
                                                     story.append(Paragraph("[图像OCR结果]:", normal_style))
                                                     story.append(Paragraph(ocr_text, normal_style))
                                             
                                             story.append(Spacer(1, 0.1 * inch))
                                     except Exception as e:
-                                        print(f"处理图片失败 (ID: {img_id}): {str(e)}")
+                                        logger.warning("处理图片失败 (ID: %s): %s", img_id, e)
                                         
                 elif element.tag.endswith('tbl'):  # 表格
                     # 查找对应的表格对象
@@ -320,6 +332,7 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
                             story.append(Spacer(1, 0.2 * inch))
         elif file_extension == '.doc':
             # 处理.doc格式文件，使用mammoth转换为HTML，再处理
+            timer.switch("parse")
             try:
                 with open(input_file, "rb") as doc_file:
                     result = mammoth.convert_to_html(doc_file)
@@ -341,12 +354,13 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
                             story.append(p)
                             story.append(Spacer(1, 0.1 * inch))
             except Exception as e:
-                print(f"处理.doc文件时出错: {str(e)}")
+                logger.warning("处理.doc文件时出错: %s", e)
                 raise Exception(f"转换.doc文件失败: {str(e)}")
         
         # 构建PDF文档
+        timer.switch("save")
         doc.build(story)
-        print(f"Word文件转换成功: {output_file}")
+        logger.info("Word文件转换成功: %s", output_file)
         
         return {
             "output_file": output_file,
@@ -354,7 +368,7 @@ def convert_word_to_pdf(input_file, output_file=None, options=None):
             "ocr_used": use_ocr
         }
     except Exception as e:
-        print(f"Word文件转换失败: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise Exception(f"转换Word文件失败: {str(e)}")
\ No newline at end of file
+        logger.error("Word文件转换失败: %s", e, exc_info=True)
+        raise Exception(f"转换Word文件失败: {str(e)}")
+    finally:
+        timer.finish()
\ No newline at end of file
@@ -1,13 +1,83 @@
 import asyncio
 from typing import Dict, Any, Optional
-from playwright.async_api import async_playwright
+
+from ...utils.log import get_logger
+from ...utils.browser_pool import (
+    BrowserPool,
+    DEFAULT_USER_AGENT,
+    LAUNCH_ARGS,
+    THROTTLE_STATUS_CODES,
+    PageLoadStats,
+    make_resource_blocker,
+)
+from .extractors import (
+    EXTRACTION_SCRIPT,
+    EXTRACT_CALL,
+    DEFAULT_KEYWORD_PAGES,
+    MAX_KEYWORD_PAGES_LIMIT,
+    MAX_KEYWORD_RESULTS,
+    MAX_KEYWORD_RESULTS_LIMIT,
+    NEXT_PAGE_TIMEOUT_MS,
+    PAGE_LOAD_TIMEOUT_MS,
+    WAIT_SELECTOR_TIMEOUT_MS,
+    apply_defaults,
+    build_page_url,
+    extractor_key,
+    get_extractor,
+    item_post_id,
+)
+from .ssr import fetch_ssr_data, get_ssr_extractor
+
+logger = get_logger("crawlers.media_crawler")
+
+# 各平台在默认拦截规则之外放行的资源，只采集文字时通常不需要放行任何资源
+# types: 放行的资源类型（image、media、font）；domains: 始终放行的域名
+# 如遇页面因拦截无法正常渲染，在此为对应平台添加放行规则
+PLATFORM_RESOURCE_ALLOWLIST = {
+    "xiaohongshu": {"types": (), "domains": ()},
+    "douyin": {"types": (), "domains": ()},
+    "kuaishou": {"types": (), "domains": ()},
+    "bilibili": {"types": (), "domains": ()},
+    "weibo": {"types": (), "domains": ()},
+    "tieba": {"types": (), "domains": ()},
+    "zhihu": {"types": (), "domains": ()},
+}
+
+
+def create_browser_pool(**kwargs):
+    """创建供MediaCrawler使用的浏览器池：每次采集使用全新上下文，并注入提取脚本"""
+    return BrowserPool(
+        block_resources=False,  # 资源拦截由MediaCrawler按平台在页面上设置
+        reuse_contexts=False,  # 每次采集使用全新的上下文，Cookie和缓存互不影响
+        init_scripts=[EXTRACTION_SCRIPT],
+        **kwargs
+    )
+
 
 class MediaCrawler:
     """媒体内容采集类，支持多平台内容抓取"""
     
-    def __init__(self):
+    def __init__(self, browser_pool=None, context=None, cache=None, use_ssr=True, scheduler=None):
+        """
+        Args:
+            browser_pool: 可选的共享浏览器池，提供时每次采集使用池中隔离的浏览器上下文，
+                不再单独启动浏览器
+            context: 可选的外部浏览器上下文，多个采集任务共用时由调用方负责关闭
+            cache: 可选的 CrawlResultCache，提供时相同目标的采集结果直接复用
+            use_ssr: 是否先尝试直接请求页面解析内嵌数据，失败时再使用浏览器
+            scheduler: 可选的 CrawlScheduler，提供时按平台限速，被限流时自动退避
+        """
         self.platforms = ["xiaohongshu", "douyin", "kuaishou", "bilibili", "weibo", "tieba", "zhihu"]
-        self.browser = None
+        self.browser = context.browser if context is not None else None
+        self.browser_pool = browser_pool
+        self.context = context
+        self._owns_context = context is None
+        self.cache = cache
+        self.cache_status = None
+        self.use_ssr = use_ssr
+        self.scheduler = scheduler
+        self._playwright = None
+        self.load_stats = PageLoadStats()
     
     async def __aenter__(self):
         """异步上下文管理器进入方法"""
@@ -19,70 +89,150 @@ class MediaCrawler:
         await self.close_browser()
     
     async def init_browser(self):
-        """初始化浏览器"""
+        """初始化浏览器：有浏览器池时从池中获取上下文，否则单独启动浏览器"""
+        if self.context is not None:
+            return self.browser
         try:
-            playwright = await async_playwright().start()
+            if self.browser_pool is not None:
+                self.context = await self.browser_pool.acquire()
+                self.browser = self.context.browser
+                return self.browser
+
+            # 未使用浏览器池时才需要 Playwright，延迟到这里导入
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
             # 使用Chromium浏览器，无头模式
-            self.browser = await playwright.chromium.launch(
+            self.browser = await self._playwright.chromium.launch(
                 headless=True,  # 无头模式，不显示浏览器窗口
-                args=[
-                    "--disable-gpu",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-setuid-sandbox",
-                    "--disable-extensions"
-                ]
+                args=LAUNCH_ARGS
             )
             print("浏览器初始化成功")
             return self.browser
         except Exception as e:
             print(f"浏览器初始化失败: {str(e)}")
+            await self.close_browser()
             raise
     
     async def close_browser(self):
-        """关闭浏览器"""
-        if self.browser:
+        """关闭浏览器：池中的上下文归还浏览器池，单独启动的浏览器连同Playwright驱动一起关闭"""
+        if not self._owns_context:
+            # 外部提供的上下文由调用方关闭
+            return
+        if self.context is not None:
+            context = self.context
+            self.context = None
+            await self.browser_pool.release(context)
+        elif self.browser:
             await self.browser.close()
+        self.browser = None
+        
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+    
+    async def _scheduled_crawl(self, platform: str, kind: str, target: str, **options) -> Dict[str, Any]:
+        """经过调度器限速执行采集，页面被平台限流时在结果中标记 throttled"""
+        async def run():
+            result = await getattr(self, f"_crawl_by_{kind}")(platform, target, **options)
+            if self.load_stats.throttled:
+                result["throttled"] = True
+            return result
+        
+        if self.scheduler is None:
+            return await run()
+        return await self.scheduler.run(platform, run)
+    
+    async def _cached_crawl(self, platform: str, kind: str, target: str, **options) -> Dict[str, Any]:
+        """经过结果缓存执行采集，未配置缓存时直接采集；缓存命中时不占用平台的请求配额"""
+        if self.cache is None:
+            return await self._scheduled_crawl(platform, kind, target, **options)
+        
+        async def refresh():
+            # 后台刷新不能使用当前请求的浏览器上下文，单独获取
+            crawler = MediaCrawler(browser_pool=self.browser_pool, scheduler=self.scheduler)
+            try:
+                return await crawler._scheduled_crawl(platform, kind, target, **options)
+            finally:
+                await crawler.close_browser()
+        
+        # 采集数量不同的结果分开缓存
+        variant = tuple(sorted(options.items())) if options else None
+        result, self.cache_status = await self.cache.get_or_crawl(
+            platform, kind, target, lambda: self._scheduled_crawl(platform, kind, target, **options), refresh,
+            variant=variant
+        )
+        return result
     
-    async def crawl(self, platform: str, url: Optional[str] = None, keyword: Optional[str] = None, post_id: Optional[str] = None) -> Dict[str, Any]:
-        """执行采集操作 - 仅采集文字类信息，不采集视频、图片等媒体文件"""
+    async def _new_page(self, platform: str):
+        """创建新页面：优先在池中的隔离上下文中创建，并拦截采集文字不需要的资源"""
+        if self.context is not None:
+            # 浏览器池的上下文已注入提取脚本
+            page = await self.context.new_page()
+        else:
+            page = await self.browser.new_page(user_agent=DEFAULT_USER_AGENT)
+            await page.add_init_script(EXTRACTION_SCRIPT)
+        
+        allowlist = PLATFORM_RESOURCE_ALLOWLIST.get(platform, {})
+        blocker = make_resource_blocker(
+            allowed_types=allowlist.get("types", ()),
+            allowed_domains=allowlist.get("domains", ()),
+            stats=self.load_stats
+        )
+        await page.route("**/*", blocker)
+        self.load_stats.attach(page)
+        return page
+    
+    async def crawl(self, platform: str, url: Optional[str] = None, keyword: Optional[str] = None, post_id: Optional[str] = None,
+                    max_results: Optional[int] = None, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """执行采集操作 - 仅采集文字类信息，不采集视频、图片等媒体文件
+        
+        max_results / max_pages 只对关键词搜索有效，控制返回的结果数和滚动/翻页次数
+        """
         if platform not in self.platforms:
             raise ValueError(f"不支持的平台: {platform}")
         
+        self.load_stats = PageLoadStats()
+        self.cache_status = None
+        
         # 根据采集方式选择不同的处理方法
         if url:
             result = await self.crawl_by_url(platform, url)
         elif keyword:
-            result = await self.crawl_by_keyword(platform, keyword)
+            result = await self.crawl_by_keyword(platform, keyword, max_results, max_pages)
         elif post_id:
             result = await self.crawl_by_post_id(platform, post_id)
         else:
             raise ValueError("必须提供url、keyword或post_id中的一个")
         
+        # 附加本次采集的页面加载耗时和流量统计
+        result["stats"] = self.load_stats.to_dict()
+        if self.cache_status:
+            result["cache"] = self.cache_status
+        
         # 返回结果，确保格式正确
         return result
     
     async def crawl_by_url(self, platform: str, url: str) -> Dict[str, Any]:
+        """根据URL采集内容，配置了缓存时优先使用缓存结果"""
+        return await self._cached_crawl(platform, "url", url)
+    
+    async def _crawl_by_url(self, platform: str, url: str) -> Dict[str, Any]:
         """根据URL采集内容 - 仅采集文字类信息，不采集视频、图片等媒体文件"""
+        # 先尝试不启动浏览器的快速通道
+        result = await self._crawl_with_ssr(platform, url)
+        if result:
+            return result
+        
         try:
             # 尝试初始化浏览器
             if not self.browser:
                 await self.init_browser()
             
-            # 如果浏览器初始化成功，尝试采集真实数据
-            if self.browser:
-                # 小红书真实数据采集
-                if platform == "xiaohongshu":
-                    return await self._crawl_xiaohongshu_by_url(url)
-                # 抖音真实数据采集
-                elif platform == "douyin":
-                    return await self._crawl_douyin_by_url(url)
-                # 微博真实数据采集
-                elif platform == "weibo":
-                    return await self._crawl_weibo_by_url(url)
-                # B站真实数据采集
-                elif platform == "bilibili":
-                    return await self._crawl_bilibili_by_url(url)
+            # 如果浏览器初始化成功且平台有提取规则，采集真实数据
+            spec = get_extractor(platform, "url")
+            if self.browser and spec:
+                return await self._crawl_with_extractor(platform, "url", url, spec)
             
             # 浏览器不可用，返回模拟数据
             print(f"浏览器不可用，使用模拟数据返回{platform}URL采集结果")
@@ -140,6 +290,8 @@ class MediaCrawler:
         
         return {
             "platform": platform,
+            "mock": True,
+            "served_by": "mock",
             "type": "url",
             "url": url,
             "data": {
@@ -151,293 +303,67 @@ class MediaCrawler:
             }
         }
     
-    async def _crawl_xiaohongshu_by_url(self, url: str) -> Dict[str, Any]:
-        """小红书URL采集 - 仅采集文字类信息"""
-        page = None
-        try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待内容加载
-            await page.wait_for_selector(".note-detail", timeout=15000)
-            
-            # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const titleElement = document.querySelector(".title") || document.querySelector(".note-title");
-                    const contentElement = document.querySelector(".content") || document.querySelector(".note-content");
-                    const authorElement = document.querySelector(".author-name") || document.querySelector(".name");
-                    const timeElement = document.querySelector(".time") || document.querySelector(".publish-time");
-                    
-                    return {
-                        title: titleElement ? titleElement.textContent.trim() : "无标题",
-                        content: contentElement ? contentElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: timeElement ? timeElement.textContent.trim() : "未知时间"
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间"
-                    };
-                }
-            }''')
-            
-            return {
-                "platform": "xiaohongshu",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": data["title"],
-                    "content": data["content"],
-                    "author": data["author"],
-                    "publish_time": data["publish_time"],
-                    "platform_specific": {}
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "platform": "xiaohongshu",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集URL内容时遇到问题：{str(e)}",
-                    "author": "系统",
-                    "publish_time": "2026-01-21",
-                    "platform_specific": {}
-                }
-            }
-        finally:
-            if page:
-                await page.close()
+    async def crawl_by_keyword(self, platform: str, keyword: str, max_results: Optional[int] = None,
+                               max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """根据关键词搜索内容，配置了缓存时优先使用缓存结果"""
+        max_results, max_pages = self._keyword_limits(max_results, max_pages)
+        return await self._cached_crawl(platform, "keyword", keyword, max_results=max_results, max_pages=max_pages)
     
-    async def _crawl_douyin_by_url(self, url: str) -> Dict[str, Any]:
-        """抖音URL采集 - 仅采集文字类信息"""
-        page = None
-        try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待内容加载
-            await page.wait_for_selector(".video-info", timeout=15000)
-            
-            # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const titleElement = document.querySelector(".video-title") || document.querySelector(".title");
-                    const authorElement = document.querySelector(".author-name") || document.querySelector(".name");
-                    
-                    return {
-                        title: titleElement ? titleElement.textContent.trim() : "无标题",
-                        content: titleElement ? titleElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: "未知时间"
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间"
-                    };
-                }
-            }''')
-            
-            return {
-                "platform": "douyin",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": data["title"],
-                    "content": data["content"],
-                    "author": data["author"],
-                    "publish_time": data["publish_time"],
-                    "platform_specific": {}
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "platform": "douyin",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集URL内容时遇到问题：{str(e)}",
-                    "author": "系统",
-                    "publish_time": "2026-01-21",
-                    "platform_specific": {}
-                }
-            }
-        finally:
-            if page:
-                await page.close()
+    def _keyword_limits(self, max_results: Optional[int], max_pages: Optional[int]):
+        """规范化关键词搜索的结果数和翻页数：只指定结果数时一直翻页直到数量足够或没有更多结果"""
+        if max_pages is None:
+            max_pages = DEFAULT_KEYWORD_PAGES if max_results is None else MAX_KEYWORD_PAGES_LIMIT
+        if max_results is None:
+            max_results = MAX_KEYWORD_RESULTS
+        max_results = min(max(1, int(max_results)), MAX_KEYWORD_RESULTS_LIMIT)
+        max_pages = min(max(1, int(max_pages)), MAX_KEYWORD_PAGES_LIMIT)
+        return max_results, max_pages
     
-    async def _crawl_weibo_by_url(self, url: str) -> Dict[str, Any]:
-        """微博URL采集 - 仅采集文字类信息"""
-        page = None
+    async def iter_keyword(self, platform: str, keyword: str, max_results: Optional[int] = None,
+                           max_pages: Optional[int] = None):
+        """关键词搜索的流式版本：在同一个页面中滚动或翻页，每次产出新发现的条目列表"""
+        if platform not in self.platforms:
+            raise ValueError(f"不支持的平台: {platform}")
+        max_results, max_pages = self._keyword_limits(max_results, max_pages)
+        spec = get_extractor(platform, "keyword")
         try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待内容加载
-            await page.wait_for_selector(".weibo-main", timeout=15000)
-            
-            # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const contentElement = document.querySelector(".weibo-text") || document.querySelector(".content");
-                    const authorElement = document.querySelector(".name");
-                    const timeElement = document.querySelector(".time");
-                    
-                    return {
-                        title: contentElement ? contentElement.textContent.trim().substring(0, 50) + "..." : "无标题",
-                        content: contentElement ? contentElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: timeElement ? timeElement.textContent.trim() : "未知时间"
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间"
-                    };
-                }
-            }''')
-            
-            return {
-                "platform": "weibo",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": data["title"],
-                    "content": data["content"],
-                    "author": data["author"],
-                    "publish_time": data["publish_time"],
-                    "platform_specific": {}
-                }
-            }
-            
+            if spec and not self.browser:
+                await self.init_browser()
         except Exception as e:
-            return {
-                "platform": "weibo",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集URL内容时遇到问题：{str(e)}",
-                    "author": "系统",
-                    "publish_time": "2026-01-21",
-                    "platform_specific": {}
-                }
-            }
-        finally:
-            if page:
-                await page.close()
-    
-    async def _crawl_bilibili_by_url(self, url: str) -> Dict[str, Any]:
-        """B站URL采集 - 仅采集文字类信息"""
-        page = None
+            print(f"采集真实数据失败，使用模拟数据: {str(e)}")
+        
+        if not (self.browser and spec):
+            if self.scheduler is not None:
+                self.scheduler.record(platform, "mock", acquired=False)
+            yield self._mock_keyword_result(platform, keyword)["data"]
+            return
+        
+        # 流式结果无法整体交给调度器执行，分别取得配额和记录结果
+        if self.scheduler is not None:
+            await self.scheduler.acquire(platform)
+        outcome = "success"
         try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待内容加载
-            await page.wait_for_selector(".video-info", timeout=15000)
-            
-            # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const titleElement = document.querySelector(".video-title") || document.querySelector("h1");
-                    const contentElement = document.querySelector(".video-desc") || document.querySelector(".desc");
-                    const authorElement = document.querySelector(".up-name") || document.querySelector(".author-name");
-                    const timeElement = document.querySelector(".video-publish-info") || document.querySelector(".publish-time");
-                    
-                    return {
-                        title: titleElement ? titleElement.textContent.trim() : "无标题",
-                        content: contentElement ? contentElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: timeElement ? timeElement.textContent.trim() : "未知时间"
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间"
-                    };
-                }
-            }''')
-            
-            return {
-                "platform": "bilibili",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": data["title"],
-                    "content": data["content"],
-                    "author": data["author"],
-                    "publish_time": data["publish_time"],
-                    "platform_specific": {}
-                }
-            }
-            
-        except Exception as e:
-            return {
-                "platform": "bilibili",
-                "type": "url",
-                "url": url,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集URL内容时遇到问题：{str(e)}",
-                    "author": "系统",
-                    "publish_time": "2026-01-21",
-                    "platform_specific": {}
-                }
-            }
+            async for items in self._iter_keyword_pages(platform, keyword, spec, max_results, max_pages):
+                yield items
+        except Exception:
+            outcome = "failed"
+            raise
         finally:
-            if page:
-                await page.close()
+            if self.scheduler is not None:
+                self.scheduler.record(platform, "throttled" if self.load_stats.throttled else outcome)
     
-    async def crawl_by_keyword(self, platform: str, keyword: str) -> Dict[str, Any]:
+    async def _crawl_by_keyword(self, platform: str, keyword: str, max_results: int = MAX_KEYWORD_RESULTS,
+                                max_pages: int = DEFAULT_KEYWORD_PAGES) -> Dict[str, Any]:
         """根据关键词采集内容 - 仅采集文字类信息，不采集视频、图片等媒体文件"""
         try:
             # 尝试初始化浏览器
             if not self.browser:
                 await self.init_browser()
             
-            # 如果浏览器初始化成功，尝试采集真实数据
-            if self.browser:
-                # 小红书真实数据采集
-                if platform == "xiaohongshu":
-                    return await self._crawl_xiaohongshu_by_keyword(keyword)
-                # 抖音真实数据采集
-                elif platform == "douyin":
-                    return await self._crawl_douyin_by_keyword(keyword)
-                # 微博真实数据采集
-                elif platform == "weibo":
-                    return await self._crawl_weibo_by_keyword(keyword)
+            # 如果浏览器初始化成功且平台有提取规则，采集真实数据
+            spec = get_extractor(platform, "keyword")
+            if self.browser and spec:
+                return await self._collect_keyword(platform, keyword, spec, max_results, max_pages)
             
             # 浏览器不可用，返回模拟数据
             print(f"浏览器不可用，使用模拟数据返回{platform}关键词搜索结果")
@@ -445,6 +371,10 @@ class MediaCrawler:
             # 任何异常都使用模拟数据
             print(f"采集真实数据失败，使用模拟数据: {str(e)}")
         
+        return self._mock_keyword_result(platform, keyword)
+    
+    def _mock_keyword_result(self, platform: str, keyword: str) -> Dict[str, Any]:
+        """浏览器不可用时的关键词搜索模拟数据"""
         # 为不同平台生成真实的模拟数据
         real_data = {
             "xiaohongshu": [
@@ -508,6 +438,8 @@ class MediaCrawler:
         if platform in real_data:
             return {
                 "platform": platform,
+                "mock": True,
+                "served_by": "mock",
                 "type": "keyword",
                 "keyword": keyword,
                 "data": real_data[platform]
@@ -516,6 +448,8 @@ class MediaCrawler:
             # 默认返回通用的真实数据
             return {
                 "platform": platform,
+                "mock": True,
+                "served_by": "mock",
                 "type": "keyword",
                 "keyword": keyword,
                 "data": [
@@ -536,285 +470,21 @@ class MediaCrawler:
                 ]
             }
     
-    async def _crawl_xiaohongshu_by_keyword(self, keyword: str) -> Dict[str, Any]:
-        """小红书关键词采集 - 仅采集文字类信息"""
-        page = None
-        try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # 访问小红书搜索页面
-            search_url = f"https://www.xiaohongshu.com/search_result?keyword={keyword}"
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待搜索结果加载
-            await page.wait_for_selector(".note-item", timeout=15000)
-            
-            # 提取搜索结果
-            results = await page.evaluate('''() => {
-                const items = document.querySelectorAll(".note-item");
-                const data = [];
-                
-                items.forEach(item => {
-                    try {
-                        const titleElement = item.querySelector(".title") || item.querySelector(".note-title");
-                        const contentElement = item.querySelector(".content") || item.querySelector(".note-content");
-                        const authorElement = item.querySelector(".author-name") || item.querySelector(".name");
-                        const timeElement = item.querySelector(".time") || item.querySelector(".publish-time");
-                        const linkElement = item.querySelector("a");
-                        
-                        const title = titleElement ? titleElement.textContent.trim() : "";
-                        const content = contentElement ? contentElement.textContent.trim() : "";
-                        const author = authorElement ? authorElement.textContent.trim() : "";
-                        const publish_time = timeElement ? timeElement.textContent.trim() : "";
-                        const url = linkElement ? linkElement.href : "";
-                        
-                        if (title || content) {
-                            data.push({
-                                title: title || "无标题",
-                                content: content,
-                                author: author || "匿名用户",
-                                publish_time: publish_time || "未知时间",
-                                url: url
-                            });
-                        }
-                    } catch (e) {
-                        console.error("提取数据失败:", e);
-                    }
-                });
-                
-                return data;
-            }''')
-            
-            # 如果没有采集到数据，返回默认结果
-            if not results:
-                results = [
-                    {
-                        "title": f"{keyword}相关内容",
-                        "content": f"未能获取到{keyword}的最新内容，请稍后重试。",
-                        "author": "系统",
-                        "publish_time": "2026-01-21",
-                        "url": ""
-                    }
-                ]
-            
-            return {
-                "platform": "xiaohongshu",
-                "type": "keyword",
-                "keyword": keyword,
-                "data": results[:10]  # 最多返回10条结果
-            }
-            
-        except Exception as e:
-            # 采集失败时返回默认数据
-            return {
-                "platform": "xiaohongshu",
-                "type": "keyword",
-                "keyword": keyword,
-                "data": [
-                    {
-                        "title": f"{keyword}搜索结果",
-                        "content": f"采集{keyword}相关内容时遇到问题：{str(e)}",
-                        "author": "系统",
-                        "publish_time": "2026-01-21",
-                        "url": ""
-                    }
-                ]
-            }
-        finally:
-            if page:
-                await page.close()
-    
-    async def _crawl_douyin_by_keyword(self, keyword: str) -> Dict[str, Any]:
-        """抖音关键词采集 - 仅采集文字类信息"""
-        page = None
-        try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # 访问抖音搜索页面
-            search_url = f"https://www.douyin.com/search/{keyword}"
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待搜索结果加载
-            await page.wait_for_selector(".DouyinVideoCard", timeout=15000)
-            
-            # 提取搜索结果
-            results = await page.evaluate('''() => {
-                const items = document.querySelectorAll(".DouyinVideoCard");
-                const data = [];
-                
-                items.forEach(item => {
-                    try {
-                        const titleElement = item.querySelector(".video-title") || item.querySelector(".title");
-                        const authorElement = item.querySelector(".author-name") || item.querySelector(".name");
-                        const linkElement = item.querySelector("a");
-                        
-                        const title = titleElement ? titleElement.textContent.trim() : "";
-                        const author = authorElement ? authorElement.textContent.trim() : "";
-                        const url = linkElement ? linkElement.href : "";
-                        
-                        if (title) {
-                            data.push({
-                                title: title,
-                                content: title,  # 抖音视频卡片通常只有标题
-                                author: author || "匿名用户",
-                                publish_time: "未知时间",
-                                url: url
-                            });
-                        }
-                    } catch (e) {
-                        console.error("提取数据失败:", e);
-                    }
-                });
-                
-                return data;
-            }''')
-            
-            if not results:
-                results = [
-                    {
-                        "title": f"{keyword}相关视频",
-                        "content": f"未能获取到{keyword}的最新视频内容，请稍后重试。",
-                        "author": "系统",
-                        "publish_time": "2026-01-21",
-                        "url": ""
-                    }
-                ]
-            
-            return {
-                "platform": "douyin",
-                "type": "keyword",
-                "keyword": keyword,
-                "data": results[:10]
-            }
-            
-        except Exception as e:
-            return {
-                "platform": "douyin",
-                "type": "keyword",
-                "keyword": keyword,
-                "data": [
-                    {
-                        "title": f"{keyword}搜索结果",
-                        "content": f"采集{keyword}相关内容时遇到问题：{str(e)}",
-                        "author": "系统",
-                        "publish_time": "2026-01-21",
-                        "url": ""
-                    }
-                ]
-            }
-        finally:
-            if page:
-                await page.close()
-    
-    async def _crawl_weibo_by_keyword(self, keyword: str) -> Dict[str, Any]:
-        """微博关键词采集 - 仅采集文字类信息"""
-        page = None
-        try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # 访问微博搜索页面
-            search_url = f"https://s.weibo.com/weibo?q={keyword}"
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待搜索结果加载
-            await page.wait_for_selector(".card-wrap", timeout=15000)
-            
-            # 提取搜索结果
-            results = await page.evaluate('''() => {
-                const items = document.querySelectorAll(".card-wrap");
-                const data = [];
-                
-                items.forEach(item => {
-                    try {
-                        const contentElement = item.querySelector(".content");
-                        const authorElement = item.querySelector(".name");
-                        const timeElement = item.querySelector(".time");
-                        const linkElement = item.querySelector(".from a");
-                        
-                        if (contentElement) {
-                            const title = contentElement.textContent.trim().substring(0, 50) + "...";
-                            const content = contentElement.textContent.trim();
-                            const author = authorElement ? authorElement.textContent.trim() : "匿名用户";
-                            const publish_time = timeElement ? timeElement.textContent.trim() : "未知时间";
-                            const url = linkElement ? linkElement.href : "";
-                            
-                            data.push({
-                                title: title,
-                                content: content,
-                                author: author,
-                                publish_time: publish_time,
-                                url: url
-                            });
-                        }
-                    } catch (e) {
-                        console.error("提取数据失败:", e);
-                    }
-                });
-                
-                return data;
-            }''')
-            
-            if not results:
-                results = [
-                    {
-                        "title": f"{keyword}相关微博",
-                        "content": f"未能获取到{keyword}的最新微博内容，请稍后重试。",
-                        "author": "系统",
-                        "publish_time": "2026-01-21",
-                        "url": ""
-                    }
-                ]
-            
-            return {
-                "platform": "weibo",
-                "type": "keyword",
-                "keyword": keyword,
-                "data": results[:10]
-            }
-            
-        except Exception as e:
-            return {
-                "platform": "weibo",
-                "type": "keyword",
-                "keyword": keyword,
-                "data": [
-                    {
-                        "title": f"{keyword}搜索结果",
-                        "content": f"采集{keyword}相关内容时遇到问题：{str(e)}",
-                        "author": "系统",
-                        "publish_time": "2026-01-21",
-                        "url": ""
-                    }
-                ]
-            }
-        finally:
-            if page:
-                await page.close()
-    
     async def crawl_by_post_id(self, platform: str, post_id: str) -> Dict[str, Any]:
+        """根据帖子ID采集内容，配置了缓存时优先使用缓存结果"""
+        return await self._cached_crawl(platform, "post_id", post_id)
+    
+    async def _crawl_by_post_id(self, platform: str, post_id: str) -> Dict[str, Any]:
         """根据帖子ID采集内容 - 仅采集文字类信息，不采集视频、图片等媒体文件"""
         try:
             # 尝试初始化浏览器
             if not self.browser:
                 await self.init_browser()
             
-            # 如果浏览器初始化成功，尝试采集真实数据
-            if self.browser:
-                # 小红书真实数据采集
-                if platform == "xiaohongshu":
-                    return await self._crawl_xiaohongshu_by_post_id(post_id)
-                # 抖音真实数据采集
-                elif platform == "douyin":
-                    return await self._crawl_douyin_by_post_id(post_id)
-                # B站真实数据采集
-                elif platform == "bilibili":
-                    return await self._crawl_bilibili_by_post_id(post_id)
+            # 如果浏览器初始化成功且平台有提取规则，采集真实数据
+            spec = get_extractor(platform, "post_id")
+            if self.browser and spec:
+                return await self._crawl_with_extractor(platform, "post_id", post_id, spec)
             
             # 浏览器不可用，返回模拟数据
             print(f"浏览器不可用，使用模拟数据返回{platform}帖子ID采集结果")
@@ -916,268 +586,223 @@ class MediaCrawler:
         
         return {
             "platform": platform,
+            "mock": True,
+            "served_by": "mock",
             "type": "post_id",
             "post_id": post_id,
             "data": post_data
         }
     
-    async def _crawl_xiaohongshu_by_post_id(self, post_id: str) -> Dict[str, Any]:
-        """小红书帖子ID采集 - 仅采集文字类信息"""
-        page = None
+    async def _crawl_with_ssr(self, platform: str, url: str) -> Optional[Dict[str, Any]]:
+        """直接请求URL对应的页面并解析内嵌的初始状态，不支持或解析失败时返回None"""
+        spec = get_ssr_extractor(platform)
+        if not self.use_ssr or spec is None:
+            return None
         try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # 构建小红书帖子URL
-            post_url = f"https://www.xiaohongshu.com/explore/{post_id}"
-            await page.goto(post_url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待内容加载
-            await page.wait_for_selector(".note-detail", timeout=15000)
-            
-            # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const titleElement = document.querySelector(".title") || document.querySelector(".note-title");
-                    const contentElement = document.querySelector(".content") || document.querySelector(".note-content");
-                    const authorElement = document.querySelector(".author-name") || document.querySelector(".name");
-                    const timeElement = document.querySelector(".time") || document.querySelector(".publish-time");
-                    
-                    // 提取评论
-                    const commentElements = document.querySelectorAll(".comment-item");
-                    const comments = [];
-                    commentElements.forEach(commentEl => {
-                        try {
-                            const commentAuthor = commentEl.querySelector(".comment-author") || commentEl.querySelector(".name");
-                            const commentContent = commentEl.querySelector(".comment-content") || commentEl.querySelector(".content");
-                            const commentTime = commentEl.querySelector(".comment-time") || commentEl.querySelector(".time");
-                            
-                            if (commentContent) {
-                                comments.push({
-                                    author: commentAuthor ? commentAuthor.textContent.trim() : "匿名用户",
-                                    content: commentContent.textContent.trim(),
-                                    publish_time: commentTime ? commentTime.textContent.trim() : "未知时间"
-                                });
-                            }
-                        } catch (e) {
-                            console.error("提取评论失败:", e);
-                        }
-                    });
-                    
-                    return {
-                        title: titleElement ? titleElement.textContent.trim() : "无标题",
-                        content: contentElement ? contentElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: timeElement ? timeElement.textContent.trim() : "未知时间",
-                        comments: comments
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间",
-                        comments: []
-                    };
-                }
-            }''')
-            
-            return {
-                "platform": "xiaohongshu",
-                "type": "post_id",
-                "post_id": post_id,
-                "data": data
-            }
-            
+            data, bytes_read, elapsed_ms = await asyncio.to_thread(fetch_ssr_data, spec, url)
         except Exception as e:
-            return {
-                "platform": "xiaohongshu",
-                "type": "post_id",
-                "post_id": post_id,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集帖子ID {post_id} 内容时遇到问题：{str(e)}",
-                    "author": "系统",
-                    "publish_time": "2026-01-21",
-                    "comments": []
-                }
-            }
-        finally:
-            if page:
-                await page.close()
+            response = getattr(e, "response", None)
+            if response is not None and response.status_code in THROTTLE_STATUS_CODES:
+                self.load_stats.throttled = True
+            logger.info("快速通道请求失败，改用浏览器采集: %s", e)
+            return None
+        
+        self.load_stats.requests += 1
+        self.load_stats.bytes_received += bytes_read
+        self.load_stats.load_time_ms += elapsed_ms
+        if data is None:
+            logger.info("页面中没有可用的内嵌数据，改用浏览器采集: %s %s", platform, url)
+            return None
+        
+        # 默认值与浏览器采集的提取规则保持一致
+        result = apply_defaults(get_extractor(platform, "url")["fields"], data)
+        result["platform_specific"] = {}
+        return {
+            "platform": platform,
+            "type": "url",
+            "url": url,
+            "served_by": "http",
+            "data": result
+        }
     
-    async def _crawl_douyin_by_post_id(self, post_id: str) -> Dict[str, Any]:
-        """抖音帖子ID采集 - 仅采集文字类信息"""
+    async def _crawl_with_extractor(self, platform: str, kind: str, target: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """按提取规则打开页面并提取文字内容，所有平台共用的页面处理流程"""
         page = None
         try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # 构建抖音视频URL
-            post_url = f"https://www.douyin.com/video/{post_id}"
-            await page.goto(post_url, wait_until="domcontentloaded", timeout=30000)
+            page = await self._new_page(platform)
+            await page.goto(build_page_url(spec, kind, target), wait_until="domcontentloaded",
+                            timeout=spec.get("timeout", PAGE_LOAD_TIMEOUT_MS))
             
             # 等待内容加载
-            await page.wait_for_selector(".video-info", timeout=15000)
+            await page.wait_for_selector(spec["wait_for"], timeout=spec.get("wait_timeout", WAIT_SELECTOR_TIMEOUT_MS))
             
             # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const titleElement = document.querySelector(".video-title") || document.querySelector(".title");
-                    const authorElement = document.querySelector(".author-name") || document.querySelector(".name");
-                    
-                    // 提取评论
-                    const commentElements = document.querySelectorAll(".comment-item");
-                    const comments = [];
-                    commentElements.forEach(commentEl => {
-                        try {
-                            const commentAuthor = commentEl.querySelector(".comment-author") || commentEl.querySelector(".name");
-                            const commentContent = commentEl.querySelector(".comment-content") || commentEl.querySelector(".content");
-                            
-                            if (commentContent) {
-                                comments.push({
-                                    author: commentAuthor ? commentAuthor.textContent.trim() : "匿名用户",
-                                    content: commentContent.textContent.trim(),
-                                    publish_time: "未知时间"
-                                });
-                            }
-                        } catch (e) {
-                            console.error("提取评论失败:", e);
-                        }
-                    });
-                    
-                    return {
-                        title: titleElement ? titleElement.textContent.trim() : "无标题",
-                        content: titleElement ? titleElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: "未知时间",
-                        comments: comments
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间",
-                        comments: []
-                    };
-                }
-            }''')
-            
+            data = await page.evaluate(EXTRACT_CALL, extractor_key(platform, kind))
             return {
-                "platform": "douyin",
-                "type": "post_id",
-                "post_id": post_id,
-                "data": data
+                "platform": platform,
+                "type": kind,
+                kind: target,
+                "served_by": "browser",
+                "data": self._format_extracted(kind, target, spec, data)
             }
-            
         except Exception as e:
             return {
-                "platform": "douyin",
-                "type": "post_id",
-                "post_id": post_id,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集帖子ID {post_id} 内容时遇到问题：{str(e)}",
-                    "author": "系统",
-                    "publish_time": "2026-01-21",
-                    "comments": []
-                }
+                "platform": platform,
+                "failed": True,
+                "type": kind,
+                "served_by": "browser",
+                kind: target,
+                "data": self._failed_data(kind, target, e)
             }
         finally:
             if page:
                 await page.close()
     
-    async def _crawl_bilibili_by_post_id(self, post_id: str) -> Dict[str, Any]:
-        """B站帖子ID采集 - 仅采集文字类信息"""
-        page = None
+    async def _collect_keyword(self, platform: str, keyword: str, spec: Dict[str, Any], max_results: int,
+                               max_pages: int) -> Dict[str, Any]:
+        """收集关键词搜索的全部结果，中途出错时返回已采集到的部分"""
+        results = []
         try:
-            page = await self.browser.new_page(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            
-            # 构建B站视频URL
-            post_url = f"https://www.bilibili.com/video/{post_id}"
-            await page.goto(post_url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 等待内容加载
-            await page.wait_for_selector(".video-info", timeout=15000)
-            
-            # 提取内容
-            data = await page.evaluate('''() => {
-                try {
-                    const titleElement = document.querySelector(".video-title") || document.querySelector("h1");
-                    const contentElement = document.querySelector(".video-desc") || document.querySelector(".desc");
-                    const authorElement = document.querySelector(".up-name") || document.querySelector(".author-name");
-                    const timeElement = document.querySelector(".video-publish-info") || document.querySelector(".publish-time");
-                    
-                    // 提取评论
-                    const commentElements = document.querySelectorAll(".comment-item");
-                    const comments = [];
-                    commentElements.forEach(commentEl => {
-                        try {
-                            const commentAuthor = commentEl.querySelector(".user-name") || commentEl.querySelector(".name");
-                            const commentContent = commentEl.querySelector(".comment-content") || commentEl.querySelector(".content");
-                            const commentTime = commentEl.querySelector(".comment-time") || commentEl.querySelector(".time");
-                            
-                            if (commentContent) {
-                                comments.push({
-                                    author: commentAuthor ? commentAuthor.textContent.trim() : "匿名用户",
-                                    content: commentContent.textContent.trim(),
-                                    publish_time: commentTime ? commentTime.textContent.trim() : "未知时间"
-                                });
-                            }
-                        } catch (e) {
-                            console.error("提取评论失败:", e);
-                        }
-                    });
-                    
-                    return {
-                        title: titleElement ? titleElement.textContent.trim() : "无标题",
-                        content: contentElement ? contentElement.textContent.trim() : "",
-                        author: authorElement ? authorElement.textContent.trim() : "匿名用户",
-                        publish_time: timeElement ? timeElement.textContent.trim() : "未知时间",
-                        comments: comments
-                    };
-                } catch (e) {
-                    console.error("提取数据失败:", e);
-                    return {
-                        title: "无标题",
-                        content: "",
-                        author: "匿名用户",
-                        publish_time: "未知时间",
-                        comments: []
-                    };
+            async for items in self._iter_keyword_pages(platform, keyword, spec, max_results, max_pages):
+                results.extend(items)
+        except Exception as e:
+            if not results:
+                return {
+                    "platform": platform,
+                    "failed": True,
+                    "type": "keyword",
+                    "served_by": "browser",
+                    "keyword": keyword,
+                    "data": self._failed_data("keyword", keyword, e)
                 }
-            }''')
-            
+            logger.warning("关键词搜索翻页失败，返回已采集的 %s 条结果: %s", len(results), e)
+        
+        # 如果没有采集到数据，返回提示条目；标记为失败，搜索暂时为空或被拦截时不写入缓存
+        if not results:
+            label = spec.get("empty_label", "内容")
             return {
-                "platform": "bilibili",
-                "type": "post_id",
-                "post_id": post_id,
-                "data": data
+                "platform": platform,
+                "failed": True,
+                "type": "keyword",
+                "keyword": keyword,
+                "served_by": "browser",
+                "data": [
+                    {
+                        "title": f"{keyword}相关{label}",
+                        "content": f"未能获取到{keyword}的最新{label}，请稍后重试。",
+                        "author": "系统",
+                        "publish_time": "",
+                        "url": ""
+                    }
+                ]
             }
-            
+        return {
+            "platform": platform,
+            "type": "keyword",
+            "keyword": keyword,
+            "served_by": "browser",
+            "data": results
+        }
+    
+    async def _iter_keyword_pages(self, platform: str, keyword: str, spec: Dict[str, Any], max_results: int,
+                                  max_pages: int):
+        """打开搜索页，每次提取后滚动或翻页，按帖子ID去重并产出新条目"""
+        page = await self._new_page(platform)
+        try:
+            await page.goto(build_page_url(spec, "keyword", keyword), wait_until="domcontentloaded",
+                            timeout=spec.get("timeout", PAGE_LOAD_TIMEOUT_MS))
+            await page.wait_for_selector(spec["wait_for"], timeout=spec.get("wait_timeout", WAIT_SELECTOR_TIMEOUT_MS))
+            
+            seen = set()
+            found = 0
+            for page_number in range(1, max_pages + 1):
+                data = await page.evaluate(EXTRACT_CALL, extractor_key(platform, "keyword"))
+                items = []
+                for values in data:
+                    item = apply_defaults(spec["fields"], values)
+                    post_id = item_post_id(spec, item)
+                    if post_id in seen:
+                        continue
+                    seen.add(post_id)
+                    item["post_id"] = post_id
+                    items.append(item)
+                    if found + len(items) >= max_results:
+                        break
+                
+                if items:
+                    found += len(items)
+                    yield items
+                if found >= max_results or page_number == max_pages:
+                    break
+                if not await self._load_more(page, spec, len(data)):
+                    break
+        finally:
+            await page.close()
+    
+    async def _load_more(self, page, spec: Dict[str, Any], item_count: int) -> bool:
+        """滚动到底部或点击下一页，等待新内容出现；没有更多内容时返回False"""
+        pagination = spec.get("pagination") or {}
+        mode = pagination.get("mode")
+        try:
+            if mode == "scroll":
+                height = await page.evaluate("() => document.body.scrollHeight")
+                await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+                # 虚拟列表的条目数可能不变，页面高度增加也视为加载了新内容
+                await page.wait_for_function(
+                    "([selector, count, height]) => document.querySelectorAll(selector).length > count"
+                    " || document.body.scrollHeight > height",
+                    arg=[spec["items"], item_count, height],
+                    timeout=NEXT_PAGE_TIMEOUT_MS
+                )
+                return True
+            if mode == "next":
+                link = await page.query_selector(pagination["next_selector"])
+                if link is None:
+                    return False
+                async with page.expect_navigation(wait_until="domcontentloaded", timeout=NEXT_PAGE_TIMEOUT_MS):
+                    await link.click()
+                await page.wait_for_selector(spec["wait_for"], timeout=NEXT_PAGE_TIMEOUT_MS)
+                return True
         except Exception as e:
-            return {
-                "platform": "bilibili",
-                "type": "post_id",
-                "post_id": post_id,
-                "data": {
-                    "title": "采集失败",
-                    "content": f"采集帖子ID {post_id} 内容时遇到问题：{str(e)}",
+            logger.info("没有更多搜索结果: %s", e)
+        return False
+    
+    def _format_extracted(self, kind: str, target: str, spec: Dict[str, Any], data):
+        """填充默认值并整理成接口返回的数据格式"""
+        result = apply_defaults(spec["fields"], data)
+        if "comments" in spec:
+            result["comments"] = [apply_defaults(spec["comments"]["fields"], item) for item in data.get("comments", [])]
+        else:
+            result["platform_specific"] = {}
+        return result
+    
+    def _failed_data(self, kind: str, target: str, error: Exception):
+        """采集失败时返回的数据"""
+        if kind == "keyword":
+            return [
+                {
+                    "title": f"{target}搜索结果",
+                    "content": f"采集{target}相关内容时遇到问题：{str(error)}",
                     "author": "系统",
                     "publish_time": "2026-01-21",
-                    "comments": []
+                    "url": ""
                 }
+            ]
+        if kind == "post_id":
+            return {
+                "title": "采集失败",
+                "content": f"采集帖子ID {target} 内容时遇到问题：{str(error)}",
+                "author": "系统",
+                "publish_time": "2026-01-21",
+                "comments": []
             }
-        finally:
-            if page:
-                await page.close()
+        return {
+            "title": "采集失败",
+            "content": f"采集URL内容时遇到问题：{str(error)}",
+            "author": "系统",
+            "publish_time": "2026-01-21",
+            "platform_specific": {}
+        }
     
     async def login(self, platform: str, username: str, password: str) -> bool:
         """平台登录"""
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+批量采集 - 多个平台的采集目标并发执行，每个结果完成后立即返回
+
+- 每个目标采集时从浏览器池获取上下文，完成后立即归还，不会持有一个上下文等待另一个，
+  多个批量请求同时执行也不会互相死锁
+- 每个平台单独限制并发数，单次批量采集同时占用的上下文数少于浏览器池容量，
+  为单个采集请求保留空位；请求速率和限流退避由采集调度器控制
+"""
+import asyncio
+
+from . import MediaCrawler, create_browser_pool
+from .scheduler import CrawlScheduler
+
+# 批量采集支持的平台及其并发页面数
+PLATFORM_BATCH_LIMITS = {
+    "xiaohongshu": {"concurrency": 2},
+    "douyin": {"concurrency": 2},
+    "weibo": {"concurrency": 3},
+    "bilibili": {"concurrency": 4},
+}
+
+# 单次批量请求最多包含的目标数
+MAX_BATCH_TARGETS = 200
+
+
+def validate_target(target):
+    """校验单个采集目标，返回错误信息，合法时返回None"""
+    if not isinstance(target, dict):
+        return "采集目标必须是对象"
+    platform = target.get("platform")
+    if platform not in PLATFORM_BATCH_LIMITS:
+        return f"批量采集不支持的平台: {platform}"
+    provided = [key for key in ("url", "keyword", "post_id") if target.get(key)]
+    if len(provided) != 1:
+        return "每个采集目标必须且只能提供url、keyword或post_id中的一个"
+    for key in ("max_results", "max_pages"):
+        value = target.get(key)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 1):
+            return f"{key}必须是正整数"
+    return None
+
+
+async def _crawl_target(index, target, browser_pool, semaphores, scheduler, cache, refresh_pool):
+    """获取浏览器上下文采集单个目标，完成后立即归还"""
+    async with semaphores[target["platform"]], semaphores[None]:
+        try:
+            context = await browser_pool.acquire()
+        except Exception as e:
+            print(f"批量采集获取浏览器上下文失败: {str(e)}")
+            return {"index": index, "success": False, "target": target, "error": f"浏览器初始化失败: {str(e)}"}
+        try:
+            # refresh_pool 供缓存后台刷新获取独立的上下文
+            crawler = MediaCrawler(browser_pool=refresh_pool, context=context, cache=cache, scheduler=scheduler)
+            result = await crawler.crawl(
+                target["platform"],
+                target.get("url"),
+                target.get("keyword"),
+                target.get("post_id"),
+                target.get("max_results"),
+                target.get("max_pages")
+            )
+            return {"index": index, "success": True, "target": target, "result": result}
+        except Exception as e:
+            return {"index": index, "success": False, "target": target, "error": str(e)}
+        finally:
+            await browser_pool.release(context)
+
+
+def _batch_context_limit(browser_pool, own_pool):
+    """单次批量采集同时占用的上下文数：共享浏览器池时留出一个给单个采集请求"""
+    if own_pool:
+        return browser_pool.max_contexts
+    return max(1, browser_pool.max_contexts - 1)
+
+
+async def crawl_batch(targets, browser_pool=None, cache=None, scheduler=None):
+    """并发采集多个目标，按完成顺序逐个产出结果
+
+    Args:
+        targets: 采集目标列表，每项包含 platform 以及 url、keyword、post_id 之一
+        browser_pool: 共享浏览器池，未提供时临时启动一个浏览器
+        cache: 可选的 CrawlResultCache
+        scheduler: 共享的 CrawlScheduler，未提供时本次批量采集单独限速
+
+    Yields:
+        dict: index、success、target，以及 result 或 error
+    """
+    own_pool = browser_pool is None
+    if scheduler is None:
+        scheduler = CrawlScheduler()
+    if own_pool:
+        browser_pool = create_browser_pool(size=1, max_contexts=len(PLATFORM_BATCH_LIMITS))
+
+    # 各平台的并发数，None 为整个批量的上下文数
+    semaphores = {platform: asyncio.Semaphore(limits["concurrency"])
+                  for platform, limits in PLATFORM_BATCH_LIMITS.items()}
+    semaphores[None] = asyncio.Semaphore(_batch_context_limit(browser_pool, own_pool))
+    tasks = [
+        asyncio.create_task(_crawl_target(index, target, browser_pool, semaphores, scheduler, cache,
+                                          None if own_pool else browser_pool))
+        for index, target in enumerate(targets)
+    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        # 客户端断开或出错时取消未完成的采集，已获取的上下文在各任务中归还
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if own_pool:
+            await browser_pool.close()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+采集结果缓存 - 按 (平台, 采集方式, 规范化目标) 缓存结果
+
+- 各平台使用不同的有效期，过期后在宽限期内先返回旧结果并在后台刷新
+- 相同目标的并发采集合并为一次，只打开一个浏览器页面
+- 模拟数据和采集失败的结果不缓存
+"""
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from ...utils.metrics import CACHE_REQUESTS
+
+# 各平台结果有效期（秒）
+PLATFORM_CACHE_TTL = {
+    "xiaohongshu": 600,
+    "douyin": 300,
+    "weibo": 120,
+    "bilibili": 600,
+}
+DEFAULT_CACHE_TTL = 300
+
+# 过期后仍可返回旧结果的宽限期，为有效期的倍数
+STALE_TTL_FACTOR = 1.0
+
+# 最多缓存的结果数
+MAX_CACHE_ENTRIES = 1000
+
+# 分享链接中与内容无关的跟踪参数
+_TRACKING_PARAMS = ("utm_", "spm", "share_", "from", "source", "vd_source", "xsec_source", "timestamp")
+
+
+def normalize_target(kind, value):
+    """规范化采集目标，使同一内容的不同写法得到相同的缓存键"""
+    value = (value or "").strip()
+    if kind == "url":
+        parts = urlsplit(value)
+        query = sorted(
+            (key, val) for key, val in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith(_TRACKING_PARAMS)
+        )
+        path = parts.path.rstrip("/") or "/"
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+    if kind == "keyword":
+        return " ".join(value.split()).lower()
+    return value
+
+
+class _CacheEntry:
+    def __init__(self, result, ttl):
+        now = time.monotonic()
+        self.result = result
+        self.expires_at = now + ttl
+        self.stale_until = self.expires_at + ttl * STALE_TTL_FACTOR
+
+
+class CrawlResultCache:
+    """进程内的采集结果缓存，同一事件循环中使用"""
+
+    def __init__(self, max_entries=MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def _ttl(self, platform):
+        return PLATFORM_CACHE_TTL.get(platform, DEFAULT_CACHE_TTL)
+
+    def _store(self, key, result):
+        """缓存结果，模拟数据、失败和被限流的结果不缓存"""
+        if result.get("mock") or result.get("failed") or result.get("throttled"):
+            return
+        self._entries[key] = _CacheEntry(copy.deepcopy(result), self._ttl(key[0]))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _run(self, key, crawl_func):
+        """启动采集，相同键的并发请求共享同一个任务"""
+        task = self._inflight.get(key)
+        if task is None:
+            async def run():
+                try:
+                    result = await crawl_func()
+                    self._store(key, result)
+                    return result
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+        return task
+
+    async def get_or_crawl(self, platform, kind, target, crawl_func, refresh_func=None, variant=None):
+        """返回缓存结果，未命中时执行采集
+
+        Args:
+            platform: 平台名称
+            kind: 采集方式，url、keyword 或 post_id
+            target: 采集目标
+            crawl_func: 无参协程函数，执行实际采集
+            refresh_func: 后台刷新使用的无参协程函数，不能依赖当前请求的浏览器；
+                未提供时过期结果不再返回
+            variant: 区分同一目标不同采集参数的附加键，如关键词搜索的结果数
+
+        Returns:
+            tuple: (结果, 缓存状态)，状态为 hit、stale 或 miss
+        """
+        key = (platform, kind, normalize_target(kind, target), variant)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            CACHE_REQUESTS.labels("crawl", "hit").inc()
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry.result), "hit"
+
+        if entry is not None and refresh_func is not None and now < entry.stale_until:
+            self.stale_hits += 1
+            CACHE_REQUESTS.labels("crawl", "stale").inc()
+            # 先返回旧结果，后台刷新；刷新失败时保留旧结果
+            task = self._run(key, refresh_func)
+            task.add_done_callback(_log_refresh_error)
+            return copy.deepcopy(entry.result), "stale"
+
+        self.misses += 1
+        CACHE_REQUESTS.labels("crawl", "miss").inc()
+        # shield：某个等待方被取消时不影响其他合并的请求
+        result = await asyncio.shield(self._run(key, crawl_func))
+        return copy.deepcopy(result), "miss"
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses
+        }
+
+
+def _log_refresh_error(task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"后台刷新采集结果失败: {str(task.exception())}")
+
+
+# 进程内共享的采集结果缓存
+crawl_cache = CrawlResultCache()
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+平台提取规则注册表 - 用数据描述每个平台、每种采集方式的页面和选择器
+
+所有规则在导入时序列化进同一段提取脚本，作为浏览器上下文的初始化脚本注入，
+页面中只需调用 window.__mediaExtract(规则名) 即可得到提取结果。
+新增平台时只需在 EXTRACTORS 中添加规则，不需要再写页面处理代码。
+"""
+import json
+import re
+from urllib.parse import quote
+
+# 页面加载和等待内容出现的超时时间（毫秒），规则中可用 timeout / wait_timeout 单独覆盖
+PAGE_LOAD_TIMEOUT_MS = 30000
+WAIT_SELECTOR_TIMEOUT_MS = 15000
+
+# 关键词搜索默认返回的结果数和翻页数，以及单次采集允许的上限
+MAX_KEYWORD_RESULTS = 10
+DEFAULT_KEYWORD_PAGES = 1
+MAX_KEYWORD_RESULTS_LIMIT = 500
+MAX_KEYWORD_PAGES_LIMIT = 50
+
+# 滚动或翻页后等待新内容出现的超时时间（毫秒），超时视为没有更多结果
+NEXT_PAGE_TIMEOUT_MS = 8000
+
+# 字段规则：
+#   selectors: 依次尝试的CSS选择器，取第一个匹配元素的文本
+#   attr: 读取元素属性而不是文本，如 href
+#   from / truncate: 由其他字段派生，截取前N个字符并追加"..."
+#   default: 未提取到内容时的默认值
+_AUTHOR = {"selectors": [".author-name", ".name"], "default": "匿名用户"}
+
+_XIAOHONGSHU_NOTE_FIELDS = {
+    "title": {"selectors": [".title", ".note-title"], "default": "无标题"},
+    "content": {"selectors": [".content", ".note-content"], "default": ""},
+    "author": _AUTHOR,
+    "publish_time": {"selectors": [".time", ".publish-time"], "default": "未知时间"},
+}
+
+_DOUYIN_VIDEO_FIELDS = {
+    "title": {"selectors": [".video-title", ".title"], "default": "无标题"},
+    # 抖音视频页通常只有标题
+    "content": {"from": "title", "default": ""},
+    "author": _AUTHOR,
+    "publish_time": {"default": "未知时间"},
+}
+
+_BILIBILI_VIDEO_FIELDS = {
+    "title": {"selectors": [".video-title", "h1"], "default": "无标题"},
+    "content": {"selectors": [".video-desc", ".desc"], "default": ""},
+    "author": {"selectors": [".up-name", ".author-name"], "default": "匿名用户"},
+    "publish_time": {"selectors": [".video-publish-info", ".publish-time"], "default": "未知时间"},
+}
+
+
+def _comments(author_selectors, with_time=True):
+    """评论列表规则"""
+    fields = {
+        "author": {"selectors": author_selectors, "default": "匿名用户"},
+        "content": {"selectors": [".comment-content", ".content"]},
+        "publish_time": {"default": "未知时间"},
+    }
+    if with_time:
+        fields["publish_time"] = {"selectors": [".comment-time", ".time"], "default": "未知时间"}
+    return {"items": ".comment-item", "required": ["content"], "fields": fields}
+
+
+# (平台, 采集方式) -> 提取规则
+#   url: 页面地址模板，可使用 {keyword} / {post_id}；url 采集方式直接使用传入的地址
+#   wait_for: 等待出现的选择器
+#   items / required: 列表页的条目选择器，以及至少有一个非空才保留条目的字段
+#   fields: 字段规则
+#   comments: 详情页的评论规则
+#   empty_label: 关键词搜索没有结果时提示中的内容类型
+#   pagination: 加载更多结果的方式，scroll 为滚动到底部，next 为点击 next_selector 翻页
+#   id_pattern: 从条目链接中提取帖子ID的正则，用于去重
+EXTRACTORS = {
+    ("xiaohongshu", "url"): {
+        "wait_for": ".note-detail",
+        "fields": _XIAOHONGSHU_NOTE_FIELDS,
+    },
+    ("douyin", "url"): {
+        "wait_for": ".video-info",
+        "fields": _DOUYIN_VIDEO_FIELDS,
+    },
+    ("weibo", "url"): {
+        "wait_for": ".weibo-main",
+        "fields": {
+            "title": {"from": "content", "truncate": 50, "default": "无标题"},
+            "content": {"selectors": [".weibo-text", ".content"], "default": ""},
+            "author": {"selectors": [".name"], "default": "匿名用户"},
+            "publish_time": {"selectors": [".time"], "default": "未知时间"},
+        },
+    },
+    ("bilibili", "url"): {
+        "wait_for": ".video-info",
+        "fields": _BILIBILI_VIDEO_FIELDS,
+    },
+    ("xiaohongshu", "keyword"): {
+        "url": "https://www.xiaohongshu.com/search_result?keyword={keyword}",
+        "wait_for": ".note-item",
+        "items": ".note-item",
+        "required": ["title", "content"],
+        "fields": dict(_XIAOHONGSHU_NOTE_FIELDS, url={"selectors": ["a"], "attr": "href", "default": ""}),
+        "empty_label": "内容",
+        "pagination": {"mode": "scroll"},
+        "id_pattern": r"/(?:explore|search_result|discovery/item)/([0-9a-zA-Z]+)",
+    },
+    ("douyin", "keyword"): {
+        "url": "https://www.douyin.com/search/{keyword}",
+        "wait_for": ".DouyinVideoCard",
+        "items": ".DouyinVideoCard",
+        "required": ["title"],
+        "fields": dict(_DOUYIN_VIDEO_FIELDS, url={"selectors": ["a"], "attr": "href", "default": ""}),
+        "empty_label": "视频",
+        "pagination": {"mode": "scroll"},
+        "id_pattern": r"/video/(\d+)",
+    },
+    ("weibo", "keyword"): {
+        "url": "https://s.weibo.com/weibo?q={keyword}",
+        "wait_for": ".card-wrap",
+        "items": ".card-wrap",
+        "required": ["content"],
+        "fields": {
+            "title": {"from": "content", "truncate": 50},
+            "content": {"selectors": [".content"]},
+            "author": {"selectors": [".name"], "default": "匿名用户"},
+            "publish_time": {"selectors": [".time"], "default": "未知时间"},
+            "url": {"selectors": [".from a"], "attr": "href", "default": ""},
+        },
+        "empty_label": "微博",
+        "pagination": {"mode": "next", "next_selector": ".m-page a.next"},
+        "id_pattern": r"weibo\.com/\d+/(\w+)",
+    },
+    ("xiaohongshu", "post_id"): {
+        "url": "https://www.xiaohongshu.com/explore/{post_id}",
+        "wait_for": ".note-detail",
+        "fields": _XIAOHONGSHU_NOTE_FIELDS,
+        "comments": _comments([".comment-author", ".name"]),
+    },
+    ("douyin", "post_id"): {
+        "url": "https://www.douyin.com/video/{post_id}",
+        "wait_for": ".video-info",
+        "fields": _DOUYIN_VIDEO_FIELDS,
+        "comments": _comments([".comment-author", ".name"], with_time=False),
+    },
+    ("bilibili", "post_id"): {
+        "url": "https://www.bilibili.com/video/{post_id}",
+        "wait_for": ".video-info",
+        "fields": _BILIBILI_VIDEO_FIELDS,
+        "comments": _comments([".user-name", ".name"]),
+    },
+}
+
+
+def extractor_key(platform, kind):
+    return f"{platform}:{kind}"
+
+
+def get_extractor(platform, kind):
+    """获取平台在指定采集方式下的提取规则，不支持时返回None"""
+    return EXTRACTORS.get((platform, kind))
+
+
+def build_page_url(spec, kind, target):
+    """根据规则生成要打开的页面地址"""
+    if kind == "url":
+        return target
+    return spec["url"].format(**{kind: quote(target, safe="")})
+
+
+def item_post_id(spec, item):
+    """取列表条目的帖子ID，链接中没有ID时退回到链接本身，再退回到标题和作者"""
+    url = item.get("url") or ""
+    pattern = spec.get("id_pattern")
+    if url and pattern:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    if url:
+        return url.split("?")[0]
+    return f"{item.get('author', '')}:{item.get('title', '')}"
+
+
+def apply_defaults(fields, values):
+    """为未提取到内容的字段填入默认值"""
+    result = {}
+    for name, field in fields.items():
+        value = values.get(name)
+        result[name] = value if value else field.get("default", "")
+    return result
+
+
+_EXTRACTION_RUNTIME = '''
+(() => {
+    const specs = %s;
+
+    const readField = (root, field) => {
+        for (const selector of field.selectors || []) {
+            const element = root.querySelector(selector);
+            if (element) {
+                return field.attr ? (element[field.attr] || "") : element.textContent.trim();
+            }
+        }
+        return null;
+    };
+
+    const extractFields = (root, fields) => {
+        const values = {};
+        for (const [name, field] of Object.entries(fields)) {
+            if (!field.from) {
+                values[name] = readField(root, field);
+            }
+        }
+        for (const [name, field] of Object.entries(fields)) {
+            if (field.from) {
+                const source = values[field.from];
+                values[name] = source && field.truncate ? source.substring(0, field.truncate) + "..." : source;
+            }
+        }
+        return values;
+    };
+
+    const extractItems = (root, spec) => {
+        const items = [];
+        root.querySelectorAll(spec.items).forEach(element => {
+            try {
+                const values = extractFields(element, spec.fields);
+                if (spec.required.some(name => values[name])) {
+                    items.push(values);
+                }
+            } catch (e) {
+                console.error("提取数据失败:", e);
+            }
+        });
+        return items;
+    };
+
+    window.__mediaExtract = (key) => {
+        const spec = specs[key];
+        if (spec.items) {
+            return extractItems(document, spec);
+        }
+        const data = extractFields(document, spec.fields);
+        if (spec.comments) {
+            data.comments = extractItems(document, spec.comments);
+        }
+        return data;
+    };
+})();
+'''
+
+
+def _compile_runtime():
+    """把所有规则中页面端需要的部分序列化进提取脚本，只在导入时执行一次"""
+    page_specs = {}
+    for (platform, kind), spec in EXTRACTORS.items():
+        page_specs[extractor_key(platform, kind)] = {
+            key: spec[key] for key in ("items", "required", "fields", "comments") if key in spec
+        }
+    return _EXTRACTION_RUNTIME % json.dumps(page_specs, ensure_ascii=False)
+
+
+# 注入到浏览器上下文的初始化脚本
+EXTRACTION_SCRIPT = _compile_runtime()
+
+# 在页面中调用提取脚本
+EXTRACT_CALL = "key => window.__mediaExtract(key)"
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+采集调度器 - 按平台限速，遇到限流信号时指数退避
+
+- 每个平台一个令牌桶，控制平均请求速率并允许少量突发
+- 结果被标记为限流（403/429、验证码页面）时暂停该平台，连续限流时等待时间翻倍
+- 等待中的请求数量有上限，超过时直接拒绝，不在内存中无限堆积
+- 记录每个平台的排队数、等待时间和成功/模拟数据/失败比例
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+# 各平台令牌桶：rate 为每秒补充的令牌数，burst 为桶容量
+PLATFORM_RATE_LIMITS = {
+    "xiaohongshu": {"rate": 0.5, "burst": 2},
+    "douyin": {"rate": 0.5, "burst": 2},
+    "weibo": {"rate": 1.0, "burst": 3},
+    "bilibili": {"rate": 2.0, "burst": 4},
+}
+DEFAULT_RATE_LIMIT = {"rate": 1.0, "burst": 2}
+
+# 退避时间（秒）：首次限流等待 BACKOFF_BASE，之后每次翻倍，最长 BACKOFF_MAX
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 300.0
+
+# 所有平台等待中的请求总数上限
+MAX_QUEUE_SIZE = 100
+
+
+class SchedulerQueueFull(Exception):
+    """等待中的采集请求已达上限"""
+
+
+class TokenBucket:
+    """异步令牌桶"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """取一个令牌，令牌不足时等待补充；按到达顺序依次发放"""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class _PlatformState:
+    """单个平台的限速、退避状态和统计"""
+
+    def __init__(self, limit):
+        self.bucket = TokenBucket(limit["rate"], limit["burst"])
+        self.backoff_until = 0.0
+        self.consecutive_throttles = 0
+        self.queued = 0
+        self.in_flight = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.waits = 0
+        self.outcomes = defaultdict(int)
+
+
+def classify_result(result):
+    """按采集结果判断结果类型：success、mock、failed 或 throttled"""
+    if result.get("throttled"):
+        return "throttled"
+    if result.get("mock"):
+        return "mock"
+    if result.get("failed"):
+        return "failed"
+    return "success"
+
+
+class CrawlScheduler:
+    """进程内的采集调度器，同一事件循环中使用"""
+
+    def __init__(self, limits=None, max_queue=MAX_QUEUE_SIZE):
+        self.limits = limits or PLATFORM_RATE_LIMITS
+        self.max_queue = max_queue
+        self._platforms = {}
+
+    def _state(self, platform):
+        state = self._platforms.get(platform)
+        if state is None:
+            state = _PlatformState(self.limits.get(platform, DEFAULT_RATE_LIMIT))
+            self._platforms[platform] = state
+        return state
+
+    @property
+    def queue_depth(self):
+        return sum(state.queued for state in self._platforms.values())
+
+    async def acquire(self, platform):
+        """排队等待该平台的退避结束并取得令牌
+
+        Raises:
+            SchedulerQueueFull: 等待中的请求已达上限
+        """
+        if self.queue_depth >= self.max_queue:
+            raise SchedulerQueueFull(f"采集请求排队数已达上限 {self.max_queue}")
+
+        state = self._state(platform)
+        state.queued += 1
+        started = time.monotonic()
+        try:
+            while True:
+                delay = state.backoff_until - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await state.bucket.acquire()
+                # 等待令牌期间可能又触发了退避
+                if time.monotonic() >= state.backoff_until:
+                    break
+        finally:
+            state.queued -= 1
+            waited = time.monotonic() - started
+            state.wait_total += waited
+            state.wait_max = max(state.wait_max, waited)
+            state.waits += 1
+        state.in_flight += 1
+
+    def record(self, platform, outcome, acquired=True):
+        """记录一次采集结果，限流时延长该平台的退避时间
+
+        Args:
+            outcome: success、mock、failed 或 throttled
+            acquired: 是否经过 acquire 取得了配额；未请求平台就退回模拟数据时为False
+        """
+        state = self._state(platform)
+        if acquired:
+            state.in_flight = max(0, state.in_flight - 1)
+        state.outcomes[outcome] += 1
+        if outcome == "throttled":
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** state.consecutive_throttles))
+            # 加入随机抖动，避免多个进程同时恢复
+            delay *= random.uniform(0.8, 1.2)
+            state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+            state.consecutive_throttles += 1
+            print(f"{platform} 触发限流，暂停 {delay:.1f} 秒")
+        elif outcome == "success":
+            state.consecutive_throttles = 0
+
+    async def run(self, platform, crawl_func):
+        """按平台限速执行采集函数，并根据返回结果调整退避"""
+        await self.acquire(platform)
+        try:
+            result = await crawl_func()
+        except BaseException:
+            self.record(platform, "failed")
+            raise
+        self.record(platform, classify_result(result))
+        return result
+
+    def metrics(self):
+        """返回每个平台的排队数、等待时间和结果比例"""
+        now = time.monotonic()
+        platforms = {}
+        for platform, state in self._platforms.items():
+            total = sum(state.outcomes.values())
+            platforms[platform] = {
+                "queue_depth": state.queued,
+                "in_flight": state.in_flight,
+                "wait_avg_ms": int(state.wait_total / state.waits * 1000) if state.waits else 0,
+                "wait_max_ms": int(state.wait_max * 1000),
+                "requests": total,
+                "outcomes": dict(state.outcomes),
+                "success_ratio": round(state.outcomes["success"] / total, 3) if total else None,
+                "mock_ratio": round(state.outcomes["mock"] / total, 3) if total else None,
+                "backoff_remaining_s": round(max(0.0, state.backoff_until - now), 1),
+            }
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "platforms": platforms
+        }
+
+
+# 进程内共享的采集调度器
+crawl_scheduler = CrawlScheduler()
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+书签存储 - 基于SQLite（WAL模式）的书签增删改查
+
+- 按书签ID建立唯一索引，查询、更新和删除只触及单行，不再整文件读写
+- 每次写入都在单个事务中完成，多个worker进程并发写入时由SQLite加锁串行化
+- 首次启动时把旧的 bookmarks.json 导入数据库，只导入一次
+- 列表按游标分页，标题、URL和描述建立FTS5全文索引，数据版本号用于生成ETag
+"""
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+# 其他进程持有写锁时的最长等待时间（毫秒）
+BUSY_TIMEOUT_MS = 5000
+
+# 列表分页的默认条数和上限
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# 可通过 fields 参数选择返回的字段：接口字段名 -> 数据库列名
+BOOKMARK_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "url": "url",
+    "description": "description",
+    "createdAt": "created_at",
+}
+
+# trigram 分词按三个字符建索引，更短的搜索词无法使用全文索引，改用LIKE匹配
+FTS_MIN_TERM_LENGTH = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookmarks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', '0');
+CREATE TRIGGER IF NOT EXISTS bookmarks_version_insert AFTER INSERT ON bookmarks BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+END;
+CREATE TRIGGER IF NOT EXISTS bookmarks_version_update AFTER UPDATE ON bookmarks BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+END;
+CREATE TRIGGER IF NOT EXISTS bookmarks_version_delete AFTER DELETE ON bookmarks BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+END;
+"""
+
+# 全文索引使用外部内容表，由触发器与 bookmarks 表保持同步
+# trigram 分词支持中文等不以空格分词的文本的子串匹配
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE bookmarks_fts USING fts5(
+    title, url, description, content='bookmarks', content_rowid='seq', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS bookmarks_fts_insert AFTER INSERT ON bookmarks BEGIN
+    INSERT INTO bookmarks_fts (rowid, title, url, description)
+    VALUES (new.seq, new.title, new.url, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS bookmarks_fts_delete AFTER DELETE ON bookmarks BEGIN
+    INSERT INTO bookmarks_fts (bookmarks_fts, rowid, title, url, description)
+    VALUES ('delete', old.seq, old.title, old.url, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS bookmarks_fts_update AFTER UPDATE ON bookmarks BEGIN
+    INSERT INTO bookmarks_fts (bookmarks_fts, rowid, title, url, description)
+    VALUES ('delete', old.seq, old.title, old.url, old.description);
+    INSERT INTO bookmarks_fts (rowid, title, url, description)
+    VALUES (new.seq, new.title, new.url, new.description);
+END;
+INSERT INTO bookmarks_fts (bookmarks_fts) VALUES ('rebuild');
+"""
+
+_COLUMNS = "id, title, url, description, created_at"
+
+
+def encode_cursor(seq):
+    """把最后一条书签的序号编码为不透明的游标"""
+    return base64.urlsafe_b64encode(str(seq).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """解析游标，格式不正确时抛出ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("无效的分页游标")
+
+
+def _fts_query(query):
+    """把搜索词转换为FTS5查询：每个词作为短语，多个词同时匹配"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _row_to_bookmark(row):
+    """数据库行转换为接口返回的书签格式"""
+    return {
+        "id": row[0],
+        "title": row[1],
+        "url": row[2],
+        "description": row[3],
+        "createdAt": row[4]
+    }
+
+
+class BookmarkStore:
+    """SQLite书签存储，每个线程使用独立的数据库连接"""
+
+    def __init__(self, db_path, legacy_json_path=None):
+        """
+        Args:
+            db_path: 数据库文件路径
+            legacy_json_path: 旧版书签JSON文件，数据库中尚未导入时自动导入
+        """
+        self.db_path = db_path
+        self.legacy_json_path = legacy_json_path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self.fts_enabled = False
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL模式下NORMAL已能保证崩溃后数据库一致
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    def _conn(self):
+        """获取当前线程的连接，首次使用时建表并导入旧数据"""
+        conn = self._connect()
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    self._init_fts(conn)
+                    self._migrate_json(conn)
+                    self._initialized = True
+        return conn
+
+    def _init_fts(self, conn):
+        """创建全文索引并从已有数据重建，SQLite未编译FTS5时退回LIKE搜索"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bookmarks_fts'"
+            ).fetchone()
+            if not exists:
+                # executescript 会先提交当前事务，这里逐条执行以保持在同一事务中
+                for statement in _split_statements(_FTS_SCHEMA):
+                    conn.execute(statement)
+            conn.execute("COMMIT")
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            conn.execute("ROLLBACK")
+            print(f"SQLite不支持FTS5全文索引，书签搜索使用LIKE匹配: {str(e)}")
+
+    def _migrate_json(self, conn):
+        """把旧版 bookmarks.json 导入数据库，多个进程同时启动时只有一个会执行导入"""
+        if not self.legacy_json_path or not os.path.exists(self.legacy_json_path):
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migrated = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if migrated is None:
+                with open(self.legacy_json_path, "r", encoding="utf-8") as f:
+                    bookmarks = json.load(f)
+                for bookmark in bookmarks:
+                    conn.execute(
+                        f"INSERT OR IGNORE INTO bookmarks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                        (
+                            bookmark.get("id") or str(uuid.uuid4()),
+                            bookmark.get("title", ""),
+                            bookmark.get("url", ""),
+                            bookmark.get("description", ""),
+                            bookmark.get("createdAt") or time.strftime("%Y-%m-%d %H:%M:%S")
+                        )
+                    )
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+                    (time.strftime("%Y-%m-%d %H:%M:%S"),)
+                )
+                print(f"已将 {len(bookmarks)} 个书签从 {self.legacy_json_path} 导入数据库")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def list(self):
+        """按添加顺序返回所有书签"""
+        rows = self._conn().execute(f"SELECT {_COLUMNS} FROM bookmarks ORDER BY seq").fetchall()
+        return [_row_to_bookmark(row) for row in rows]
+
+    def data_version(self):
+        """数据版本号，任何进程写入书签后都会增加"""
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def etag(self, *params):
+        """由数据版本号和查询参数生成ETag，数据不变时同一查询的ETag不变"""
+        raw = json.dumps([self.data_version(), *params], ensure_ascii=False)
+        return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+    def page(self, limit=DEFAULT_PAGE_SIZE, cursor=None, query=None, fields=None):
+        """按添加顺序分页查询书签
+
+        Args:
+            limit: 每页条数，不超过 MAX_PAGE_SIZE
+            cursor: 上一页返回的 next_cursor
+            query: 搜索词，匹配标题、URL和描述，多个词以空格分隔且需同时匹配
+            fields: 返回的字段名列表，默认返回全部字段
+
+        Returns:
+            tuple: (书签列表, 下一页游标或None)
+
+        Raises:
+            ValueError: 游标无效或字段名不支持
+        """
+        limit = min(max(1, int(limit)), MAX_PAGE_SIZE)
+        fields = list(fields) if fields else list(BOOKMARK_FIELDS)
+        unknown = [name for name in fields if name not in BOOKMARK_FIELDS]
+        if unknown:
+            raise ValueError(f"不支持的字段: {', '.join(unknown)}")
+
+        conditions = []
+        params = []
+        if cursor:
+            conditions.append("seq > ?")
+            params.append(decode_cursor(cursor))
+        terms = query.split() if query else []
+        if terms:
+            if self.fts_enabled and all(len(term) >= FTS_MIN_TERM_LENGTH for term in terms):
+                conditions.append("seq IN (SELECT rowid FROM bookmarks_fts WHERE bookmarks_fts MATCH ?)")
+                params.append(_fts_query(query))
+            else:
+                for term in terms:
+                    conditions.append("(title LIKE ? OR url LIKE ? OR description LIKE ?)")
+                    pattern = f"%{term}%"
+                    params.extend([pattern, pattern, pattern])
+
+        columns = ", ".join(BOOKMARK_FIELDS[name] for name in fields)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # 多取一条判断是否还有下一页
+        rows = self._conn().execute(
+            f"SELECT seq, {columns} FROM bookmarks {where} ORDER BY seq LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+
+        next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+        items = [dict(zip(fields, row[1:])) for row in rows[:limit]]
+        return items, next_cursor
+
+    def get(self, bookmark_id):
+        """按ID获取书签，不存在时返回None"""
+        row = self._conn().execute(f"SELECT {_COLUMNS} FROM bookmarks WHERE id = ?", (bookmark_id,)).fetchone()
+        return _row_to_bookmark(row) if row else None
+
+    def add(self, title, url, description="", created_at=None):
+        """添加书签，返回新书签"""
+        bookmark = {
+            "id": str(uuid.uuid4()),
+            "title": title,
+            "url": url,
+            "description": description,
+            "createdAt": created_at or time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self._conn().execute(
+            f"INSERT INTO bookmarks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+            (bookmark["id"], bookmark["title"], bookmark["url"], bookmark["description"], bookmark["createdAt"])
+        )
+        return bookmark
+
+    def update(self, bookmark_id, fields):
+        """更新书签的 title、url、description，返回更新后的书签，不存在时返回None"""
+        updates = {key: fields[key] for key in ("title", "url", "description") if key in fields}
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if updates:
+                assignments = ", ".join(f"{key} = ?" for key in updates)
+                conn.execute(
+                    f"UPDATE bookmarks SET {assignments} WHERE id = ?",
+                    (*updates.values(), bookmark_id)
+                )
+            row = conn.execute(f"SELECT {_COLUMNS} FROM bookmarks WHERE id = ?", (bookmark_id,)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return _row_to_bookmark(row) if row else None
+
+    def delete(self, bookmark_id):
+        """删除书签，返回是否存在并已删除"""
+        cursor = self._conn().execute("DELETE FROM bookmarks WHERE id = ?", (bookmark_id,))
+        return cursor.rowcount > 0
+
+
+def _split_statements(script):
+    """把SQL脚本拆分为完整的语句，触发器中的分号不会被拆开"""
+    statements = []
+    current = ""
+    for line in script.splitlines(keepends=True):
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    return [statement for statement in statements if statement]
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+Chromium浏览器池 - 浏览器只启动一次并保持预热，按需分配隔离的浏览器上下文
+
+- 可同时常驻多个浏览器，按页面数回收，断开连接时自动替换
+- 上下文可放回空闲队列复用，也可每次分配全新的隔离上下文
+- 默认拦截字体、媒体和常见统计/广告请求，只加载渲染DOM所需的资源
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from .metrics import CRAWLER_PAGE_LOADS, INFLIGHT_JOBS
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Chromium启动参数，与MediaCrawler保持一致
+LAUNCH_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-setuid-sandbox",
+    "--disable-extensions"
+]
+
+# 默认拦截的资源类型
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# 常见统计和广告域名
+TRACKER_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "hm.baidu.com",
+    "cnzz.com",
+    "umeng.com",
+    "growingio.com",
+    "sensorsdata.cn",
+    "zhugeio.com",
+    "facebook.net",
+    "hotjar.com",
+)
+
+# 页面被平台限流的信号：文档请求返回这些状态码，或被重定向到验证码/登录页
+THROTTLE_STATUS_CODES = {403, 429}
+CHALLENGE_URL_MARKERS = ("captcha", "verify", "website-login")
+
+
+def _host_matches(url, domains):
+    """判断URL的主机名是否属于给定域名（含子域名）"""
+    host = urlparse(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def is_tracker_url(url):
+    """判断请求是否指向统计或广告域名"""
+    return _host_matches(url, TRACKER_DOMAINS)
+
+
+def is_challenge_url(url):
+    """判断页面地址是否为验证码或登录拦截页"""
+    lowered = url.lower()
+    return any(marker in lowered for marker in CHALLENGE_URL_MARKERS)
+
+
+class PageLoadStats:
+    """页面加载统计：请求数、拦截数、接收字节数、加载耗时，以及是否被平台限流"""
+
+    def __init__(self):
+        self.requests = 0
+        self.blocked_requests = 0
+        self.bytes_received = 0
+        self.load_time_ms = 0
+        self.throttled = False
+
+    def attach(self, page):
+        """开始统计页面的加载耗时和接收字节数"""
+        started = time.perf_counter()
+
+        def on_loaded(_page):
+            self.load_time_ms += int((time.perf_counter() - started) * 1000)
+            CRAWLER_PAGE_LOADS.labels(str(self.throttled).lower()).inc()
+
+        page.once("domcontentloaded", on_loaded)
+        page.on("requestfinished", self._on_request_finished)
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        request = response.request
+        if request.resource_type != "document":
+            return
+        if response.status in THROTTLE_STATUS_CODES or is_challenge_url(response.url):
+            self.throttled = True
+
+    async def _on_request_finished(self, request):
+        try:
+            sizes = await request.sizes()
+            self.bytes_received += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+        except Exception:
+            # 页面已关闭时无法获取大小，忽略
+            pass
+
+    def to_dict(self):
+        return {
+            "load_time_ms": self.load_time_ms,
+            "bytes_received": self.bytes_received,
+            "requests": self.requests,
+            "blocked_requests": self.blocked_requests
+        }
+
+
+def make_resource_blocker(allowed_types=(), allowed_domains=(), stats=None):
+    """创建路由拦截函数：中止字体、媒体、图片和统计请求
+
+    Args:
+        allowed_types: 额外放行的资源类型，如 "image"
+        allowed_domains: 始终放行的域名（含子域名）
+        stats: 可选的 PageLoadStats，记录请求数和拦截数
+    """
+    blocked_types = BLOCKED_RESOURCE_TYPES - set(allowed_types)
+
+    async def handler(route):
+        request = route.request
+        if stats is not None:
+            stats.requests += 1
+        blocked = (
+            (request.resource_type in blocked_types or is_tracker_url(request.url))
+            and not _host_matches(request.url, allowed_domains)
+        )
+        if blocked:
+            if stats is not None:
+                stats.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    return handler
+
+
+# 默认拦截规则：中止字体、媒体、图片和统计请求，其余请求正常放行
+block_heavy_resources = make_resource_blocker()
+
+
+class _BrowserSlot:
+    """浏览器池中的一个浏览器实例及其使用统计"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages_served = 0
+        self.active_contexts = 0
+        self.retired = False
+
+    @property
+    def healthy(self):
+        return not self.retired and self.browser.is_connected()
+
+
+class BrowserPool:
+    """异步Chromium浏览器池，浏览器启动后保持预热
+
+    - size 个浏览器常驻，新上下文分配到活动上下文最少的浏览器
+    - 每个浏览器累计打开 max_pages_per_browser 个页面后回收重启，避免内存增长
+    - 断开连接的浏览器在健康检查或下次分配时自动替换
+    """
+
+    def __init__(self, size=1, max_contexts=4, user_agent=DEFAULT_USER_AGENT, block_resources=True,
+                 reuse_contexts=True, max_pages_per_browser=0, init_scripts=()):
+        """
+        Args:
+            size: 常驻浏览器数量
+            max_contexts: 同时可用的最大上下文数量
+            user_agent: 上下文使用的User-Agent
+            block_resources: 是否拦截字体、媒体和统计请求
+            reuse_contexts: 是否复用上下文；为False时每次分配全新的隔离上下文
+            max_pages_per_browser: 单个浏览器打开多少页面后回收，0表示不回收
+            init_scripts: 每个新上下文注入的初始化脚本
+        """
+        self.size = max(1, size)
+        self.max_contexts = max_contexts
+        self.user_agent = user_agent
+        self.block_resources = block_resources
+        self.reuse_contexts = reuse_contexts
+        self.max_pages_per_browser = max_pages_per_browser
+        self.init_scripts = list(init_scripts)
+
+        self._playwright = None
+        self._slots = []
+        self._context_slots = {}
+        self._idle = None
+        self._semaphore = None
+        self._start_lock = asyncio.Lock()
+        self._replace_lock = asyncio.Lock()
+        self.recycled_browsers = 0
+
+    @property
+    def started(self):
+        return self._playwright is not None
+
+    async def start(self):
+        """启动Playwright和所有常驻浏览器，重复调用不会重复启动"""
+        async with self._start_lock:
+            if self._playwright is not None:
+                return
+            # Playwright 在首次启动浏览器池时才导入，导入应用时不加载
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            try:
+                for _ in range(self.size):
+                    self._slots.append(await self._launch())
+            except Exception:
+                await self.close()
+                raise
+            self._idle = asyncio.Queue()
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+            print(f"浏览器池启动成功，浏览器数: {self.size}，最大上下文数: {self.max_contexts}")
+
+    async def _launch(self):
+        """启动一个新的浏览器实例"""
+        browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        return _BrowserSlot(browser)
+
+    async def _replace_slot(self, slot):
+        """用新浏览器替换指定的浏览器，旧浏览器在最后一个上下文归还后关闭
+
+        替换逐个进行：启动新浏览器期间其他调用方（分配、归还、健康检查）发现同一个浏览器不健康时，
+        等待这次替换完成后直接返回，不会重复启动浏览器
+        """
+        async with self._replace_lock:
+            if slot not in self._slots:
+                # 已被其他调用方替换，或浏览器池已关闭
+                return
+            slot.retired = True
+            new_slot = await self._launch()
+            if slot in self._slots:
+                self._slots[self._slots.index(slot)] = new_slot
+                self.recycled_browsers += 1
+            else:
+                # 启动期间浏览器池已关闭，新浏览器不再有人管理
+                await self._close_browser(new_slot)
+        if slot.active_contexts == 0:
+            await self._close_browser(slot)
+
+    async def _close_browser(self, slot):
+        try:
+            await slot.browser.close()
+        except Exception:
+            pass
+
+    async def _pick_slot(self):
+        """选择活动上下文最少的健康浏览器，不健康的浏览器就地替换"""
+        for slot in list(self._slots):
+            if not slot.healthy:
+                print("检测到浏览器连接断开，重新启动")
+                await self._replace_slot(slot)
+        # 等待替换期间其他浏览器可能已被标记回收，只在健康的浏览器中选择
+        candidates = [slot for slot in self._slots if slot.healthy]
+        if not candidates:
+            raise RuntimeError("浏览器池没有可用的浏览器")
+        return min(candidates, key=lambda item: item.active_contexts)
+
+    async def _new_context(self, slot):
+        """在指定浏览器上创建新的上下文，并安装资源拦截、初始化脚本和页面计数"""
+        context = await slot.browser.new_context(user_agent=self.user_agent)
+        if self.block_resources:
+            await context.route("**/*", block_heavy_resources)
+        for script in self.init_scripts:
+            await context.add_init_script(script)
+
+        def count_page(page):
+            slot.pages_served += 1
+
+        context.on("page", count_page)
+        self._context_slots[context] = slot
+        return context
+
+    async def acquire(self):
+        """获取一个浏览器上下文：优先复用空闲上下文，否则在负载最低的浏览器上创建"""
+        if not self.started:
+            await self.start()
+        await self._semaphore.acquire()
+        try:
+            context = None
+            while self.reuse_contexts and context is None and not self._idle.empty():
+                candidate = self._idle.get_nowait()
+                slot = self._context_slots.get(candidate)
+                if slot is not None and slot.healthy:
+                    context = candidate
+                else:
+                    await self._discard_context(candidate)
+
+            if context is None:
+                slot = await self._pick_slot()
+                context = await self._new_context(slot)
+
+            self._context_slots[context].active_contexts += 1
+            INFLIGHT_JOBS.labels("browser").inc()
+            return context
+        except BaseException:
+            # 包括等待期间被取消，否则名额永久丢失
+            self._semaphore.release()
+            raise
+
+    async def _discard_context(self, context):
+        """关闭上下文并解除与浏览器的关联"""
+        self._context_slots.pop(context, None)
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def release(self, context):
+        """归还浏览器上下文；达到页面上限的浏览器在此时回收"""
+        slot = self._context_slots.get(context)
+        INFLIGHT_JOBS.labels("browser").dec()
+        try:
+            if slot is not None:
+                slot.active_contexts -= 1
+
+            reusable = self.reuse_contexts and slot is not None and slot.healthy
+            if reusable:
+                try:
+                    # 关闭残留页面并清理Cookie后放回空闲队列
+                    for page in list(context.pages):
+                        await page.close()
+                    await context.clear_cookies()
+                    self._idle.put_nowait(context)
+                except Exception as e:
+                    print(f"浏览器上下文回收失败，直接关闭: {str(e)}")
+                    await self._discard_context(context)
+            else:
+                await self._discard_context(context)
+
+            if slot is not None:
+                if slot.retired and slot.active_contexts == 0:
+                    await self._close_browser(slot)
+                elif (self.max_pages_per_browser and not slot.retired
+                      and slot.pages_served >= self.max_pages_per_browser):
+                    print(f"浏览器已打开 {slot.pages_served} 个页面，回收重启")
+                    await self._replace_slot(slot)
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def context(self):
+        """以上下文管理器方式使用浏览器上下文"""
+        context = await self.acquire()
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    async def check_health(self):
+        """健康检查：替换已断开连接的浏览器，返回浏览器池状态"""
+        if self.started:
+            for slot in list(self._slots):
+                if not slot.healthy:
+                    print("健康检查发现浏览器连接断开，重新启动")
+                    await self._replace_slot(slot)
+        return self.stats()
+
+    def stats(self):
+        """返回浏览器池状态"""
+        return {
+            "started": self.started,
+            "browsers": [
+                {
+                    "connected": slot.browser.is_connected(),
+                    "pages_served": slot.pages_served,
+                    "active_contexts": slot.active_contexts
+                }
+                for slot in self._slots
+            ],
+            "idle_contexts": self._idle.qsize() if self._idle is not None else 0,
+            "recycled_browsers": self.recycled_browsers
+        }
+
+    async def close(self):
+        """关闭所有上下文、浏览器，并停止Playwright驱动进程"""
+        if self._idle is not None:
+            while not self._idle.empty():
+                await self._discard_context(self._idle.get_nowait())
+        for context in list(self._context_slots):
+            await self._discard_context(context)
+        for slot in self._slots:
+            await self._close_browser(slot)
+        self._slots = []
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+转换结果缓存 - 按输入内容寻址的磁盘缓存
+
+- 缓存键由输入文件的SHA-256、转换器名称、转换选项和转换器版本共同决定，内容相同的文件无论文件名如何都能命中
+- 缓存文件按最近使用时间淘汰，总大小不超过上限；命中时更新修改时间作为最近使用时间
+- 多个worker进程共用同一个缓存目录，写入时先写临时文件再原子替换；
+  各进程只知道自己的写入，定期重新统计目录大小以计入其他进程的写入，总大小最多超出上限约
+  （进程数 × RESCAN_BYTES_RATIO）
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from .metrics import CACHE_REQUESTS
+
+# 缓存目录和总大小上限，可通过环境变量配置
+CONVERSION_CACHE_DIR = os.environ.get(
+    "CONVERSION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "smartdatapro_cache")
+)
+CONVERSION_CACHE_MAX_BYTES = int(os.environ.get("CONVERSION_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# 超过上限时淘汰到上限的此比例以下，避免每次写入都触发淘汰
+EVICT_TARGET_RATIO = 0.9
+
+# 本进程写入超过上限的此比例，或距上次统计超过 RESCAN_INTERVAL 秒时，重新统计缓存目录大小
+RESCAN_BYTES_RATIO = 0.05
+RESCAN_INTERVAL = 30
+
+# 转换器版本，转换器的输出发生变化时递增，旧版本的缓存随之失效
+CONVERTER_VERSIONS = {
+    "docx_to_md": 1,
+    "markdown_to_html": 1,
+    "markdown_to_docx": 1,
+    "pdf_to_word": 1,
+    "word_to_pdf": 1,
+}
+
+_TMP_PREFIX = ".tmp_"
+
+
+class ConversionCache:
+    """按内容寻址的转换结果磁盘缓存"""
+
+    def __init__(self, directory=CONVERSION_CACHE_DIR, max_bytes=CONVERSION_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # 当前进程估算的缓存总大小，上次统计目录后只累加本进程的写入
+        self._total_bytes = None
+        self._unscanned_bytes = 0
+        self._scanned_at = 0.0
+
+    def key(self, converter, input_sha256, options=None):
+        """生成缓存键"""
+        raw = json.dumps(
+            [converter, CONVERTER_VERSIONS.get(converter, 0), input_sha256, options or {}],
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """查找缓存结果，命中时返回文件路径，否则返回None
+
+        返回的文件刚被标记为最近使用，不会在随后的读取中被淘汰
+        """
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            CACHE_REQUESTS.labels("conversion", "miss").inc()
+            return None
+        with self._lock:
+            self.hits += 1
+        CACHE_REQUESTS.labels("conversion", "hit").inc()
+        return path
+
+    def put(self, key, source_path):
+        """把转换结果复制进缓存，写入失败不影响转换结果的返回"""
+        path = self._path(key)
+        tmp_path = os.path.join(self.directory, f"{_TMP_PREFIX}{uuid.uuid4().hex}")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copyfile(source_path, tmp_path)
+            size = os.path.getsize(tmp_path)
+            if size > self.max_bytes:
+                os.remove(tmp_path)
+                return False
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"写入转换结果缓存失败: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        with self._lock:
+            self.stores += 1
+            self._unscanned_bytes += size
+            if self._needs_rescan():
+                self._rescan()
+            else:
+                self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return True
+
+    def _needs_rescan(self):
+        """其他worker的写入不会计入本进程的估算，写入较多或间隔较久时重新统计"""
+        return (
+            self._total_bytes is None
+            or self._unscanned_bytes >= self.max_bytes * RESCAN_BYTES_RATIO
+            or time.monotonic() - self._scanned_at >= RESCAN_INTERVAL
+        )
+
+    def _rescan(self):
+        self._set_total(self._scan()[1])
+
+    def _set_total(self, total):
+        self._total_bytes = total
+        self._unscanned_bytes = 0
+        self._scanned_at = time.monotonic()
+
+    def _entries(self):
+        """列出所有缓存文件及其修改时间和大小"""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.startswith(_TMP_PREFIX):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan(self):
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def _evict(self):
+        """按最近使用时间从旧到新删除缓存文件，直到总大小低于上限的 EVICT_TARGET_RATIO"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+        self._set_total(total)
+
+    def stats(self):
+        """返回命中统计和缓存占用"""
+        entries, total = self._scan()
+        requests = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / requests, 3) if requests else None,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes
+        }
+
+
+# 进程内共享的转换结果缓存
+conversion_cache = ConversionCache()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+流式HTML下载 - 按字节预算读取响应，避免整页缓冲
+"""
+import codecs
+import re
+
+import requests
+
+# 默认最多读取1MB
+DEFAULT_MAX_HTML_BYTES = 1024 * 1024
+
+# 每次读取的块大小
+CHUNK_SIZE = 64 * 1024
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def _normalize_encoding(name):
+    """校验编码名称，无法识别时返回None"""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(content_type, first_chunk):
+    """根据响应头、BOM和首块中的meta标签判断编码，默认utf-8"""
+    match = _HEADER_CHARSET_RE.search(content_type or "")
+    if match:
+        encoding = _normalize_encoding(match.group(1))
+        if encoding:
+            return encoding
+
+    for bom, encoding in _BOMS:
+        if first_chunk.startswith(bom):
+            return encoding
+
+    match = _META_CHARSET_RE.search(first_chunk)
+    if match:
+        encoding = _normalize_encoding(match.group(1).decode("ascii", "ignore"))
+        if encoding:
+            return encoding
+
+    return "utf-8"
+
+
+def fetch_html(url, headers=None, timeout=10, max_bytes=DEFAULT_MAX_HTML_BYTES, session=None, verify=True):
+    """流式下载HTML，读到字节预算后立即停止
+
+    第一个数据块到达时确定编码，之后每个块都交给增量解码器，
+    不会在内存中保留完整的原始响应体。
+
+    Args:
+        url: 网页URL
+        headers: 请求头
+        timeout: 连接和读取超时时间
+        max_bytes: 最多读取的字节数
+        session: 可选的requests.Session，用于复用连接
+        verify: 是否验证证书
+
+    Returns:
+        dict: html、encoding、bytes_read、truncated、status_code
+    """
+    client = session or requests
+    response = client.get(
+        url,
+        headers=headers,
+        timeout=timeout,
+        verify=verify,
+        allow_redirects=True,
+        stream=True
+    )
+    try:
+        response.raise_for_status()
+
+        decoder = None
+        encoding = None
+        parts = []
+        bytes_read = 0
+        truncated = False
+
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if not chunk:
+                continue
+
+            # 读满上限后只有再收到数据才算截断，长度恰好等于上限的响应体是完整的
+            remaining = max_bytes - bytes_read
+            if len(chunk) > remaining:
+                chunk = chunk[:remaining]
+                truncated = True
+
+            if chunk:
+                if decoder is None:
+                    encoding = detect_encoding(response.headers.get("Content-Type"), chunk)
+                    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+                bytes_read += len(chunk)
+                parts.append(decoder.decode(chunk))
+
+            if truncated:
+                break
+
+        if decoder is not None:
+            parts.append(decoder.decode(b"", final=True))
+
+        return {
+            "html": "".join(parts),
+            "encoding": encoding or "utf-8",
+            "bytes_read": bytes_read,
+            "truncated": truncated,
+            "status_code": response.status_code
+        }
+    finally:
+        # 提前停止读取时关闭连接，不再接收剩余数据
+        response.close()
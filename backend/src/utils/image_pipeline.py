@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+图片规范化流水线 - 每张图片只处理一次，结果以内存缓冲区复用
+
+- 在线程池中并行处理，下载图片后立即提交，与文档构建并行
+- 按内容摘要去重，同一张图片多次出现只处理一次
+- 按内容选择格式：线条图/截图保留PNG，照片使用JPEG
+"""
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from .log import get_logger
+from .metrics import track_inflight
+
+logger = get_logger("image_pipeline")
+
+# Word页面宽度6英寸，按96 DPI计算的最大像素宽度
+MAX_IMAGE_WIDTH = int(6.0 * 96)
+
+# 缩略图中不同颜色数量不超过该值时视为线条图/截图
+LINE_ART_MAX_COLORS = 4096
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """获取共享的图片处理线程池"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = min(4, os.cpu_count() or 1)
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-opt")
+    return _executor
+
+
+def _is_line_art(img):
+    """判断图片是否为线条图、图表或截图（颜色数量少）"""
+    sample = img.convert('RGB')
+    sample.thumbnail((128, 128))
+    return sample.getcolors(maxcolors=LINE_ART_MAX_COLORS) is not None
+
+
+def normalize_image(data):
+    """规范化图片：缩放到页面宽度并按内容选择编码格式
+
+    Args:
+        data: 原始图片字节
+
+    Returns:
+        tuple: (图片字节, 格式)，格式为 'PNG' 或 'JPEG'
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        source_format = img.format
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        needs_resize = img.width > MAX_IMAGE_WIDTH
+
+        # 已经是合适尺寸的JPEG直接复用原始字节，避免重复有损压缩
+        if source_format == 'JPEG' and not needs_resize and img.mode in ('RGB', 'L'):
+            return data, 'JPEG'
+
+        keep_png = has_alpha or (source_format != 'JPEG' and _is_line_art(img))
+
+        if keep_png:
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        if needs_resize:
+            # 按比例缩放
+            ratio = MAX_IMAGE_WIDTH / img.width
+            img = img.resize((MAX_IMAGE_WIDTH, max(1, int(img.height * ratio))), Image.LANCZOS)
+
+        buffer = io.BytesIO()
+        if keep_png:
+            img.save(buffer, format='PNG', optimize=True)
+            return buffer.getvalue(), 'PNG'
+        img.save(buffer, format='JPEG', quality=85, optimize=True)
+        return buffer.getvalue(), 'JPEG'
+
+
+def _normalize_tracked(data):
+    """在线程池中处理图片，同时统计正在处理的图片数"""
+    with track_inflight("image"):
+        return normalize_image(data)
+
+
+class ImagePipeline:
+    """单个文档的图片处理流水线，按内容摘要缓存处理结果"""
+
+    def __init__(self):
+        self._futures = {}
+        self._digests = {}
+
+    def submit(self, img_path):
+        """提交图片到线程池处理，重复的图片只处理一次"""
+        if img_path in self._digests:
+            return self._digests[img_path]
+
+        with open(img_path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        self._digests[img_path] = digest
+
+        if digest not in self._futures:
+            self._futures[digest] = _get_executor().submit(_normalize_tracked, data)
+        return digest
+
+    def get(self, img_path):
+        """获取处理后的图片缓冲区，处理失败时返回None
+
+        Returns:
+            io.BytesIO: 可直接传给 run.add_picture 的内存缓冲区
+        """
+        digest = self.submit(img_path)
+        try:
+            data, _ = self._futures[digest].result()
+        except Exception as e:
+            logger.warning("图片优化失败: %s", e)
+            return None
+        return io.BytesIO(data)
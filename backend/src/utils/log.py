@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+结构化日志 - JSON格式输出、请求关联ID、逐元素调试日志采样
+
+- 每条日志附带当前请求的ID（X-Request-ID），asyncio.to_thread 和复制了上下文的线程中同样有效
+- 日志级别由环境变量 LOG_LEVEL 控制（默认INFO），LOG_FORMAT=text 时输出便于阅读的文本格式
+- 逐元素、逐行的调试日志使用 element_logger()，开启DEBUG时也只按 LOG_DEBUG_SAMPLE_RATE 采样输出；
+  日志使用 %s 占位符延迟格式化，未开启DEBUG时不会格式化调试信息
+"""
+import contextvars
+import itertools
+import json
+import logging
+import os
+import sys
+import uuid
+from datetime import datetime, timezone
+
+# 所有业务日志的根记录器名称
+ROOT_LOGGER = "smartdatapro"
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+
+# 逐元素调试日志每 N 条输出 1 条
+LOG_DEBUG_SAMPLE_RATE = max(1, int(os.environ.get("LOG_DEBUG_SAMPLE_RATE", "20")))
+
+# 当前请求的关联ID，不在请求中时为 "-"
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+# 日志记录的标准属性，其余属性（extra 传入的字段）原样写入JSON
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+
+def new_request_id():
+    """生成请求ID"""
+    return uuid.uuid4().hex[:16]
+
+
+class RequestIdFilter(logging.Filter):
+    """给日志记录附加当前请求的ID"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """每 rate 条日志只放行 1 条，用于逐元素的调试日志"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        return next(self._counter) % self.rate == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出为一行JSON"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def get_logger(name):
+    """获取业务日志记录器，名称统一放在 smartdatapro 下"""
+    if not name.startswith(ROOT_LOGGER):
+        name = f"{ROOT_LOGGER}.{name}"
+    return logging.getLogger(name)
+
+
+def element_logger(name):
+    """获取逐元素调试日志的记录器，开启DEBUG时按 LOG_DEBUG_SAMPLE_RATE 采样输出"""
+    logger = get_logger(f"{name}.elements")
+    if not any(isinstance(f, SamplingFilter) for f in logger.filters):
+        logger.addFilter(SamplingFilter(LOG_DEBUG_SAMPLE_RATE))
+    return logger
+
+
+def configure_logging(level=None, fmt=None):
+    """配置业务日志的输出，重复调用时替换之前的处理器"""
+    handler = logging.StreamHandler(sys.stdout)
+    if (fmt or LOG_FORMAT) == "text":
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+    else:
+        handler.setFormatter(JsonFormatter())
+    handler.addFilter(RequestIdFilter())
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.handlers = [handler]
+    logger.setLevel(level or LOG_LEVEL)
+    # 由自己的处理器输出，不再传给根记录器，避免重复输出
+    logger.propagate = False
+    return logger
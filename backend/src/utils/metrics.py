@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus 监控指标 - 请求延迟、转换各阶段耗时、流量、OCR页数、页面加载、缓存命中和进行中的任务
+
+- 多个uvicorn worker进程时，启动前设置环境变量 PROMETHEUS_MULTIPROC_DIR，
+  各进程把指标写入该目录，/metrics 汇总所有进程的数据（main.py 已自动设置）
+- 未安装 prometheus_client 时所有指标操作都为空操作，不影响业务
+"""
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, generate_latest, REGISTRY
+    from prometheus_client import CONTENT_TYPE_LATEST, multiprocess
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# 转换和页面渲染可能持续数十秒，默认的桶上限（10秒）不够用
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120)
+
+# 转换器阶段名称
+STAGES = ("download", "parse", "ocr", "image", "build", "save")
+
+
+class _NoopMetric:
+    """未安装 prometheus_client 时使用的空指标"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+
+def _multiprocess_dir():
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def _counter(name, documentation, labelnames=()):
+    if not METRICS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labelnames)
+
+
+def _histogram(name, documentation, labelnames=()):
+    if not METRICS_AVAILABLE:
+        return _NoopMetric()
+    return Histogram(name, documentation, labelnames, buckets=LATENCY_BUCKETS)
+
+
+def _gauge(name, documentation, labelnames=()):
+    if not METRICS_AVAILABLE:
+        return _NoopMetric()
+    # 多进程时汇总存活进程的值
+    return Gauge(name, documentation, labelnames, multiprocess_mode="livesum")
+
+
+HTTP_REQUEST_SECONDS = _histogram(
+    "smartdatapro_http_request_duration_seconds", "HTTP请求处理耗时", ("method", "route", "status")
+)
+HTTP_REQUEST_BYTES = _counter(
+    "smartdatapro_http_request_bytes", "请求体字节数（按请求头 Content-Length 统计）", ("route",)
+)
+HTTP_RESPONSE_BYTES = _counter(
+    "smartdatapro_http_response_bytes", "响应体字节数（按响应头 Content-Length 统计）", ("route",)
+)
+CONVERTER_STAGE_SECONDS = _histogram(
+    "smartdatapro_converter_stage_duration_seconds", "单次转换中各阶段的累计耗时", ("converter", "stage")
+)
+OCR_PAGES = _counter("smartdatapro_ocr_pages", "OCR识别的页面和图片数")
+CRAWLER_PAGE_LOADS = _counter("smartdatapro_crawler_page_loads", "浏览器页面加载次数", ("throttled",))
+CACHE_REQUESTS = _counter("smartdatapro_cache_requests", "缓存查找次数", ("cache", "result"))
+INFLIGHT_JOBS = _gauge("smartdatapro_inflight_jobs", "各任务池中正在执行的任务数", ("pool",))
+
+
+@contextmanager
+def track_inflight(pool):
+    """统计任务池中正在执行的任务数"""
+    gauge = INFLIGHT_JOBS.labels(pool)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+class StageTimer:
+    """记录一次转换中各阶段的耗时，结束时每个阶段写入一次直方图
+
+    用 switch() 标记顺序执行的阶段，用 stage() 包裹嵌套在其中的阶段；
+    嵌套阶段的耗时不计入外层阶段，各阶段耗时之和等于转换总耗时。
+    """
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.durations = {}
+        self._stack = []
+        self._started = time.perf_counter()
+
+    def _charge(self):
+        """把上次记录以来的耗时计入当前阶段"""
+        now = time.perf_counter()
+        if self._stack:
+            name = self._stack[-1]
+            self.durations[name] = self.durations.get(name, 0.0) + now - self._started
+        self._started = now
+
+    def switch(self, name):
+        """结束当前阶段，开始新的阶段"""
+        self._charge()
+        if self._stack:
+            self._stack[-1] = name
+        else:
+            self._stack.append(name)
+
+    @contextmanager
+    def stage(self, name):
+        """嵌套的阶段，结束后回到外层阶段"""
+        self._charge()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    def finish(self):
+        """结束计时并写入直方图，重复调用不会重复写入"""
+        self._charge()
+        self._stack = []
+        for name, seconds in self.durations.items():
+            CONVERTER_STAGE_SECONDS.labels(self.converter, name).observe(seconds)
+        self.durations = {}
+
+
+def render_metrics():
+    """生成 Prometheus 文本格式的指标，多进程模式下汇总所有worker的数据
+
+    Returns:
+        bytes: 指标内容；未安装 prometheus_client 时返回None
+    """
+    if not METRICS_AVAILABLE:
+        return None
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead():
+    """worker进程退出时调用，移除其进行中任务数等实时指标"""
+    if METRICS_AVAILABLE and _multiprocess_dir():
+        multiprocess.mark_process_dead(os.getpid())
@@ -6,6 +6,12 @@ import pytesseract
 from PIL import Image, ImageEnhance, ImageFilter
 import numpy as np
 from io import BytesIO
+
+from .log import get_logger
+from .metrics import OCR_PAGES
+
+logger = get_logger("ocr_engine")
+
 try:
     import cv2
 except ImportError:
@@ -62,7 +68,7 @@ def preprocess_image(image):
         return image
             
     except Exception as e:
-        print(f"图像预处理失败: {str(e)}")
+        logger.warning("图像预处理失败: %s", e)
         return image
 
 def perform_ocr(image, lang='chi_sim+eng', mode='auto'):
@@ -85,11 +91,12 @@ def perform_ocr(image, lang='chi_sim+eng', mode='auto'):
         # Tesseract 对公式支持较差，尝试使用 PSM 6
         config = '--psm 6'
     
+    OCR_PAGES.inc()
     try:
         text = pytesseract.image_to_string(processed_image, lang=lang, config=config)
         return text
     except Exception as e:
-        print(f"OCR 识别出错: {e}")
+        logger.error("OCR 识别出错: %s", e)
         return ""
 
 def check_environment():
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+网页渲染器 - 为同步的转换器提供无头浏览器渲染能力
+
+浏览器池运行在独立的后台事件循环线程中，首次使用时启动一次并保持预热，
+转换线程通过 render_html 提交渲染任务并等待结果。
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+
+from .browser_pool import BrowserPool
+
+# 同时渲染的最大页面数
+DEFAULT_MAX_RENDER_CONTEXTS = 2
+
+
+class PageRenderer:
+    """在后台线程中持有预热的浏览器池，对外提供同步渲染接口"""
+
+    def __init__(self, max_contexts=DEFAULT_MAX_RENDER_CONTEXTS):
+        self.max_contexts = max_contexts
+        self.pool = BrowserPool(max_contexts=max_contexts)
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        """启动后台事件循环线程和浏览器池，只执行一次"""
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="page-renderer", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self.pool.start(), loop).result()
+            except Exception:
+                # 启动失败时丢弃本次的事件循环和浏览器池，下次调用重新尝试
+                loop.call_soon_threadsafe(loop.stop)
+                self.pool = BrowserPool(max_contexts=self.max_contexts)
+                raise
+            self._loop = loop
+            self._thread = thread
+
+    async def _render(self, url, timeout):
+        """在浏览器上下文中打开页面，等待渲染完成后返回DOM"""
+        async with self.pool.context() as context:
+            page = await context.new_page()
+            try:
+                await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+                try:
+                    # 等待客户端渲染的请求结束，超时不影响已渲染的内容
+                    await page.wait_for_load_state("networkidle", timeout=timeout * 500)
+                except Exception:
+                    pass
+                return await page.content()
+            finally:
+                await page.close()
+
+    def render(self, url, timeout=15):
+        """渲染网页并返回渲染后的HTML
+
+        Args:
+            url: 网页URL
+            timeout: 页面加载超时时间（秒）
+        """
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._render(url, timeout), self._loop)
+        try:
+            return future.result(timeout * 2)
+        except concurrent.futures.TimeoutError:
+            # 取消后台事件循环中的渲染任务，释放占用的浏览器上下文和页面
+            future.cancel()
+            raise
+
+    def close(self):
+        """关闭浏览器池并停止后台事件循环"""
+        with self._lock:
+            if self._loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self.pool.close(), self._loop).result(10)
+            except Exception as e:
+                print(f"关闭浏览器池失败: {str(e)}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+            self._thread = None
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_page_renderer():
+    """获取进程内共享的网页渲染器"""
+    global _renderer
+    if _renderer is None:
+        with _renderer_lock:
+            if _renderer is None:
+                _renderer = PageRenderer()
+                atexit.register(_renderer.close)
+    return _renderer
+
+
+def render_html(url, timeout=15):
+    """使用共享的预热浏览器渲染网页"""
+    return get_page_renderer().render(url, timeout)
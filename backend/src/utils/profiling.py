@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+按请求采集转换的CPU性能剖析，用于排查线上特定文档转换慢的问题
+
+- 仅在设置环境变量 PROFILE_ADMIN_TOKEN 后可用，请求需带 X-Profile: 1 请求头（或 profile=1 查询参数）
+  和匹配的 X-Admin-Token 请求头；未设置时不注册中间件，对正常请求没有任何开销
+- 安装了 pyinstrument 时使用采样分析器，生成 speedscope 格式的火焰图文件（https://www.speedscope.app 打开）；
+  否则使用 cProfile，生成 .prof 文件（可用 snakeviz、flameprof 查看）
+- 剖析结果保存在 PROFILE_DIR 目录，只保留最近的 PROFILE_MAX_FILES 个文件
+"""
+import contextvars
+import cProfile
+import hmac
+import os
+import re
+import tempfile
+import threading
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+from .log import get_logger
+
+logger = get_logger("profiling")
+
+# 管理员令牌，为空时不开放性能剖析
+PROFILE_ADMIN_TOKEN = os.environ.get("PROFILE_ADMIN_TOKEN", "")
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "smartdatapro_profiles"))
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "50"))
+
+# pyinstrument 的采样间隔（秒）
+PROFILE_SAMPLE_INTERVAL = 0.001
+
+PROFILE_ID_RE = re.compile(r"[\w.-]{1,100}")
+
+# 剖析文件的扩展名和下载时的媒体类型
+PROFILE_FORMATS = {
+    ".speedscope.json": "application/json",
+    ".prof": "application/octet-stream",
+}
+
+# 当前请求的剖析会话，未开启剖析时为None
+profile_session_var = contextvars.ContextVar("profile_session", default=None)
+
+
+class ProfileSession:
+    """一个请求中采集的剖析结果"""
+
+    def __init__(self, request_id):
+        self.request_id = request_id
+        self.profile_ids = []
+        self._lock = threading.Lock()
+
+    def next_id(self, label):
+        with self._lock:
+            profile_id = f"{self.request_id}-{len(self.profile_ids) + 1}-{label}"
+            self.profile_ids.append(profile_id)
+        return profile_id
+
+
+def profiling_enabled():
+    return bool(PROFILE_ADMIN_TOKEN)
+
+
+def profiling_requested(headers, query_params):
+    """请求是否要求性能剖析"""
+    flag = headers.get("x-profile") or query_params.get("profile")
+    return flag in ("1", "true", "yes")
+
+
+def check_admin_token(token):
+    """校验管理员令牌，使用常量时间比较"""
+    return profiling_enabled() and hmac.compare_digest((token or "").encode(), PROFILE_ADMIN_TOKEN.encode())
+
+
+def profiling_active():
+    """当前请求是否在采集剖析结果，开启时应跳过结果缓存和请求合并，保证转换真正执行"""
+    return profile_session_var.get() is not None
+
+
+def _save_pyinstrument(profiler, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(profiler.output(SpeedscopeRenderer()))
+
+
+def _prune():
+    """只保留最近的 PROFILE_MAX_FILES 个剖析文件"""
+    try:
+        entries = sorted(os.scandir(PROFILE_DIR), key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except FileNotFoundError:
+        return
+    for entry in entries[PROFILE_MAX_FILES:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def profile_call(label, func, *args, **kwargs):
+    """执行 func，当前请求开启了性能剖析时采集CPU剖析并保存
+
+    未开启时直接调用，只多一次上下文变量读取
+    """
+    session = profile_session_var.get()
+    if session is None:
+        return func(*args, **kwargs)
+
+    profile_id = session.next_id(label)
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    if PYINSTRUMENT_AVAILABLE:
+        profiler = Profiler(interval=PROFILE_SAMPLE_INTERVAL, async_mode="disabled")
+        start, stop = profiler.start, profiler.stop
+        path = os.path.join(PROFILE_DIR, f"{profile_id}.speedscope.json")
+        save = lambda: _save_pyinstrument(profiler, path)
+    else:
+        profiler = cProfile.Profile()
+        start, stop = profiler.enable, profiler.disable
+        path = os.path.join(PROFILE_DIR, f"{profile_id}.prof")
+        save = lambda: profiler.dump_stats(path)
+
+    start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stop()
+        try:
+            save()
+            _prune()
+            logger.info("已保存性能剖析: %s", profile_id)
+        except Exception as e:
+            logger.warning("保存性能剖析失败: %s", e)
+
+
+def find_profile(profile_id):
+    """按ID查找剖析文件，返回 (路径, 媒体类型)，不存在时返回None"""
+    if not PROFILE_ID_RE.fullmatch(profile_id):
+        return None
+    for extension, media_type in PROFILE_FORMATS.items():
+        path = os.path.join(PROFILE_DIR, profile_id + extension)
+        if os.path.isfile(path):
+            return path, media_type
+    return None
+
+
+def list_profiles():
+    """列出已保存的剖析文件，最新的在前"""
+    try:
+        entries = sorted(os.scandir(PROFILE_DIR), key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except FileNotFoundError:
+        return []
+    profiles = []
+    for entry in entries:
+        for extension in PROFILE_FORMATS:
+            if entry.name.endswith(extension):
+                stat = entry.stat()
+                profiles.append({
+                    "id": entry.name[:-len(extension)],
+                    "format": "speedscope" if extension == ".speedscope.json" else "cprofile",
+                    "bytes": stat.st_size,
+                    "created_at": stat.st_mtime
+                })
+                break
+    return profiles
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+请求合并 - 相同键的并发任务只执行一次，所有调用方共用同一个结果
+
+适用于同一文件在短时间内被多人转换的情况：第一个请求启动转换，
+之后到达的相同请求等待这次转换完成，不再各自重复执行。
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class _Flight:
+    """一次正在执行的任务及其等待者"""
+
+    def __init__(self, task, cleanup):
+        self.task = task
+        self.cleanup = cleanup
+        self.waiters = 0
+        self.released = False
+
+
+class SingleFlight:
+    """按键合并并发任务，同一事件循环中使用"""
+
+    def __init__(self):
+        self._flights = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self):
+        return len(self._flights)
+
+    @asynccontextmanager
+    async def join(self, key, func, cleanup=None):
+        """加入键相同的正在执行的任务，没有时以 func() 启动新任务
+
+        Args:
+            key: 任务键
+            func: 返回协程的函数，只在启动新任务时调用
+            cleanup: 可选，所有等待者都离开后以任务结果调用，用于删除共享的临时文件
+
+        Yields:
+            任务结果；任务失败时所有等待者都收到同一个异常
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func()), cleanup)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # 单个等待者被取消时不影响任务本身和其他等待者
+            yield await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and flight.task.done():
+                self._release(flight)
+
+    def _finish(self, key, flight):
+        """任务结束后不再接受新的等待者，已没有等待者时立即清理"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.waiters == 0:
+            self._release(flight)
+
+    def _release(self, flight):
+        if flight.released or flight.cleanup is None:
+            return
+        flight.released = True
+        if flight.task.cancelled() or flight.task.exception() is not None:
+            return
+        try:
+            flight.cleanup(flight.task.result())
+        except Exception as e:
+            print(f"清理合并任务的结果失败: {str(e)}")
+
+    def stats(self):
+        return {
+            "in_flight": self.in_flight,
+            "executed": self.executed,
+            "coalesced": self.coalesced
+        }
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+文本清理工具 - 预编译正则，只处理传入的字符串
+"""
+import re
+
+# HTML标签
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# 残留的CSS代码：样式块、属性行、选择器和花括号
+_CSS_BLOCK_RE = re.compile(r'[^{}]+\{[^}]+\}')
+_CSS_PROPERTY_RE = re.compile(r'[\w-]+\s*:\s*[^;]+;')
+_CSS_SELECTOR_RE = re.compile(r'[\w\.-]+\s*\{')
+_CLOSE_BRACE_RE = re.compile(r'\}')
+
+# \xXX 和 \uXXXX 转义字符
+_HEX_ESCAPE_RE = re.compile(r'\\x[0-9a-fA-F]{2}')
+_UNICODE_ESCAPE_RE = re.compile(r'\\u[0-9a-fA-F]{4}')
+
+# 保留换行时使用的规则
+_TAB_ESCAPE_RE = re.compile(r'\\t')
+_CR_ESCAPE_RE = re.compile(r'\\r')
+_MULTI_SPACE_RE = re.compile(r' +')
+_LEADING_SPACE_RE = re.compile(r'^\s+', re.MULTILINE)
+_TRAILING_SPACE_RE = re.compile(r'\s+$', re.MULTILINE)
+
+# 不保留换行时使用的规则
+_NTR_ESCAPE_RE = re.compile(r'\\[ntr]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 非代码块中的引号、括号和JS相关内容
+_QUOTES_BRACKETS_RE = re.compile(r'["\'\(\)\[\]]')
+_JSDECODE_RE = re.compile(r'JsDecode\([^)]*\)')
+_JS_KEY_RE = re.compile(r'\w+\s*:\s*')
+
+
+def clean_text(text, preserve_newlines=False, is_code=False):
+    """清理文本，移除所有不必要的字符和转义序列
+
+    Args:
+        text: 要清理的文本
+        preserve_newlines: 是否保留换行符，默认为False
+        is_code: 是否是代码块，默认为False
+    """
+    if not text:
+        return ""
+
+    # 移除所有HTML标签
+    text = _HTML_TAG_RE.sub('', text)
+
+    # 再次强力清理可能残留的CSS代码
+    text = _CSS_BLOCK_RE.sub('', text)
+    text = _CSS_PROPERTY_RE.sub('', text)
+    text = _CSS_SELECTOR_RE.sub('', text)
+    text = _CLOSE_BRACE_RE.sub('', text)
+    text = _HEX_ESCAPE_RE.sub('', text)
+    text = _UNICODE_ESCAPE_RE.sub('', text)
+
+    # 根据参数决定是否保留换行符
+    if preserve_newlines:
+        # 只移除 \t 和 \r，保留 \n
+        text = _TAB_ESCAPE_RE.sub(' ', text)
+        text = _CR_ESCAPE_RE.sub('', text)
+        # 移除多余的空格，但保留换行符
+        text = _MULTI_SPACE_RE.sub(' ', text)
+        text = _LEADING_SPACE_RE.sub('', text)
+        text = _TRAILING_SPACE_RE.sub('', text)
+    else:
+        # 移除所有 \n、\t、\r 等转义字符
+        text = _NTR_ESCAPE_RE.sub(' ', text)
+        # 移除多余的空格
+        text = _WHITESPACE_RE.sub(' ', text).strip()
+
+    if not is_code:
+        # 只在非代码块中移除引号、括号和JS相关内容
+        text = _QUOTES_BRACKETS_RE.sub('', text)
+        text = _JSDECODE_RE.sub('', text)
+        text = _JS_KEY_RE.sub('', text)
+
+    return text
+
+
+# 列表编号：依次尝试复杂嵌套编号（如"6. 1. "）、"(1) "、"(a) "，最后是任意"数字."组合
+# 各分支都锚定在开头，按顺序取第一个能匹配的分支，与逐条尝试的结果一致
+_LIST_NUMBERING_RE = re.compile(
+    r'^(?:'
+    r'(?:\s*(?:\d+|[a-zA-Z]|[ivxlcdmIVXLCDM])+(?:\.|\)|\(\d+\)|\([a-zA-Z]\)|\([ivxlcdmIVXLCDM]+\))\s+)+'
+    r'|\s*\(\d+\)\s+'
+    r'|\s*\([a-zA-Z]\)\s+'
+    r'|\s*(?:\d+\.\s*)+'
+    r')',
+    re.IGNORECASE
+)
+
+# 只包含编号的文本，如"1."、"(a)"、"iv)"
+_NUMBERING_ONLY_RE = re.compile(
+    r'^(\d+|[a-zA-Z]|[ivxlcdmIVXLCDM])+(\.|\)|\(\d+\)|\([a-zA-Z]\)|\([ivxlcdmIVXLCDM]+\))(\s+|$)'
+)
+
+
+def remove_list_numbering(text):
+    """移除文本中的列表编号，如"1. "、"(1) "、"a. "、"6. 1. "等"""
+    match = _LIST_NUMBERING_RE.match(text)
+    if match:
+        return text[match.end():]
+    return text
+
+
+def is_numbering_only(text):
+    """判断文本是否以列表编号开头且编号后为空白或结尾"""
+    return _NUMBERING_ONLY_RE.match(text) is not None
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+上传文件接收 - 把 UploadFile 分块写入唯一命名的临时文件
+
+- 按接口限制上传大小：请求头声明的长度超限时在解析请求体之前拒绝，写入过程中超限立即停止
+- 写入的同时计算内容的SHA-256，供后续的转换结果缓存使用
+- 整个过程只在内存中保留一个数据块，大文件不会占用同等大小的内存
+"""
+import codecs
+import hashlib
+import os
+import uuid
+
+# 每次读取的块大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+MB = 1024 * 1024
+
+# 各接口允许的最大上传大小（字节）
+UPLOAD_SIZE_LIMITS = {
+    "/api/convert/docx-to-md": 50 * MB,
+    "/api/convert/markdown-to-html": 10 * MB,
+    "/api/convert/markdown-to-docx": 10 * MB,
+    "/api/convert/web-to-docx": 20 * MB,
+    "/api/convert/pdf-to-word": 200 * MB,
+    "/api/convert/word-to-pdf": 100 * MB,
+}
+
+# 未单独配置的接口的上传大小上限
+DEFAULT_UPLOAD_LIMIT = 10 * MB
+
+# multipart 请求中表单字段和分隔符占用的额外字节，按请求头长度预先检查时放宽
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadError(Exception):
+    """上传文件不符合要求"""
+
+    status_code = 400
+
+
+class UploadTooLarge(UploadError):
+    """上传文件超过大小限制"""
+
+    status_code = 413
+
+    def __init__(self, limit):
+        self.limit = limit
+        super().__init__(f"文件过大，最大支持{format_size(limit)}")
+
+
+class UploadNotText(UploadError):
+    """上传文件不是UTF-8文本"""
+
+    def __init__(self):
+        super().__init__("文件不是有效的文本格式")
+
+
+def format_size(size):
+    """格式化字节数，如 10MB"""
+    if size >= MB:
+        value, unit = size / MB, "MB"
+    else:
+        value, unit = size / 1024, "KB"
+    return f"{value:.1f}".rstrip("0").rstrip(".") + unit
+
+
+def get_upload_limit(path):
+    """获取接口的上传大小上限"""
+    return UPLOAD_SIZE_LIMITS.get(path, DEFAULT_UPLOAD_LIMIT)
+
+
+def check_content_length(path, content_length):
+    """按请求头声明的长度预先检查上传大小，超限时返回上限，否则返回None"""
+    limit = UPLOAD_SIZE_LIMITS.get(path)
+    if limit is None or not content_length:
+        return None
+    try:
+        if int(content_length) > limit + MULTIPART_OVERHEAD:
+            return limit
+    except ValueError:
+        return None
+    return None
+
+
+def output_filename(original_filename, extension):
+    """根据上传的原始文件名生成下载文件名，如 报告.pdf -> 报告.docx"""
+    name = os.path.splitext(os.path.basename(original_filename or ""))[0] or "output"
+    return name + extension
+
+
+class SpooledUpload:
+    """已写入磁盘的上传文件"""
+
+    def __init__(self, path, filename, size, sha256):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+
+    def remove(self):
+        """删除临时文件"""
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except OSError:
+            pass
+
+
+async def spool_upload(upload, directory, max_bytes, extension=None, text=False, name=None):
+    """把上传文件分块写入目录中唯一命名的文件
+
+    Args:
+        upload: FastAPI 的 UploadFile
+        directory: 写入的目录
+        max_bytes: 允许的最大字节数
+        extension: 临时文件的扩展名，默认使用原始文件名的扩展名
+        text: 是否要求内容为UTF-8文本
+        name: 指定文件名，目录为请求独占的工作目录时可保留原始文件名
+
+    Returns:
+        SpooledUpload
+
+    Raises:
+        UploadTooLarge: 超过大小限制
+        UploadNotText: text 为True且内容不是UTF-8文本
+    """
+    # 多数情况下上传大小已知，无需读取即可拒绝
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    if name:
+        path = os.path.join(directory, os.path.basename(name))
+    else:
+        if extension is None:
+            extension = os.path.splitext(upload.filename or "")[1].lower()
+        path = os.path.join(directory, f"upload_{uuid.uuid4().hex}{extension}")
+    hasher = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")() if text else None
+    size = 0
+    try:
+        with open(path, "wb") as f:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                if decoder is not None:
+                    try:
+                        decoder.decode(chunk)
+                    except UnicodeDecodeError:
+                        raise UploadNotText()
+                hasher.update(chunk)
+                f.write(chunk)
+        if decoder is not None:
+            try:
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError:
+                raise UploadNotText()
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return SpooledUpload(path, upload.filename, size, hasher.hexdigest())
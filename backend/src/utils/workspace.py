@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+请求工作目录 - 每个转换请求使用独立的临时目录，响应发送完成后整体删除
+
+- 上传文件、转换输出和转换器生成的图片目录都放在同一个目录中，同名文件互不覆盖
+- 根目录可通过环境变量 WORKSPACE_ROOT 指向 tmpfs（如 /dev/shm/smartdatapro），减少磁盘IO
+- 清理任务按创建时间删除遗留的目录（进程崩溃、转换超时后仍在写入等情况），并统计磁盘占用
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from starlette.background import BackgroundTask
+
+# 工作目录的根目录
+WORKSPACE_ROOT = os.environ.get("WORKSPACE_ROOT", os.path.join(tempfile.gettempdir(), "smartdatapro"))
+
+# 工作目录名前缀，清理时只处理带此前缀的目录
+WORKSPACE_PREFIX = "req_"
+
+# 超过此时间（秒）的工作目录视为遗留目录
+WORKSPACE_MAX_AGE = int(os.environ.get("WORKSPACE_MAX_AGE", "3600"))
+
+
+class Workspace:
+    """单个请求的临时工作目录"""
+
+    def __init__(self, root=None):
+        root = root or WORKSPACE_ROOT
+        os.makedirs(root, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=WORKSPACE_PREFIX, dir=root)
+
+    def file(self, name):
+        """工作目录中的文件路径"""
+        return os.path.join(self.path, os.path.basename(name))
+
+    def cleanup(self):
+        """删除工作目录及其中的所有文件"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def cleanup_task(self):
+        """响应发送完成后删除工作目录的后台任务，用于 FileResponse 的 background 参数"""
+        return BackgroundTask(self.cleanup)
+
+
+def _dir_size(path):
+    """统计目录中所有文件的大小"""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                # 文件可能在统计期间被删除
+                pass
+    return total
+
+
+def _workspace_dirs(root):
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return []
+    return [entry for entry in entries if entry.is_dir() and entry.name.startswith(WORKSPACE_PREFIX)]
+
+
+def sweep_workspaces(max_age=WORKSPACE_MAX_AGE, root=None):
+    """删除超过 max_age 秒的遗留工作目录
+
+    Returns:
+        dict: 删除的目录数和释放的字节数
+    """
+    root = root or WORKSPACE_ROOT
+    now = time.time()
+    removed = 0
+    freed = 0
+    for entry in _workspace_dirs(root):
+        try:
+            age = now - entry.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if age < max_age:
+            continue
+        freed += _dir_size(entry.path)
+        shutil.rmtree(entry.path, ignore_errors=True)
+        removed += 1
+    if removed:
+        print(f"已清理 {removed} 个遗留的工作目录，释放 {freed} 字节")
+    return {"removed": removed, "freed_bytes": freed}
+
+
+def workspace_usage(root=None):
+    """返回工作目录的数量、占用空间，以及所在文件系统的剩余空间"""
+    root = root or WORKSPACE_ROOT
+    dirs = _workspace_dirs(root)
+    usage = {
+        "root": root,
+        "workspaces": len(dirs),
+        "used_bytes": sum(_dir_size(entry.path) for entry in dirs),
+    }
+    try:
+        disk = shutil.disk_usage(root)
+        usage["disk_total_bytes"] = disk.total
+        usage["disk_free_bytes"] = disk.free
+    except OSError:
+        usage["disk_total_bytes"] = None
+        usage["disk_free_bytes"] = None
+    return usage
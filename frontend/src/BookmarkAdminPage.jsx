@@ -3,21 +3,29 @@ import './App.css';
 
 const BookmarkAdminPage = () => {
   const [bookmarks, setBookmarks] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [newBookmark, setNewBookmark] = useState({ title: '', url: '', description: '' });
   const [editMode, setEditMode] = useState(false);
   const [currentEditId, setCurrentEditId] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
 
-  // 从后端API加载书签
-  const loadBookmarks = async () => {
+  // 从后端API分页加载书签，传入游标时追加下一页
+  const loadBookmarks = async (cursor = null) => {
     setLoading(true);
     setError('');
     try {
-      const response = await fetch('http://localhost:8017/api/v1/bookmarks');
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+      const response = await fetch(`http://localhost:8017/api/v1/bookmarks${query}`);
       const data = await response.json();
       if (data.success) {
-        setBookmarks(data.data);
+        if (cursor) {
+          // 过滤掉本页面新添加、已显示过的书签
+          setBookmarks(prev => [...prev, ...data.data.filter(item => !prev.some(b => b.id === item.id))]);
+        } else {
+          setBookmarks(data.data);
+        }
+        setNextCursor(data.next_cursor);
       } else {
         setError('加载书签失败');
       }
@@ -263,6 +271,15 @@ const BookmarkAdminPage = () => {
               ))}
             </div>
           )}
+          {nextCursor && (
+            <button
+              className="load-more-btn"
+              onClick={() => loadBookmarks(nextCursor)}
+              disabled={loading}
+            >
+              {loading ? '加载中...' : '加载更多'}
+            </button>
+          )}
         </section>
       </main>
 